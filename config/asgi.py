@@ -3,6 +3,10 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve the app through this module (e.g. ``uvicorn config.asgi:application``)
+rather than WSGI so the Pomodoro timer streams (/pomodoro/timer/events/) run
+as coroutines: an idle open stream then costs no worker thread.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -52,7 +52,9 @@ SITE_ID = 1
 
 
 MIDDLEWARE = [
+    'tracker.middleware.ProfilingMiddleware',  # Outermost so it times the whole stack; off unless enabled below
     'django.middleware.security.SecurityMiddleware',
+    'tracker.routers.ReadYourWritesMiddleware',  # Before sessions so session writes pin too
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -68,7 +70,7 @@ ROOT_URLCONF = 'config.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [BASE_DIR / 'tracker/templates'],
+        'DIRS': [BASE_DIR / 'tracker' / 'Templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -90,9 +92,54 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-        
+        # Reuse connections across requests so the PRAGMAs in tracker/sqlite.py run once per worker
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Take the write lock at BEGIN, where busy_timeout applies, instead of failing
+            # with "database is locked" when a read transaction later tries to write
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
+
+# Read replica (tracker/routers.py)
+# Set TRACKER_REPLICA_DB to a second SQLite file to route catalog reads and read-only
+# views to it. Locally, `manage.py sync_replica` stands in for replication.
+
+if os.environ.get('TRACKER_REPLICA_DB'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['TRACKER_REPLICA_DB'],
+        'OPTIONS': {},  # Never writes, so no IMMEDIATE transactions
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['tracker.routers.PrimaryReplicaRouter']
+REPLICA_PIN_SECONDS = 5  # Read-your-writes window after a write; keep above replication lag
+
+# Cache (dashboard snapshots, leaderboard, catalog and calendar version counters)
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Invalidation deletes keys or bumps version counters in this cache, so every worker must
+# share it: by default a file-based cache that all processes on the host see. Set
+# TRACKER_REDIS_URL (e.g. redis://localhost:6379/1) to share it across hosts instead.
+
+if os.environ.get('TRACKER_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['TRACKER_REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('TRACKER_CACHE_DIR', BASE_DIR / 'cache'),
+            'OPTIONS': {'MAX_ENTRIES': 10000},  # Culling drops a third of the entries when full
+        }
+    }
+
 AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',  # default
     'allauth.account.auth_backends.AuthenticationBackend',
@@ -138,10 +185,32 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / 'staticfiles'  # For production
 
+# Bundled, content-hashed static files (tracker/assets.py, tracker/storage.py)
+# Build with `manage.py build_assets --fetch` then `manage.py collectstatic`; until
+# then base.html keeps loading its CSS and JS from the CDNs. Set TRACKER_SERVE_STATIC=1
+# to have Django serve STATIC_ROOT itself (pre-compressed, with far-future caching)
+# when no web server sits in front of it.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'tracker.storage.CompressedManifestStaticFilesStorage'},
+}
+SERVE_STATIC = os.environ.get('TRACKER_SERVE_STATIC') == '1'
+
 # Media files (user uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Request profiling (tracker/middleware.py)
+# Set TRACKER_PROFILING=1 in the environment to record per-URL timings, DB time and
+# slowest SQL, viewable by staff at /profiling/. A CPROFILE_SAMPLE_RATE of 0.01 runs
+# cProfile on one request in a hundred. Stats are kept per process.
+
+TRACKER_PROFILING = {
+    'ENABLED': os.environ.get('TRACKER_PROFILING') == '1',
+    'CPROFILE_SAMPLE_RATE': float(os.environ.get('TRACKER_PROFILING_SAMPLE_RATE', '0')),
+    'SLOWEST_QUERIES': 5,
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
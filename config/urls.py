@@ -14,8 +14,29 @@ urlpatterns = [
     path('login/', views.user_login, name='login'),
     path('logout/', views.user_logout, name='logout'),
     path('dashboard/', views.dashboard, name='dashboard'),
+    path('leaderboard/', views.leaderboard, name='leaderboard'),
     path('add-skill/', views.add_skill, name='add_skill'),
+    path('schedule/', views.schedule, name='schedule'),
+    path('schedule/calendar/', views.schedule_calendar, name='schedule_calendar'),
+    path('schedule/rules/<int:rule_id>/exception/', views.schedule_exception, name='schedule_exception'),
+    path('tasks/', views.task_list, name='task_list'),
+    path('tasks/bulk/', views.tasks_bulk, name='tasks_bulk'),
+    path('tasks/<int:task_id>/complete/', views.mark_task_complete, name='mark_task_complete'),
+    path('roadmap/', views.roadmap, name='roadmap'),
+    path('roadmap/bulk/', views.roadmap_bulk, name='roadmap_bulk'),
+    path('roadmap/<int:step_id>/complete/', views.mark_roadmap_step_complete, name='mark_roadmap_step_complete'),
+    path('activities/', views.daily_activities, name='daily_activities'),
+    path('activities/<int:activity_id>/complete/', views.mark_activity_complete, name='mark_activity_complete'),
     path('pomodoro/', views.pomodoro_session, name='pomodoro'),
+    path('pomodoro/batch/', views.pomodoro_batch, name='pomodoro_batch'),
+    path('pomodoro/timer/', views.pomodoro_timer, name='pomodoro_timer'),
+    path('pomodoro/timer/events/', views.pomodoro_timer_events, name='pomodoro_timer_events'),
+    path('motivation/', views.motivation, name='motivation'),
+    path('analytics/', views.analytics, name='analytics'),
+    path('charts/<slug:kind>/', views.progress_chart, name='progress_chart'),
+    path('export/', views.export_data, name='export_data'),
+    path('search/', views.search_items, name='search'),
+    path('profiling/', views.profiling_report, name='profiling_report'),
 
     
 
@@ -34,5 +55,8 @@ urlpatterns = [
 
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
+if settings.SERVE_STATIC:
+    urlpatterns.append(path(f"{settings.STATIC_URL.lstrip('/')}<path:path>", views.serve_static, name='serve_static'))
+
 
 # If you want to serve static files during development, uncomment the following line:
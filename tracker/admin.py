@@ -2,12 +2,16 @@ from django.contrib import admin
 
 # Register your models here.
 from django.contrib import admin
-from .models import UserProfile, Skill, RoadmapStep, Schedule, Task, Quote, Video
+from .models import UserProfile, Skill, RoadmapStep, Schedule, ScheduleRule, ScheduleException, Task, Quote, Video, PointsLedgerEntry, PomodoroTimer
 
 admin.site.register(UserProfile)
 admin.site.register(Skill)
 admin.site.register(RoadmapStep)
 admin.site.register(Schedule)
+admin.site.register(ScheduleRule)
+admin.site.register(ScheduleException)
 admin.site.register(Task)
 admin.site.register(Quote)
 admin.site.register(Video)
+admin.site.register(PointsLedgerEntry)
+admin.site.register(PomodoroTimer)
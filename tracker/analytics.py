@@ -0,0 +1,135 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .models import LearningSession, SessionRollup
+from .skills import record_skill_time
+from .stats import record_daily_stats
+
+# Learning Analytics
+#
+# SessionRollup holds one row per (user, day, skill) with the summed session
+# duration and count. It is kept current on every LearningSession write, so
+# chart data for any range is a grouped read over a few rows per day instead
+# of a scan of the user's whole session history.
+
+ROLLING_WINDOW_DAYS = 7
+
+
+def record_session_totals(user_id, day, skill_id, duration, sessions=1):
+    """Add (or with negative values, remove) session totals to a rollup row."""
+    rollup = SessionRollup.objects.filter(user_id=user_id, day=day, skill_id=skill_id)
+    if rollup.update(duration=F('duration') + duration, sessions=F('sessions') + sessions):
+        return
+    try:
+        with transaction.atomic():
+            SessionRollup.objects.create(
+                user_id=user_id, day=day, skill_id=skill_id, duration=duration, sessions=sessions
+            )
+    except IntegrityError:  # Another request created the row first
+        rollup.update(duration=F('duration') + duration, sessions=F('sessions') + sessions)
+
+
+def record_sessions(sessions, sign=1):
+    """
+    Fold LearningSession objects (e.g. from bulk_create) into SessionRollup,
+    DailyStats and UserSkill.time_spent, one write per group.
+    """
+    groups = defaultdict(lambda: [timedelta(0), 0])
+    for session in sessions:
+        group = groups[(session.user_id, timezone.localdate(session.date), session.skill_id)]
+        group[0] += session.duration
+        group[1] += 1
+    days = defaultdict(lambda: [timedelta(0), 0])
+    skills = defaultdict(timedelta)
+    for (user_id, day, skill_id), (duration, count) in groups.items():
+        record_session_totals(user_id, day, skill_id, duration * sign, count * sign)
+        days[(user_id, day)][0] += duration
+        days[(user_id, day)][1] += count
+        if skill_id is not None:
+            skills[(user_id, skill_id)] += duration
+    for (user_id, day), (duration, count) in days.items():
+        record_daily_stats(user_id, day, minutes=sign * duration.total_seconds() / 60, sessions=sign * count)
+    for (user_id, skill_id), duration in skills.items():
+        record_skill_time(user_id, skill_id, duration * sign)
+
+
+def rebuild_rollups(user=None, chunk_size=2000):
+    """Recompute rollups from LearningSession history with one grouped aggregate."""
+    sessions = LearningSession.objects.all()
+    rollups = SessionRollup.objects.all()
+    if user is not None:
+        sessions = sessions.filter(user=user)
+        rollups = rollups.filter(user=user)
+    totals = (
+        sessions.annotate(day=TruncDate('date'))
+        .values('user_id', 'day', 'skill_id')
+        .annotate(total=Sum('duration'), count=Count('id'))
+        .order_by()
+    )
+    with transaction.atomic():
+        rollups.delete()
+        batch = []
+        for row in totals.iterator(chunk_size=chunk_size):
+            batch.append(SessionRollup(
+                user_id=row['user_id'], day=row['day'], skill_id=row['skill_id'],
+                duration=row['total'], sessions=row['count'],
+            ))
+            if len(batch) >= chunk_size:
+                SessionRollup.objects.bulk_create(batch)
+                batch = []
+        SessionRollup.objects.bulk_create(batch)
+
+
+def _minutes(duration):
+    return round(duration.total_seconds() / 60, 1) if duration else 0.0
+
+
+def learning_analytics(user, start, end):
+    """Return chart-ready daily, weekly, per-skill and rolling-average study time for a date range."""
+    lead_in = start - timedelta(days=ROLLING_WINDOW_DAYS - 1)  # Days feeding the first rolling average
+    by_day = {
+        row['day']: row
+        for row in SessionRollup.objects.filter(user=user, day__gte=lead_in, day__lte=end)
+        .values('day')
+        .annotate(total=Sum('duration'), count=Sum('sessions'))
+        .order_by()
+    }
+    daily, weekly = [], {}
+    window = []
+    for offset in range((end - lead_in).days + 1):
+        day = lead_in + timedelta(days=offset)
+        row = by_day.get(day)
+        minutes = _minutes(row['total']) if row else 0.0
+        sessions = row['count'] if row else 0
+        window = (window + [minutes])[-ROLLING_WINDOW_DAYS:]
+        if day < start:
+            continue
+        daily.append({
+            'day': day.isoformat(),
+            'minutes': minutes,
+            'sessions': sessions,
+            'rolling_avg': round(sum(window) / len(window), 1),
+        })
+        week = weekly.setdefault(day - timedelta(days=day.weekday()), {'minutes': 0.0, 'sessions': 0})
+        week['minutes'] += minutes
+        week['sessions'] += sessions
+    per_skill = [
+        {'skill': row['skill__name'] or 'No Skill', 'minutes': _minutes(row['total']), 'sessions': row['count']}
+        for row in SessionRollup.objects.filter(user=user, day__gte=start, day__lte=end)
+        .values('skill_id', 'skill__name')
+        .annotate(total=Sum('duration'), count=Sum('sessions'))
+        .order_by('-total')
+    ]
+    return {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'daily': daily,
+        'weekly': [
+            {'week': week.isoformat(), 'minutes': round(totals['minutes'], 1), 'sessions': totals['sessions']}
+            for week, totals in weekly.items()
+        ],
+        'per_skill': per_skill,
+    }
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TrackerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tracker'
+
+    def ready(self):
+        from . import signals  # noqa: F401  (registers signal handlers)
+        from . import sqlite  # noqa: F401  (tunes new SQLite connections)
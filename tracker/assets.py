@@ -0,0 +1,252 @@
+import gzip
+import re
+import shutil
+import subprocess
+import tempfile
+import urllib.request
+from pathlib import Path
+from django.conf import settings
+
+# Static Asset Pipeline
+#
+# base.html used to load Bootstrap, Font Awesome, animate.css and the Tailwind
+# runtime (which compiles CSS in the browser on every page) from CDNs, plus three
+# separate local scripts. build_assets() replaces them with two local files:
+#
+#   dist/app.css  the vendor CSS purged of selectors no template or script uses,
+#                 custom.css, and Tailwind utilities compiled ahead of time by
+#                 the standalone Tailwind CLI, all minified
+#   dist/app.js   the Bootstrap bundle followed by utils.js, main.js and auth.js
+#
+# Run it with the build_assets command, then collectstatic. The staticfiles
+# storage (storage.py) gives every file a content-hash name and writes .gz/.br
+# variants next to it. Vendor sources are downloaded once (--fetch) into
+# assets/vendor/ at pinned versions, so builds are repeatable and offline.
+
+APP_DIR = Path(__file__).resolve().parent
+STATIC_DIR = APP_DIR / 'static'
+DIST_DIR = STATIC_DIR / 'dist'
+VENDOR_DIR = Path(settings.BASE_DIR) / 'assets' / 'vendor'
+BUNDLE_CSS = 'dist/app.css'
+BUNDLE_JS = 'dist/app.js'
+
+_FONT_AWESOME = 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0'
+VENDOR_FILES = {
+    'bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'bootstrap.bundle.min.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'animate.min.css': 'https://cdnjs.cloudflare.com/ajax/libs/animate.css/4.1.1/animate.min.css',
+    'fontawesome/css/all.min.css': f'{_FONT_AWESOME}/css/all.min.css',
+    **{
+        f'fontawesome/webfonts/{font}.{ext}': f'{_FONT_AWESOME}/webfonts/{font}.{ext}'
+        for font in ('fa-brands-400', 'fa-regular-400', 'fa-solid-900', 'fa-v4compatibility')
+        for ext in ('woff2', 'ttf')
+    },
+    'tailwindcss-runtime.js': 'https://cdn.tailwindcss.com/3.4.1',  # Only weighed for the report
+}
+
+# Bundle contents in cascade order: (source path, minify?)
+CSS_SOURCES = [
+    (VENDOR_DIR / 'bootstrap.min.css', False),
+    (VENDOR_DIR / 'fontawesome' / 'css' / 'all.min.css', False),
+    (VENDOR_DIR / 'animate.min.css', False),
+    (STATIC_DIR / 'css' / 'custom.css', True),
+]
+JS_SOURCES = [
+    (VENDOR_DIR / 'bootstrap.bundle.min.js', False),
+    (STATIC_DIR / 'js' / 'utils.js', True),
+    (STATIC_DIR / 'js' / 'main.js', True),
+    (STATIC_DIR / 'js' / 'auth.js', True),
+]
+# What base.html loaded before the bundles, for the page-weight report
+UNBUNDLED = [path for path, _ in CSS_SOURCES + JS_SOURCES] + [VENDOR_DIR / 'tailwindcss-runtime.js']
+
+# Files scanned for class names that must survive purging
+CONTENT_GLOBS = ['Templates/**/*.html', 'static/js/**/*.js']
+# Classes built at runtime that never appear literally, e.g. alert-{{ message.tags }}
+SAFELIST = re.compile(r'^(alert-|bs-)')
+
+_STRING_OR_COMMENT = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+_STRING = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+_SELECTOR_NAMES = re.compile(r'[.#]((?:[\w-]|\\.)+)')
+_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+_FONT_FAMILY = re.compile(r'font-family\s*:\s*([\'"]?)([^;\'"}]+)\1')
+_KEYFRAMES_NAME = re.compile(r'^@(?:-webkit-)?keyframes\s+(\S+)')
+
+
+def fetch_vendor_files(force=False, progress=None):
+    """Download the pinned vendor files that are missing from assets/vendor/; return how many were fetched."""
+    fetched = 0
+    for name, url in VENDOR_FILES.items():
+        target = VENDOR_DIR / name
+        if target.exists() and not force:
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with urllib.request.urlopen(url, timeout=30) as response, open(target, 'wb') as out:
+            shutil.copyfileobj(response, out)
+        fetched += 1
+        if progress:
+            progress(name)
+    return fetched
+
+
+def used_names():
+    """Return every word that appears in the templates and scripts (a superset of the classes in use)."""
+    paths = [path for pattern in CONTENT_GLOBS for path in APP_DIR.glob(pattern)]
+    paths += [path for path, _ in JS_SOURCES if path.exists()]  # Bootstrap's JS toggles its own classes
+    return {word for path in paths for word in re.findall(r'[\w-]+', path.read_text(encoding='utf-8'))}
+
+
+def _strip_comments(css):
+    return _STRING_OR_COMMENT.sub(lambda match: match.group(1) or '', css)
+
+
+def _blocks(css):
+    """Yield (prelude, body) for each top-level block and (statement, None) for each top-level statement."""
+    depth, start, prelude_end, i = 0, 0, 0, 0
+    while i < len(css):
+        char = css[i]
+        if char in '"\'':
+            string = _STRING.match(css, i)
+            i = string.end() if string else i + 1
+            continue
+        if char == '{':
+            if depth == 0:
+                prelude_end = i
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                yield css[start:prelude_end].strip(), css[prelude_end + 1:i]
+                start = i + 1
+        elif char == ';' and depth == 0:
+            yield css[start:i].strip(), None
+            start = i + 1
+        i += 1
+
+
+def _selectors(prelude):
+    """Split a selector list on the commas that are not inside :is(...)/:not(...) etc."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(prelude):
+        depth += {'(': 1, ')': -1}.get(char, 0)
+        if char == ',' and depth == 0:
+            parts.append(prelude[start:i].strip())
+            start = i + 1
+    parts.append(prelude[start:].strip())
+    return parts
+
+
+def _selector_used(selector, used):
+    names = [name.replace('\\', '') for name in _SELECTOR_NAMES.findall(selector)]
+    return all(name in used or SAFELIST.match(name) for name in names)
+
+
+def purge_css(css, used):
+    """Drop the rules whose selectors name a class or id outside ``used``, then unreferenced fonts and keyframes."""
+    kept = []  # (kind, name, text); fonts and keyframes are decided once the rules are known
+    for prelude, body in _blocks(_strip_comments(css)):
+        lowered = prelude.lower()
+        if body is None:
+            if not lowered.startswith('@charset'):  # Only valid first in a file; the bundle is UTF-8 anyway
+                kept.append(('other', None, prelude + ';'))
+        elif lowered.startswith(('@media', '@supports', '@layer', '@container')):
+            inner = purge_css(body, used)
+            if inner:
+                kept.append(('other', None, f'{prelude}{{{inner}}}'))
+        elif _KEYFRAMES_NAME.match(prelude):
+            kept.append(('keyframes', _KEYFRAMES_NAME.match(prelude).group(1), f'{prelude}{{{body}}}'))
+        elif lowered.startswith('@font-face'):
+            family = _FONT_FAMILY.search(body)
+            kept.append(('font', family.group(2).strip() if family else None, f'{prelude}{{{body}}}'))
+        elif lowered.startswith('@'):
+            kept.append(('other', None, f'{prelude}{{{body}}}'))
+        else:
+            selectors = [selector for selector in _selectors(prelude) if _selector_used(selector, used)]
+            if selectors:
+                kept.append(('other', None, f"{','.join(selectors)}{{{body}}}"))
+    rules = ''.join(text for kind, _, text in kept if kind == 'other')
+    return ''.join(
+        text for kind, name, text in kept
+        if kind == 'other' or name is None or re.search(rf'(?<![\w-]){re.escape(name)}(?![\w-])', rules)
+    )
+
+
+def minify_css(css):
+    parts = _STRING.split(_strip_comments(css))
+    for i in range(0, len(parts), 2):  # Even parts are outside strings
+        text = re.sub(r'\s+', ' ', parts[i])
+        text = re.sub(r'\s*([{};,>])\s*', r'\1', text).replace(';}', '}')
+        parts[i] = re.sub(r'(?<=[{;])([\w-]+): ', r'\1:', text)  # "color: red" but not "a :hover"
+    return ''.join(parts).strip()
+
+
+def minify_js(js):
+    """Drop indentation, blank lines and whole-line comments; hand-written sources only (no parsing)."""
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+
+def _copy_urls(css, source, files_dir):
+    """Copy the files ``css`` references relative to ``source`` into the bundle and point url()s at them."""
+    def replace(match):
+        url = match.group(2).strip()
+        if re.match(r'^(data:|https?:|/|#)', url):
+            return match.group(0)
+        path, suffix = re.match(r'^([^?#]*)(.*)$', url).groups()
+        files_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile((source.parent / path).resolve(), files_dir / Path(path).name)
+        return f'url({files_dir.name}/{Path(path).name}{suffix})'
+    return _URL.sub(replace, css)
+
+
+def compile_tailwind(cli):
+    """Run the standalone Tailwind v3 CLI over the templates and scripts; return minified CSS."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, output = Path(tmp) / 'input.css', Path(tmp) / 'output.css'
+        source.write_text('@tailwind base;\n@tailwind components;\n@tailwind utilities;\n')
+        subprocess.run(
+            [cli, '-i', str(source), '-o', str(output), '--minify',
+             '--content', ','.join(str(APP_DIR / pattern) for pattern in CONTENT_GLOBS)],
+            check=True, capture_output=True,
+        )
+        return output.read_text(encoding='utf-8')
+
+
+def build_bundles(tailwind_cli):
+    """Write dist/app.css and dist/app.js; return their paths."""
+    missing = [str(path) for path, _ in CSS_SOURCES + JS_SOURCES if not path.exists()]
+    if missing:
+        raise FileNotFoundError(f"Missing asset sources (run build_assets --fetch): {', '.join(missing)}")
+    used = used_names()
+    shutil.rmtree(DIST_DIR, ignore_errors=True)
+    DIST_DIR.mkdir(parents=True)
+    css = []
+    for path, minify in CSS_SOURCES:
+        text = purge_css(path.read_text(encoding='utf-8'), used)
+        css.append(_copy_urls(minify_css(text) if minify else text, path, DIST_DIR / 'files'))
+    css.append(compile_tailwind(tailwind_cli))  # Last, as the runtime injected its styles after the others
+    js = [minify_js(path.read_text(encoding='utf-8')) if minify else path.read_text(encoding='utf-8')
+          for path, minify in JS_SOURCES]
+    css_path, js_path = STATIC_DIR / BUNDLE_CSS, STATIC_DIR / BUNDLE_JS
+    css_path.write_text('\n'.join(css), encoding='utf-8')
+    js_path.write_text(';\n'.join(js), encoding='utf-8')  # ";" so no file's last statement runs into the next
+    return [css_path, js_path]
+
+
+def _brotli_size(data):
+    try:
+        import brotli
+    except ImportError:  # Optional; pip install brotli
+        return None
+    return len(brotli.compress(data, quality=11))
+
+
+def page_weight(paths):
+    """Return [(name, raw bytes, gzip bytes, brotli bytes or None)] plus a totals row."""
+    rows = []
+    for path in paths:
+        data = Path(path).read_bytes()
+        rows.append((Path(path).name, len(data), len(gzip.compress(data, 9)), _brotli_size(data)))
+    brotli_total = None if any(row[3] is None for row in rows) else sum(row[3] for row in rows)
+    rows.append((f'total ({len(paths)} requests)', sum(r[1] for r in rows), sum(r[2] for r in rows), brotli_total))
+    return rows
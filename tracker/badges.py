@@ -0,0 +1,46 @@
+from bisect import bisect_right
+from .catalog import get_catalog
+from .dashboard import invalidate_dashboard
+from .models import UserBadge
+
+# Badge Evaluation Engine
+#
+# Badges come from the in-memory ``badges`` catalog (catalog.py), already
+# sorted by points_required, so the badges a point total qualifies for are one
+# bisect instead of one query per badge. The threshold list is rebuilt
+# whenever the catalog is reloaded. Awarding checks every threshold up to the
+# user's total against the badges they already hold, so points earned on paths
+# that award no badges, and badges added below a user's total, are caught up
+# on the next award.
+
+_badge_index = (None, [])  # (badges catalog, thresholds)
+
+
+def _get_badge_index():
+    global _badge_index
+    badges = get_catalog('badges')
+    if _badge_index[0] is not badges:
+        _badge_index = (badges, [badge.points_required for badge in badges])
+    return _badge_index[1], badges
+
+
+def badges_reached(points):
+    """Return badges whose threshold is at most ``points``."""
+    thresholds, badges = _get_badge_index()
+    return badges[:bisect_right(thresholds, points)]
+
+
+def award_badges(user, points):
+    """Award every badge ``points`` qualifies for that the user lacks, with at most one INSERT; return them."""
+    reached = badges_reached(points)
+    if not reached:
+        return []
+    held = set(UserBadge.objects.filter(user=user).values_list('badge_id', flat=True))
+    earned = [badge for badge in reached if badge.pk not in held]
+    if earned:
+        UserBadge.objects.bulk_create(
+            [UserBadge(user=user, badge=badge) for badge in earned],
+            ignore_conflicts=True,
+        )
+        invalidate_dashboard(user.pk)  # bulk_create sends no post_save signals
+    return earned
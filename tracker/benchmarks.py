@@ -0,0 +1,244 @@
+import json
+import logging
+import random
+import statistics
+import time
+import tracemalloc
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, get_resolver
+from django.urls.resolvers import RoutePattern
+from django.utils import timezone
+from .analytics import rebuild_rollups
+from .catalog import CATALOGS, invalidate_catalog
+from .leaderboard import rebuild_buckets
+from .models import (
+    UserProfile, Skill, UserSkill, Schedule, Task, LearningSession, RoadmapStep,
+    Badge, UserBadge, Quote, Video, DailyActivity,
+)
+from .search import index_objects, rebuild_search_index
+from .stats import backfill_daily_stats
+
+# View Benchmarks
+#
+# Seeds a synthetic population, requests every parameterless named URL in the
+# project's urlconf through the test client and records query counts,
+# duplicate queries, p50/p95 latency and peak allocations per view. Results
+# are compared against the budgets in benchmark_budgets.json, and any view
+# answering with an error status fails the check outright.
+
+BUDGETS_PATH = Path(__file__).with_name('benchmark_budgets.json')
+BULK_ROWS = 200
+
+
+def _delete_payload(rows):
+    index_objects(rows)  # As if created one at a time, so the delete has search documents to drop
+    return json.dumps({'action': 'delete', 'ids': [row.pk for row in rows]})
+
+
+def _delete_tasks(user):
+    """Fresh tasks for a bulk delete, created outside the measured region for each request."""
+    return _delete_payload(Task.objects.bulk_create(
+        [Task(user=user, title=f'Bulk {i}', priority='low') for i in range(BULK_ROWS)]
+    ))
+
+
+def _delete_roadmap_steps(user):
+    skill = Skill.objects.order_by('pk').first()
+    return _delete_payload(RoadmapStep.objects.bulk_create(
+        [RoadmapStep(user=user, skill=skill, description=f'Bulk {i}') for i in range(BULK_ROWS)]
+    ))
+
+
+# Extra requests beyond a plain GET, keyed by URL name: (label suffix, method, data or callable(user) -> data)
+REQUEST_SPECS = {
+    'task_list': [('JSON', 'get', {'format': 'json', 'size': 20})],
+    'roadmap': [('JSON', 'get', {'format': 'json', 'size': 20})],
+    'tasks_bulk': [
+        ('POST', 'post', json.dumps({
+            'action': 'reprioritize', 'ids': list(range(1, BULK_ROWS + 1)), 'priority': 'high',
+        })),
+        ('delete', 'post', _delete_tasks),
+    ],
+    'roadmap_bulk': [
+        ('POST', 'post', json.dumps({'action': 'complete', 'ids': list(range(1, BULK_ROWS + 1))})),
+        ('delete', 'post', _delete_roadmap_steps),
+    ],
+    'search': [('prefix', 'get', {'q': 'tas'})],
+    'pomodoro': [('POST', 'post', {'duration': 25})],
+    'pomodoro_batch': [('POST', 'post', json.dumps([{'duration': 25}] * 20))],
+}
+SKIP_GET = {'pomodoro_batch', 'tasks_bulk', 'roadmap_bulk'}  # POST-only endpoints
+
+
+def seed_population(users=20, skills=10, sessions=50, tasks=30, seed=0):
+    """Create a synthetic population and return the first (benchmarked) user."""
+    rng = random.Random(seed)
+    now = timezone.now()
+    today = timezone.localdate()
+    created_users = User.objects.bulk_create([User(username=f'bench{i}') for i in range(users)])
+    profiles = UserProfile.objects.bulk_create(
+        [UserProfile(user=user, role='student', points=rng.randint(0, 5000)) for user in created_users]
+    )
+    skill_rows = Skill.objects.bulk_create(
+        [Skill(name=f'Skill {i}', level='beginner', category='programming') for i in range(skills)]
+    )
+    badges = Badge.objects.bulk_create(
+        [Badge(name=f'Badge {i}', description='', icon='', points_required=i * 500) for i in range(10)]
+    )
+    Quote.objects.bulk_create([Quote(text=f'Quote {i}', author='Bench') for i in range(100)])
+    Video.objects.bulk_create([Video(title=f'Video {i}', url=f'https://example.com/{i}') for i in range(20)])
+    UserSkill.objects.bulk_create(
+        [UserSkill(userprofile=profile, skill=skill) for profile in profiles for skill in skill_rows[:3]]
+    )
+    UserBadge.objects.bulk_create(
+        [UserBadge(user=profile.user, badge=badge) for profile in profiles
+         for badge in badges if badge.points_required <= profile.points]
+    )
+    for user in created_users:
+        LearningSession.objects.bulk_create(
+            [LearningSession(user=user, skill=rng.choice(skill_rows), duration=timedelta(minutes=25),
+                             date=now - timedelta(days=rng.randint(0, 90))) for _ in range(sessions)]
+        )
+        Task.objects.bulk_create(
+            [Task(user=user, title=f'Task {i}', priority='medium', completed=rng.random() < 0.5) for i in range(tasks)]
+        )
+        Schedule.objects.bulk_create(
+            [Schedule(user=user, date=today + timedelta(days=i), time='09:00', task='Study') for i in range(tasks)]
+        )
+        RoadmapStep.objects.bulk_create(
+            [RoadmapStep(user=user, skill=rng.choice(skill_rows), description=f'Step {i}') for i in range(tasks)]
+        )
+        DailyActivity.objects.bulk_create(
+            [DailyActivity(user=user, title=f'Activity {i}', category='other') for i in range(5)]
+        )
+    # bulk_create skips the signals that maintain these
+    rebuild_buckets()
+    rebuild_rollups()
+    backfill_daily_stats()
+    rebuild_search_index()
+    for name in CATALOGS:
+        invalidate_catalog(name)
+    return created_users[0]
+
+
+def benchmark_targets():
+    """Return (label, url name, path, method, data) for every benchmarkable URL."""
+    targets = []
+    for pattern in get_resolver().url_patterns:
+        if not isinstance(pattern, URLPattern) or not pattern.name:
+            continue
+        if not isinstance(pattern.pattern, RoutePattern) or pattern.pattern.converters:
+            continue  # Needs URL arguments (e.g. password reset tokens)
+        path = '/' + str(pattern.pattern)
+        if pattern.name not in SKIP_GET:
+            targets.append((pattern.name, pattern.name, path, 'get', None))
+        for suffix, method, data in REQUEST_SPECS.get(pattern.name, []):
+            targets.append((f'{pattern.name} [{suffix}]', pattern.name, path, method, data))
+    return targets
+
+
+async def _drain(chunks):
+    async for _ in chunks:
+        pass
+
+
+def _request(client, user, method, path, data):
+    """Log in and build the request data (outside the measured region); return a callable that sends one request."""
+    client.force_login(user)  # logout would otherwise end the session for later targets
+    if callable(data):
+        data = data(user)
+
+    def send():
+        if method == 'post' and isinstance(data, str):
+            response = client.post(path, data=data, content_type='application/json')
+        else:
+            response = getattr(client, method)(path, data=data)
+        if response.streaming:  # Streaming views do their queries while iterated
+            if response.is_async:
+                async_to_sync(_drain)(response.streaming_content)
+            else:
+                b''.join(response.streaming_content)
+        return response
+    return send
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def run_benchmarks(user, iterations=20):
+    """Measure every target and return a report dict keyed by target label."""
+    client = Client(raise_request_exception=False)
+    request_logger = logging.getLogger('django.request')
+    previous_level = request_logger.level
+    request_logger.setLevel(logging.CRITICAL)  # Failing views are reported by status instead
+    try:
+        return {
+            label: _measure(client, user, name, path, method, data, iterations)
+            for label, name, path, method, data in benchmark_targets()
+        }
+    finally:
+        request_logger.setLevel(previous_level)
+
+
+def _measure(client, user, name, path, method, data, iterations):
+    _request(client, user, method, path, data)()  # Warm-up (fills caches, loads templates)
+    timings, query_counts = [], []
+    status = duplicates = None
+    for _ in range(iterations):
+        send = _request(client, user, method, path, data)
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = send()
+            timings.append((time.perf_counter() - start) * 1000)
+        if status is None or status < 400:  # An error in any iteration is what gets reported
+            status = response.status_code
+        query_counts.append(len(captured.captured_queries))
+        repeated = Counter(query['sql'] for query in captured.captured_queries)
+        duplicates = sum(count - 1 for count in repeated.values() if count > 1)
+    send = _request(client, user, method, path, data)
+    tracemalloc.start()
+    send()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'url_name': name,
+        'path': path,
+        'method': method.upper(),
+        'status': status,
+        'queries': max(query_counts),
+        'duplicate_queries': duplicates,
+        'p50_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(_percentile(timings, 95), 3),
+        'peak_alloc_kb': round(peak / 1024, 1),
+    }
+
+
+def load_budgets(path=BUDGETS_PATH):
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def check_budgets(report, budgets, latency=True):
+    """Return a list of human-readable budget violations."""
+    violations = []
+    for label, result in report.items():
+        budget = budgets.get(label)
+        if budget is None:
+            violations.append(f'{label}: no budget in {BUDGETS_PATH.name}')
+            continue
+        if result['status'] >= 400:
+            violations.append(f"{label}: responded {result['status']}")
+        if result['queries'] > budget['max_queries']:
+            violations.append(f"{label}: {result['queries']} queries > budget {budget['max_queries']}")
+        if latency and result['p95_ms'] > budget['max_p95_ms']:
+            violations.append(f"{label}: p95 {result['p95_ms']}ms > budget {budget['max_p95_ms']}ms")
+    return violations
@@ -0,0 +1,103 @@
+import json
+from datetime import date
+from django.db import transaction
+from .badges import award_badges
+from .dashboard import invalidate_dashboard
+from .models import Task, RoadmapStep
+from .points import award_points, get_points
+from .search import unindex_objects
+
+# Bulk Task and Roadmap Operations
+#
+# Each action is a single QuerySet.update() (or delete) over the user's
+# selected rows, and completions are paid out with one ledger entry for the
+# whole batch. Completing only matches rows that are still open, so the
+# affected count is exactly what was earned and repeats award nothing.
+# Deletes drop the rows' search documents with one more DELETE instead of one
+# per row from the post_delete handler.
+
+TASK_POINTS = 10
+ROADMAP_STEP_POINTS = 20
+MAX_BULK_IDS = 1000
+MAX_ID = 2 ** 63 - 1  # Largest primary key a 64-bit integer column can hold
+
+PRIORITIES = {value for value, _ in Task._meta.get_field('priority').choices}
+TASK_ACTIONS = ('complete', 'reprioritize', 'reschedule', 'delete')
+ROADMAP_ACTIONS = ('complete', 'delete')
+
+
+def parse_bulk_request(body, actions):
+    """
+    Validate a bulk request body ({action, ids, priority?, due_date?}).
+
+    Returns (action, ids, params); raises ValueError with a user-facing message.
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise ValueError('Request body must be JSON.') from None
+    if not isinstance(payload, dict):
+        raise ValueError('Expected a JSON object.')
+    action = payload.get('action')
+    if action not in actions:
+        raise ValueError(f"action must be one of {', '.join(actions)}.")
+    ids = payload.get('ids')
+    if not isinstance(ids, list) or not ids or not all(
+        isinstance(i, int) and not isinstance(i, bool) and 0 < i <= MAX_ID for i in ids
+    ):
+        raise ValueError('ids must be a non-empty list of positive integers.')
+    if len(ids) > MAX_BULK_IDS:
+        raise ValueError(f'At most {MAX_BULK_IDS} ids per request.')
+    params = {}
+    if action == 'reprioritize':
+        if payload.get('priority') not in PRIORITIES:
+            raise ValueError(f"priority must be one of {', '.join(sorted(PRIORITIES))}.")
+        params['priority'] = payload['priority']
+    elif action == 'reschedule':
+        due_date = payload.get('due_date')
+        try:
+            params['due_date'] = date.fromisoformat(due_date) if due_date is not None else None
+        except (TypeError, ValueError):
+            raise ValueError('due_date must be YYYY-MM-DD or null.') from None
+    return action, ids, params
+
+
+def _complete(user, queryset, points_each, reason):
+    with transaction.atomic():
+        updated = queryset.filter(completed=False).update(completed=True)
+        earned = updated * points_each
+        summary = {'updated': updated, 'points_earned': earned, 'badges_earned': []}
+        if earned:
+            award_points(user, earned, reason)
+            summary['badges_earned'] = [badge.name for badge in award_badges(user, get_points(user))]
+    return summary
+
+
+def _delete(queryset):
+    with transaction.atomic():
+        ids = list(queryset.values_list('id', flat=True))
+        if not ids:
+            return 0
+        with unindex_objects(queryset.model, ids):
+            return queryset.model.objects.filter(id__in=ids).delete()[0]
+
+
+def bulk_tasks(user, action, ids, **params):
+    """Apply one action to the user's tasks among ``ids``; return the affected counts."""
+    tasks = Task.objects.filter(user=user, id__in=ids)
+    if action == 'complete':
+        summary = _complete(user, tasks, TASK_POINTS, 'task')
+    elif action == 'delete':
+        summary = {'deleted': _delete(tasks)}
+    else:  # reprioritize / reschedule
+        summary = {'updated': tasks.update(**params)}
+    invalidate_dashboard(user.pk)  # update() sends no post_save signals
+    return summary
+
+
+def bulk_roadmap_steps(user, action, ids):
+    """Apply one action to the user's roadmap steps among ``ids``; return the affected counts."""
+    steps = RoadmapStep.objects.filter(user=user, id__in=ids)
+    if action == 'complete':
+        return _complete(user, steps, ROADMAP_STEP_POINTS, 'roadmap_step')
+    return {'deleted': _delete(steps)}
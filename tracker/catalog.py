@@ -0,0 +1,69 @@
+import time
+from django.core.cache import cache
+from .models import Badge, Quote, Skill, Video
+
+# Reference Data Catalogs
+#
+# Quotes, videos, badges and skills change only through the admin, so each
+# catalog is loaded once per process and served from memory. Every catalog
+# has a version counter in the shared cache; the signals in signals.py bump it
+# on any write and each worker reloads on its next read, so invalidation
+# reaches all processes without shipping the rows through the cache. Loads
+# always read the primary: a lagging replica would otherwise be remembered
+# under the new version until the next write.
+
+# name -> (model, ordering)
+CATALOGS = {
+    'quotes': (Quote, ('id',)),
+    'videos': (Video, ('id',)),
+    'badges': (Badge, ('points_required', 'id')),
+    'skills': (Skill, ('name', 'id')),
+}
+CATALOG_PAGE_SIZE = 20
+
+_catalogs = {}  # name -> (version, rows)
+
+
+def _version_key(name):
+    return f'catalog:{name}:version'
+
+
+def catalog_version(name):
+    """Return the shared version counter of a catalog, creating it on first use."""
+    key = _version_key(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_catalog(name):
+    """Return every row of a catalog as a tuple, reloading only after a write."""
+    version = catalog_version(name)
+    loaded = _catalogs.get(name)
+    if loaded is None or loaded[0] != version:
+        model, ordering = CATALOGS[name]
+        loaded = _catalogs[name] = (version, tuple(model.objects.using('default').order_by(*ordering)))
+    return loaded[1]
+
+
+def get_catalog_ids(name):
+    """Return the primary keys of a catalog in catalog order, without loading the rows."""
+    version = catalog_version(name)
+    key = f'{name}:ids'
+    loaded = _catalogs.get(key)
+    if loaded is None or loaded[0] != version:
+        model, ordering = CATALOGS[name]
+        loaded = _catalogs[key] = (version, list(
+            model.objects.using('default').order_by(*ordering).values_list('id', flat=True)
+        ))
+    return loaded[1]
+
+
+def invalidate_catalog(name):
+    """Make every worker reload a catalog on its next read."""
+    try:
+        cache.incr(_version_key(name))
+    except ValueError:
+        cache.set(_version_key(name), time.time_ns(), None)
@@ -0,0 +1,17 @@
+# Chart Render Worker
+#
+# Runs inside the chart process pool (see charts.py). Deliberately free of
+# Django imports so pool workers start quickly under any start method. Each
+# worker imports plotly once and keeps Kaleido's renderer process alive
+# between charts instead of starting one per image.
+
+
+def warm_up():
+    """Pool initializer: pay plotly's import cost once per worker."""
+    import plotly.io  # noqa: F401
+
+
+def render(spec, fmt, width, height):
+    """Render a Plotly figure spec (a plain dict) to PNG or SVG bytes."""
+    import plotly.io as pio
+    return pio.to_image(spec, format=fmt, width=width, height=height)
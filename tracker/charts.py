@@ -0,0 +1,180 @@
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter
+from datetime import timedelta
+from functools import cache
+from pathlib import Path
+from django.conf import settings
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from . import chart_worker
+from .models import DailyStats, PointsLedgerEntry, UserSkill
+from .points import get_points
+
+logger = logging.getLogger(__name__)
+
+# Progress Charts
+#
+# Charts are described as Plotly figure specs built as plain dicts, so by default
+# a chart is served as that JSON for plotly.js to draw in the browser and
+# nothing is rendered on the server. PNG/SVG (for exports, emails, no-JS
+# clients) are rendered by plotly + Kaleido in a process pool whose workers keep
+# their renderer between charts. Images are cached on disk under a hash of the
+# spec, format and size, so unchanged data is never rendered twice, and the
+# cache is trimmed least-recently-used first. plotly and kaleido are optional:
+# without them (or if a render fails) image requests get the JSON spec.
+
+CHART_DAYS = 90
+CHART_WIDTH, CHART_HEIGHT = 800, 450
+IMAGE_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+CHART_CACHE_DIR = Path(getattr(settings, 'CHART_CACHE_DIR', Path(settings.BASE_DIR) / 'chart_cache'))
+CHART_CACHE_MAX_BYTES = getattr(settings, 'CHART_CACHE_MAX_BYTES', 100 * 1024 * 1024)
+CHART_RENDER_WORKERS = getattr(settings, 'CHART_RENDER_WORKERS', 2)
+RENDER_TIMEOUT = 60  # Seconds per batch
+
+
+def _layout(title, **extra):
+    return {'title': {'text': title}, 'margin': {'l': 60, 'r': 20, 't': 50, 'b': 50}, 'template': 'plotly_white', **extra}
+
+
+def skills_chart(user):
+    """Hours studied per skill, from the running UserSkill totals."""
+    rows = UserSkill.objects.filter(userprofile__user=user).order_by('time_spent').values_list('skill__name', 'time_spent')
+    return {
+        'data': [{
+            'type': 'bar', 'orientation': 'h',
+            'x': [round(time_spent.total_seconds() / 3600, 1) for _, time_spent in rows],
+            'y': [name for name, _ in rows],
+            'marker': {'color': '#2A9D8F'},
+        }],
+        'layout': _layout('Time per skill', xaxis={'title': {'text': 'Hours'}}),
+    }
+
+
+def xp_chart(user, days=CHART_DAYS):
+    """Total points at the end of each of the last ``days`` days, from the daily stats rows and pending awards."""
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    earned = Counter(dict(
+        DailyStats.objects.filter(user=user, day__gte=start, day__lte=today).values_list('day', 'points')
+    ))
+    # DailyStats only holds compacted points; awards still in the ledger count on the day they were made
+    pending = (
+        PointsLedgerEntry.objects.filter(user=user, compacted_at__isnull=True)
+        .annotate(day=TruncDate('created_at')).values_list('day').annotate(points=Sum('amount')).order_by()
+    )
+    for day, points in pending:
+        if start <= day <= today:
+            earned[day] += points
+    total = get_points(user) - sum(earned.values())  # Points held before the window
+    x, y = [], []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        total += earned.get(day, 0)
+        x.append(day.isoformat())
+        y.append(total)
+    return {
+        'data': [{'type': 'scatter', 'mode': 'lines', 'x': x, 'y': y, 'line': {'color': '#E76F51'}}],
+        'layout': _layout('XP over time', yaxis={'title': {'text': 'Points'}}),
+    }
+
+
+CHART_BUILDERS = {'skills': skills_chart, 'xp': xp_chart}
+
+
+def chart_spec(user, kind):
+    return CHART_BUILDERS[kind](user)
+
+
+def chart_key(spec, fmt='json', width=CHART_WIDTH, height=CHART_HEIGHT):
+    """A stable hash of what an output depends on: the figure data, format and size."""
+    payload = json.dumps([spec, fmt, width, height], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+# Disk cache
+
+def _cache_path(key, fmt):
+    return CHART_CACHE_DIR / key[:2] / f'{key}.{fmt}'
+
+
+def cached_image(key, fmt):
+    """Return a cached image, marking it recently used, or None."""
+    path = _cache_path(key, fmt)
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    os.utime(path)  # mtime doubles as the last-use time for eviction
+    return data
+
+
+def store_image(key, fmt, data):
+    path = _cache_path(key, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as tmp:
+        tmp.write(data)
+    os.replace(tmp.name, path)  # Readers never see a partial file
+
+
+def trim_cache(max_bytes=CHART_CACHE_MAX_BYTES):
+    """Delete least recently used images until the cache is under 90% of ``max_bytes``; return bytes freed."""
+    entries = []
+    for path in CHART_CACHE_DIR.glob('*/*'):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:  # Evicted by another process
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return 0
+    freed = 0
+    for _, size, path in sorted(entries):
+        if total - freed <= max_bytes * 0.9:
+            break
+        path.unlink(missing_ok=True)
+        freed += size
+    return freed
+
+
+# Rendering
+
+@cache
+def renderer_available():
+    return all(importlib.util.find_spec(module) is not None for module in ('plotly', 'kaleido'))
+
+
+@cache
+def _render_pool():
+    return ProcessPoolExecutor(max_workers=CHART_RENDER_WORKERS, initializer=chart_worker.warm_up)
+
+
+def render_images(jobs):
+    """
+    Render [(spec, fmt, width, height)] to image bytes, reusing cached images and
+    sending all misses to the pool at once. Returns a list aligned with ``jobs``
+    (None where rendering failed).
+    """
+    keys = [chart_key(spec, fmt, width, height) for spec, fmt, width, height in jobs]
+    results = [cached_image(key, job[1]) for key, job in zip(keys, jobs)]
+    pending = {
+        index: _render_pool().submit(chart_worker.render, *jobs[index])
+        for index, result in enumerate(results) if result is None
+    }
+    for index, future in pending.items():
+        try:
+            results[index] = future.result(timeout=RENDER_TIMEOUT)
+        except Exception:
+            logger.exception('Rendering a %s chart failed', jobs[index][1])
+            continue
+        store_image(keys[index], jobs[index][1], results[index])
+    if pending:
+        trim_cache()
+    return results
@@ -0,0 +1,92 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.utils import timezone
+from .models import Task, Schedule, UserBadge, DailyActivity, UserSkill
+
+# Dashboard Data Service
+#
+# Everything the dashboard shows is fetched in one pass (one query per
+# relation via prefetch_related, badges and skills joined in) and stored as a
+# compact per-user snapshot in Django's cache. Writes to the underlying models
+# drop the snapshot through the handlers in signals.py. Snapshots are built
+# from the primary (the prefetches follow the user row there), so a lagging
+# replica is never cached.
+
+DASHBOARD_CACHE_TIMEOUT = 60 * 15
+
+
+def _cache_key(user_id, day):
+    return f'dashboard:{user_id}:{day.isoformat()}'
+
+
+def _build_snapshot(user_id, today):
+    """Load all dashboard data for a user and reduce it to plain dicts."""
+    user = User.objects.using('default').prefetch_related(
+        Prefetch('userprofile__userskill_set', queryset=UserSkill.objects.select_related('skill')),
+        Prefetch('task_set', queryset=Task.objects.filter(completed=False)),
+        Prefetch('schedule_set', queryset=Schedule.objects.filter(date__gte=today).order_by('date', 'time')),
+        Prefetch('userbadge_set', queryset=UserBadge.objects.select_related('badge')),
+        Prefetch('dailyactivity_set', queryset=DailyActivity.objects.filter(date=today)),
+    ).get(pk=user_id)
+    profile = getattr(user, 'userprofile', None)
+    user_skills = profile.userskill_set.all() if profile else []
+    return {
+        'skills': [
+            {
+                'id': us.skill_id,
+                'name': us.skill.name,
+                'icon': us.skill.icon,
+                'level': us.skill.level,
+                'category': us.skill.category,
+                'progress': us.skill.progress,
+                'proficiency_level': us.proficiency_level,
+                'time_spent': us.time_spent,
+            }
+            for us in user_skills
+        ],
+        'tasks': [
+            {'id': t.id, 'title': t.title, 'priority': t.priority, 'due_date': t.due_date}
+            for t in user.task_set.all()
+        ],
+        'schedules': [
+            {'id': s.id, 'date': s.date, 'time': s.time, 'task': s.task}
+            for s in user.schedule_set.all()
+        ],
+        'badges': [
+            {
+                'name': ub.badge.name,
+                'description': ub.badge.description,
+                'icon': ub.badge.icon,
+                'earned_date': ub.earned_date,
+            }
+            for ub in user.userbadge_set.all()
+        ],
+        'activities': [
+            {
+                'id': a.id,
+                'title': a.title,
+                'category': a.category,
+                'time_of_day': a.time_of_day,
+                'is_completed': a.is_completed,
+            }
+            for a in user.dailyactivity_set.all()
+        ],
+    }
+
+
+def get_dashboard_snapshot(user):
+    """Return the cached dashboard snapshot for a user, building it on a miss."""
+    today = timezone.localdate()
+    key = _cache_key(user.pk, today)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = _build_snapshot(user.pk, today)
+        cache.set(key, snapshot, DASHBOARD_CACHE_TIMEOUT)
+    return snapshot
+
+
+def invalidate_dashboard(*user_ids):
+    """Drop today's dashboard snapshot for the given users."""
+    today = timezone.localdate()
+    cache.delete_many([_cache_key(user_id, today) for user_id in user_ids])
@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime, time, timedelta
+from .models import UserSkill, Task, Schedule, LearningSession, RoadmapStep, DailyActivity, UserBadge
+
+# Streaming Data Export
+#
+# Every record type is read with .values().iterator(chunk_size=...) and
+# encoded row by row, so exporting a user (or everyone) holds only one chunk
+# of rows and one output buffer in memory regardless of history size.
+
+EXPORT_CHUNK_SIZE = 2000
+OUTPUT_BUFFER_SIZE = 64 * 1024
+
+# type -> (model, owner lookup, exported fields)
+EXPORT_TYPES = {
+    'skills': (UserSkill, 'userprofile__user', [
+        'skill__name', 'skill__category', 'skill__level', 'proficiency_level', 'time_spent',
+    ]),
+    'tasks': (Task, 'user', ['id', 'title', 'priority', 'due_date', 'completed']),
+    'schedules': (Schedule, 'user', ['id', 'date', 'time', 'task']),
+    'sessions': (LearningSession, 'user', ['id', 'skill__name', 'duration', 'date', 'notes']),
+    'roadmap_steps': (RoadmapStep, 'user', ['id', 'skill__name', 'description', 'completed']),
+    'daily_activities': (DailyActivity, 'user', ['id', 'title', 'category', 'time_of_day', 'is_completed', 'date']),
+    'badges': (UserBadge, 'user', ['badge__name', 'earned_date']),
+}
+CSV_COLUMNS = ['type', 'user'] + list(dict.fromkeys(
+    field for _, _, fields in EXPORT_TYPES.values() for field in fields
+))
+
+
+def _encode(value):
+    """Make a field value JSON/CSV friendly (durations become minutes)."""
+    if isinstance(value, timedelta):
+        return round(value.total_seconds() / 60, 2)
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return value
+
+
+def export_rows(user=None, types=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield one dict per exported record for a user, or for all users when ``user`` is None."""
+    for name in types or EXPORT_TYPES:
+        model, owner, fields = EXPORT_TYPES[name]
+        queryset = model.objects.all()
+        if user is not None:
+            queryset = queryset.filter(**{owner: user})
+        rows = queryset.order_by('pk').values(f'{owner}__username', *fields).iterator(chunk_size=chunk_size)
+        for row in rows:
+            record = {'type': name, 'user': row.pop(f'{owner}__username')}
+            record.update((field, _encode(value)) for field, value in row.items())
+            yield record
+
+
+def _buffered(pieces):
+    """Join small string pieces into OUTPUT_BUFFER_SIZE chunks of bytes."""
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= OUTPUT_BUFFER_SIZE:
+            yield ''.join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer).encode()
+
+
+def jsonl_lines(records):
+    for record in records:
+        yield json.dumps(record) + '\n'
+
+
+def csv_lines(records):
+    """Encode records as CSV with a type column and the union of all exported fields."""
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        yield out.getvalue()
+        out.seek(0)
+        out.truncate()
+
+
+def gzip_chunks(chunks):
+    """Compress a byte stream on the fly into gzip format."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(user=None, fmt='jsonl', compress=False, types=None):
+    """Return an iterator of bytes for the requested export."""
+    encode = csv_lines if fmt == 'csv' else jsonl_lines
+    chunks = _buffered(encode(export_rows(user, types)))
+    return gzip_chunks(chunks) if compress else chunks
@@ -1,7 +1,7 @@
 from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
-from .models import UserProfile, Skill
+from .models import UserProfile, Skill, Schedule, ScheduleRule, ScheduleException, Task, DailyActivity
 
 class RegistrationForm(UserCreationForm):
     email = forms.EmailField(required=True)
@@ -14,13 +14,54 @@ class RegistrationForm(UserCreationForm):
 class UserProfileForm(forms.ModelForm):
     class Meta:
         model = UserProfile
-        fields = ['bio', 'profile_picture', 'skills']
-        widgets = {
-            'skills': forms.CheckboxSelectMultiple(),
-        }
+        fields = ['bio', 'profile_picture']
 
 class SkillForm(forms.ModelForm):
     class Meta:
         model = Skill
         fields = ['name', 'description', 'icon', 'level', 'progress', 'category']
-        
\ No newline at end of file
+
+
+class ScheduleForm(forms.ModelForm):
+    class Meta:
+        model = Schedule
+        fields = ['date', 'time', 'task']
+
+
+class ScheduleRuleForm(forms.ModelForm):
+    days = forms.MultipleChoiceField(
+        choices=list(enumerate(ScheduleRule.WEEKDAY_NAMES)), required=False,
+        widget=forms.CheckboxSelectMultiple, help_text='Weekly rules only; defaults to the start date\'s weekday.',
+    )
+
+    class Meta:
+        model = ScheduleRule
+        fields = ['task', 'time', 'frequency', 'interval', 'starts_on', 'ends_on']
+
+    def clean(self):
+        cleaned_data = super().clean()
+        starts_on, ends_on = cleaned_data.get('starts_on'), cleaned_data.get('ends_on')
+        if starts_on and ends_on and ends_on < starts_on:
+            self.add_error('ends_on', 'The end date must not be before the start date.')
+        if not cleaned_data.get('interval'):
+            self.add_error('interval', 'The interval must be at least 1.')
+        self.instance.weekdays = sum(1 << int(day) for day in cleaned_data.get('days') or [])
+        return cleaned_data
+
+
+class ScheduleExceptionForm(forms.ModelForm):
+    class Meta:
+        model = ScheduleException
+        fields = ['date', 'cancelled', 'new_date', 'new_time', 'new_task']
+
+
+class TaskForm(forms.ModelForm):
+    class Meta:
+        model = Task
+        fields = ['title', 'priority', 'due_date']
+
+
+class DailyActivityForm(forms.ModelForm):
+    class Meta:
+        model = DailyActivity
+        fields = ['title', 'category', 'time_of_day']
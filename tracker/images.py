@@ -0,0 +1,215 @@
+import json
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cache
+from io import BytesIO
+from pathlib import Path
+from django.conf import settings
+from django.core.cache import cache as django_cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+from .leaderboard import TOP_CACHE_KEY
+from .models import UserProfile
+
+logger = logging.getLogger(__name__)
+
+# Image Processing
+#
+# Profile pictures are stored as uploaded, then processed off the request path
+# by a small thread pool (Pillow releases the GIL while decoding, resizing and
+# encoding, so threads run in parallel and share the process's Django setup).
+# The processed picture is normalized: EXIF orientation applied, at most
+# MAX_PICTURE_SIDE pixels, re-encoded without metadata. It is saved under
+# profile_pics/n/ with square thumbnails in JPEG (PNG if it has transparency)
+# and WebP. A picture name under that prefix is the marker that its thumbnails
+# exist. Until then templates show the original.
+#
+# Static images are optimized in batch by the optimize_images command. It
+# writes resized WebP and recompressed fallback variants to images/optimized/,
+# plus a manifest that the {% responsive_image %} tag builds srcsets from.
+
+AVATAR_SIZES = (48, 96, 192)  # CSS pixels 48 and 96 at 1x and 2x
+MAX_PICTURE_SIDE = 1024
+PROCESSED_PREFIX = 'profile_pics/n/'
+STATIC_WIDTHS = (320, 640, 1280)
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+IMAGE_WORKERS = getattr(settings, 'IMAGE_WORKERS', 2)
+
+STATIC_IMAGES_DIR = Path(__file__).resolve().parent / 'static' / 'images'
+OPTIMIZED_DIR = STATIC_IMAGES_DIR / 'optimized'
+MANIFEST_PATH = OPTIMIZED_DIR / 'manifest.json'
+SOURCE_SUFFIXES = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def _has_alpha(image):
+    return image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def normalize(image, max_side=None):
+    """Apply EXIF orientation, convert to RGB(A) and shrink to ``max_side``; the result carries no metadata."""
+    image = ImageOps.exif_transpose(image)
+    image = image.convert('RGBA' if _has_alpha(image) else 'RGB')
+    if max_side:
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    image.info = {}
+    return image
+
+
+def encode(image, fmt):
+    """Return ``image`` encoded as JPEG, PNG or WEBP bytes with web-friendly settings."""
+    buffer = BytesIO()
+    if fmt == 'JPEG':
+        image.convert('RGB').save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    elif fmt == 'PNG':
+        image.save(buffer, 'PNG', optimize=True)
+    else:
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=6)
+    return buffer.getvalue()
+
+
+def fallback_format(image):
+    return 'PNG' if _has_alpha(image) else 'JPEG'
+
+
+# Profile pictures
+
+def picture_processed(name):
+    return bool(name) and name.startswith(PROCESSED_PREFIX)
+
+
+def avatar_name(picture_name, size, ext):
+    """Storage name of one thumbnail of a processed picture."""
+    stem, _ = os.path.splitext(picture_name)
+    return f'{stem}-{size}.{ext}'
+
+
+def process_profile_picture(profile_id):
+    """Normalize a profile's uploaded picture and write its thumbnails; return the new name or None."""
+    name = UserProfile.objects.filter(pk=profile_id).values_list('profile_picture', flat=True).first()
+    if not name or picture_processed(name):
+        return None
+    try:
+        with default_storage.open(name) as upload:
+            image = Image.open(upload)
+            image.load()
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as exc:
+        logger.warning('Discarding unreadable profile picture %s: %s', name, exc)
+        UserProfile.objects.filter(pk=profile_id, profile_picture=name).update(profile_picture='')
+        default_storage.delete(name)
+        return None
+    image = normalize(image, MAX_PICTURE_SIDE)
+    fmt = fallback_format(image)
+    ext = 'png' if fmt == 'PNG' else 'jpg'
+    stem = os.path.splitext(os.path.basename(name))[0]
+    processed = default_storage.save(f'{PROCESSED_PREFIX}{stem}.{ext}', ContentFile(encode(image, fmt)))
+    for size in AVATAR_SIZES:
+        thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for thumb_fmt, thumb_ext in ((fmt, ext), ('WEBP', 'webp')):
+            default_storage.save(avatar_name(processed, size, thumb_ext), ContentFile(encode(thumbnail, thumb_fmt)))
+    # Only if the user hasn't uploaded another picture in the meantime
+    if not UserProfile.objects.filter(pk=profile_id, profile_picture=name).update(profile_picture=processed):
+        delete_profile_picture(processed)
+        return None
+    default_storage.delete(name)
+    django_cache.delete(TOP_CACHE_KEY)  # The leaderboard caches picture names
+    return processed
+
+
+def delete_profile_picture(name):
+    """Delete a stored picture and, if it was processed, its thumbnails."""
+    if not name:
+        return
+    names = [name]
+    if picture_processed(name):
+        ext = os.path.splitext(name)[1].lstrip('.')
+        names += [avatar_name(name, size, e) for size in AVATAR_SIZES for e in (ext, 'webp')]
+    for stored in names:
+        default_storage.delete(stored)
+
+
+@cache
+def _picture_pool():
+    return ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix='images')
+
+
+def _process_in_worker(profile_id):
+    try:
+        process_profile_picture(profile_id)
+    except Exception:
+        logger.exception('Processing the profile picture of profile %s failed', profile_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_profile_picture(profile_id, replaced=None):
+    """Once the saving transaction commits, process a new upload in the worker pool and drop the one it replaced."""
+    def submit():
+        _picture_pool().submit(_process_in_worker, profile_id)
+        delete_profile_picture(replaced)
+    transaction.on_commit(submit)
+
+
+def pending_profile_ids():
+    """Profiles whose picture is still unprocessed (e.g. the process exited with work queued)."""
+    return list(
+        UserProfile.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+        .exclude(profile_picture__startswith=PROCESSED_PREFIX).values_list('pk', flat=True)
+    )
+
+
+# Static images
+
+def _optimize_static(source):
+    """Write the width variants of one static image; return its manifest entry or None if unreadable."""
+    try:
+        with Image.open(source) as opened:
+            image = normalize(opened)
+    except (OSError, UnidentifiedImageError) as exc:
+        return source.name, None, str(exc)
+    fmt = fallback_format(image)
+    ext = 'png' if fmt == 'PNG' else 'jpg'
+    stem = re.sub(r'[^\w-]+', '-', source.stem).strip('-')  # "image.jpg (1)" -> "image-jpg-1"
+    widths = sorted({min(width, image.width) for width in STATIC_WIDTHS})
+    variants = []
+    for width in widths:
+        resized = image if width == image.width else image.resize(
+            (width, round(image.height * width / image.width)), Image.Resampling.LANCZOS,
+        )
+        for variant_fmt, variant_ext in (('WEBP', 'webp'), (fmt, ext)):
+            name = f'{stem}-{width}.{variant_ext}'
+            (OPTIMIZED_DIR / name).write_bytes(encode(resized, variant_fmt))
+            variants.append({'name': name, 'width': width, 'type': f'image/{variant_ext.replace("jpg", "jpeg")}'})
+    entry = {'width': image.width, 'height': image.height, 'variants': variants}
+    return source.name, entry, None
+
+
+def optimize_static_images(workers=None, progress=None):
+    """Optimize every image in static/images in a process pool and write the manifest; return (done, failed)."""
+    OPTIMIZED_DIR.mkdir(exist_ok=True)
+    sources = sorted(path for path in STATIC_IMAGES_DIR.iterdir() if path.suffix.lower() in SOURCE_SUFFIXES)
+    manifest, failed = {}, {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for name, entry, error in pool.map(_optimize_static, sources):
+            if entry is None:
+                failed[name] = error
+            else:
+                manifest[f'images/{name}'] = entry
+            if progress:
+                progress(name, entry, error)
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    static_manifest.cache_clear()
+    return manifest, failed
+
+
+@cache
+def static_manifest():
+    """The optimized-image manifest ({static path: {width, height, variants}}), or {} before the first run."""
+    try:
+        return json.loads(MANIFEST_PATH.read_text())
+    except FileNotFoundError:
+        return {}
@@ -0,0 +1,173 @@
+import csv
+import gzip
+import json
+from datetime import datetime, timedelta
+from collections import Counter
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from .analytics import record_sessions
+from .dashboard import invalidate_dashboard
+from .forms import ScheduleForm, TaskForm, DailyActivityForm
+from .models import Skill, DailyActivity, LearningSession
+from .pomodoro import MAX_SESSION_MINUTES
+from .search import index_objects
+from .stats import record_daily_stats
+
+# Bulk Import
+#
+# Reads the JSON Lines / CSV layout written by export.py (a ``type`` and a
+# ``user`` column plus the record's fields). Rows are processed in chunks:
+# usernames for the whole chunk are resolved with one query, each row is
+# validated with the same form or model field rules as the web UI, and the
+# valid rows of each type are written with one bulk_create per chunk. A bad
+# row is reported and skipped; it never aborts the run.
+
+IMPORT_TYPES = ('tasks', 'schedules', 'daily_activities', 'sessions')
+TRUE_VALUES = {'1', 'true', 'yes', 'on'}
+
+
+def open_rows(path, fmt=None):
+    """Yield (line_number, row dict) from a JSON Lines or CSV file, gzip-aware."""
+    fmt = fmt or ('csv' if '.csv' in path else 'jsonl')
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as handle:
+        if fmt == 'csv':
+            for line_number, row in enumerate(csv.DictReader(handle), start=2):
+                yield line_number, {key: value for key, value in row.items() if value not in ('', None)}
+        else:
+            for line_number, line in enumerate(handle, start=1):
+                if line.strip():
+                    try:
+                        yield line_number, json.loads(line)
+                    except ValueError as exc:
+                        yield line_number, {'_error': f'Invalid JSON: {exc}'}
+
+
+def _flag(row, field):
+    value = row.get(field, False)
+    return value if isinstance(value, bool) else str(value).strip().lower() in TRUE_VALUES
+
+
+def _form_errors(form):
+    return '; '.join(f'{field}: {" ".join(errors)}' for field, errors in form.errors.items())
+
+
+class Importer:
+    """Validate and bulk-insert chunks of exported rows, collecting per-row errors."""
+
+    def __init__(self, chunk_size=1000):
+        self.chunk_size = chunk_size
+        self.users = {}
+        self.skills = dict(Skill.objects.order_by('-id').values_list('name', 'id'))  # First id wins on duplicate names
+        self.imported = Counter()
+        self.errors = []
+        self.touched_users = set()
+
+    def _resolve_users(self, rows):
+        missing = {
+            row['user'] for _, row in rows
+            if isinstance(row, dict) and isinstance(row.get('user'), str) and row['user'] not in self.users
+        }
+        if missing:
+            self.users.update(User.objects.filter(username__in=missing).values_list('username', 'id'))
+
+    def _build(self, row):
+        """Return an unsaved model instance for a row, or raise ValidationError."""
+        if not isinstance(row, dict):
+            raise ValidationError('Each row must be an object.')
+        kind = row.get('type')
+        if kind not in IMPORT_TYPES:
+            raise ValidationError(f"Unsupported type {kind!r}; expected one of {', '.join(IMPORT_TYPES)}.")
+        user_id = self.users.get(row['user']) if isinstance(row.get('user'), str) else None
+        if user_id is None:
+            raise ValidationError(f"Unknown user {row.get('user')!r}.")
+        if kind == 'sessions':
+            return self._build_session(row, user_id)
+        form_class = {'tasks': TaskForm, 'schedules': ScheduleForm, 'daily_activities': DailyActivityForm}[kind]
+        form = form_class(data=row)
+        if not form.is_valid():
+            raise ValidationError(_form_errors(form))
+        instance = form.save(commit=False)
+        instance.user_id = user_id
+        if kind == 'tasks':
+            instance.completed = _flag(row, 'completed')
+        elif kind == 'daily_activities':
+            instance.is_completed = _flag(row, 'is_completed')
+            if row.get('date'):
+                try:
+                    instance.date = DailyActivity._meta.get_field('date').to_python(row['date'])
+                except TypeError:
+                    raise ValidationError('date must be a YYYY-MM-DD date.')
+        return instance
+
+    def _build_session(self, row, user_id):
+        skill_name = row.get('skill__name') or row.get('skill')
+        if skill_name and (not isinstance(skill_name, str) or skill_name not in self.skills):
+            raise ValidationError(f'Unknown skill {skill_name!r}.')
+        try:
+            minutes = float(row.get('duration'))
+        except (TypeError, ValueError, OverflowError):
+            minutes = None
+        if minutes is None or not 0 < minutes <= MAX_SESSION_MINUTES:  # Also rejects nan and inf
+            raise ValidationError(f'duration must be more than 0 and at most {MAX_SESSION_MINUTES} minutes.')
+        session = LearningSession(
+            user_id=user_id,
+            skill_id=self.skills.get(skill_name),
+            duration=timedelta(minutes=minutes),
+            notes=row.get('notes', ''),
+        )
+        if row.get('date'):
+            try:
+                session.date = datetime.fromisoformat(row['date'])
+            except (TypeError, ValueError):
+                raise ValidationError('date must be an ISO 8601 datetime.')
+            if timezone.is_naive(session.date):
+                session.date = timezone.make_aware(session.date)
+        session.clean_fields(exclude=['user', 'skill'])
+        return session
+
+    def import_chunk(self, rows):
+        """Validate and insert one chunk of (line_number, row) pairs."""
+        self._resolve_users(rows)
+        by_type = {kind: [] for kind in IMPORT_TYPES}
+        for line_number, row in rows:
+            try:
+                if isinstance(row, dict) and '_error' in row:
+                    raise ValidationError(row['_error'])
+                instance = self._build(row)  # Raises for non-object rows and unsupported types
+                by_type[row['type']].append(instance)
+            except ValidationError as exc:
+                self.errors.append((line_number, '; '.join(exc.messages)))
+        with transaction.atomic():
+            for kind, instances in by_type.items():
+                if not instances:
+                    continue
+                created = type(instances[0]).objects.bulk_create(instances, batch_size=self.chunk_size)
+                self.imported[kind] += len(created)
+                self.touched_users.update(instance.user_id for instance in created)
+                # bulk_create bypasses the signals that keep the rollups and search index current
+                if kind in ('tasks', 'sessions'):
+                    index_objects(created)
+                if kind == 'sessions':
+                    record_sessions(created)
+                elif kind == 'daily_activities':
+                    completed = Counter((a.user_id, a.date) for a in created if a.is_completed)
+                    for (user_id, day), count in completed.items():
+                        record_daily_stats(user_id, day, activities_completed=count)
+
+    def run(self, numbered_rows, progress=None):
+        """Import an iterable of (line_number, row) pairs chunk by chunk."""
+        chunk = []
+        for item in numbered_rows:
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                self.import_chunk(chunk)
+                chunk = []
+                if progress:
+                    progress(self)
+        if chunk:
+            self.import_chunk(chunk)
+        if self.touched_users:
+            invalidate_dashboard(*self.touched_users)
@@ -0,0 +1,110 @@
+from collections import Counter
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from .models import UserProfile, LearningSession, LeaderboardBucket
+
+# Leaderboard
+#
+# LeaderboardBucket keeps a histogram of how many profiles sit in each
+# BUCKET_SIZE-wide points range. It is adjusted incrementally whenever points
+# move (ledger compaction, profile create/delete), so a user's rank is the sum
+# of the (few) buckets above theirs plus an indexed count inside their own
+# bucket, never a count over the whole UserProfile table. The top-N list and
+# the LearningSession time windows are served from cache for the public page.
+
+BUCKET_SIZE = 100
+LEADERBOARD_SIZE = 10
+TOP_CACHE_KEY = 'leaderboard:top'
+WINDOW_CACHE_TIMEOUT = 60 * 10
+
+
+def bucket_for(points):
+    return points // BUCKET_SIZE
+
+
+def move_users(moves):
+    """
+    Apply bucket moves given as (old_bucket, new_bucket, count) tuples.
+
+    ``None`` as the old bucket means the profiles were created, as the new
+    bucket that they were deleted.
+    """
+    deltas = Counter()
+    for old_bucket, new_bucket, count in moves:
+        if old_bucket == new_bucket:
+            continue
+        if old_bucket is not None:
+            deltas[old_bucket] -= count
+        if new_bucket is not None:
+            deltas[new_bucket] += count
+    deltas = {bucket: delta for bucket, delta in deltas.items() if delta}
+    cache.delete(TOP_CACHE_KEY)  # Points moved, even if no bucket boundary was crossed
+    if not deltas:
+        return
+    LeaderboardBucket.objects.bulk_create(
+        [LeaderboardBucket(bucket=bucket) for bucket in deltas], ignore_conflicts=True
+    )
+    for bucket, delta in deltas.items():
+        LeaderboardBucket.objects.filter(bucket=bucket).update(users=F('users') + delta)
+
+
+def rebuild_buckets():
+    """Recompute the whole histogram from UserProfile.points (repairs any drift)."""
+    counts = Counter(bucket_for(points) for points in UserProfile.objects.values_list('points', flat=True).iterator())
+    with transaction.atomic():
+        LeaderboardBucket.objects.all().delete()
+        LeaderboardBucket.objects.bulk_create(
+            [LeaderboardBucket(bucket=bucket, users=users) for bucket, users in counts.items()]
+        )
+    cache.delete(TOP_CACHE_KEY)
+
+
+def rank_of(user):
+    """Return the user's 1-based leaderboard rank (ties share a rank), or None without a profile."""
+    points = UserProfile.objects.filter(user=user).values_list('points', flat=True).first()
+    if points is None:
+        return None
+    bucket = bucket_for(points)
+    above = LeaderboardBucket.objects.filter(bucket__gt=bucket).aggregate(users=Sum('users'))['users'] or 0
+    same_bucket = UserProfile.objects.filter(
+        points__gt=points, points__lt=(bucket + 1) * BUCKET_SIZE
+    ).count()
+    return above + same_bucket + 1
+
+
+def top_learners():
+    """Return the cached top LEADERBOARD_SIZE profiles by points."""
+    top = cache.get(TOP_CACHE_KEY)
+    if top is None:
+        # Cached until points move, so read from the primary rather than a lagging replica
+        profiles = UserProfile.objects.using('default').select_related('user').order_by('-points', 'id')
+        top = [
+            {
+                'username': profile.user.username,
+                'role': profile.role,
+                'points': profile.points,
+                'profile_picture': profile.profile_picture.name,
+            }
+            for profile in profiles[:LEADERBOARD_SIZE]
+        ]
+        cache.set(TOP_CACHE_KEY, top, None)
+    return top
+
+
+def window_leaders(days):
+    """Return the users with the most study time over the last ``days`` days (cached briefly)."""
+    key = f'leaderboard:window:{days}'
+    leaders = cache.get(key)
+    if leaders is None:
+        since = timezone.now() - timedelta(days=days)
+        leaders = list(
+            LearningSession.objects.filter(date__gte=since)
+            .values('user__username')
+            .annotate(total_time=Sum('duration'))
+            .order_by('-total_time')[:LEADERBOARD_SIZE]
+        )
+        cache.set(key, leaders, WINDOW_CACHE_TIMEOUT)
+    return leaders
@@ -0,0 +1,16 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from tracker.stats import backfill_daily_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the DailyStats rollup from sessions, compacted points and completed activities.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only backfill this username.')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        user = User.objects.get(username=options['user']) if options['user'] else None
+        backfill_daily_stats(user=user, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS('Daily stats backfilled.'))
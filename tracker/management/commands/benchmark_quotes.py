@@ -0,0 +1,46 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from tracker.models import Quote
+from tracker.catalog import invalidate_catalog
+from tracker.quotes import random_quote
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare ORDER BY RANDOM() with cached-id quote selection as the Quote table grows. '
+        'Synthetic quotes are inserted inside a transaction that is rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,100000,1000000',
+                            help='Comma-separated table sizes to measure.')
+        parser.add_argument('--repeat', type=int, default=50, help='Picks timed per method and size.')
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def _time(self, func, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) / repeat * 1000
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        repeat = options['repeat']
+        self.stdout.write(f"{'rows':>10} {'order_by(?) ms':>16} {'cached ids ms':>15}")
+        with transaction.atomic():
+            count = Quote.objects.count()
+            for size in sizes:
+                while count < size:
+                    batch = min(options['batch_size'], size - count)
+                    Quote.objects.bulk_create(
+                        Quote(text=f'Benchmark quote {count + i}', author='benchmark') for i in range(batch)
+                    )
+                    count += batch
+                invalidate_catalog('quotes')  # bulk_create sends no signals; force a reload
+                random_quote()  # Warm the id list once, as the first dashboard hit would
+                order_by_ms = self._time(lambda: Quote.objects.order_by('?').first(), repeat)
+                cached_ms = self._time(random_quote, repeat)
+                self.stdout.write(f'{count:>10} {order_by_ms:>16.3f} {cached_ms:>15.3f}')
+            transaction.set_rollback(True)
+        invalidate_catalog('quotes')
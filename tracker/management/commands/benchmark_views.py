@@ -0,0 +1,44 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from tracker.benchmarks import check_budgets, load_budgets, run_benchmarks, seed_population
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a synthetic population in a throwaway test database, benchmark every URL in the '
+        'project urlconf and fail if any view exceeds tracker/benchmark_budgets.json.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--skills', type=int, default=10)
+        parser.add_argument('--sessions', type=int, default=50, help='Learning sessions per user.')
+        parser.add_argument('--tasks', type=int, default=30, help='Tasks, schedules and roadmap steps per user.')
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--report', help='Write the JSON report to this file (default: stdout).')
+        parser.add_argument('--no-latency-budget', action='store_true', help='Only enforce query budgets.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            user = seed_population(options['users'], options['skills'], options['sessions'], options['tasks'])
+            report = run_benchmarks(user, options['iterations'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        population = {key: options[key] for key in ('users', 'skills', 'sessions', 'tasks', 'iterations')}
+        output = json.dumps({'population': population, 'views': report}, indent=2)
+        if options['report']:
+            with open(options['report'], 'w') as handle:
+                handle.write(output)
+        else:
+            self.stdout.write(output)
+
+        violations = check_budgets(report, load_budgets(), latency=not options['no_latency_budget'])
+        if violations:
+            raise CommandError('Budget exceeded:\n' + '\n'.join(violations))
+        self.stderr.write(self.style.SUCCESS(f'{len(report)} views within budget.'))
@@ -0,0 +1,49 @@
+import os
+import shutil
+import subprocess
+from urllib.error import URLError
+from django.core.management.base import BaseCommand, CommandError
+from tracker.assets import UNBUNDLED, build_bundles, fetch_vendor_files, page_weight
+
+
+class Command(BaseCommand):
+    help = (
+        'Build the purged, minified CSS bundle and the JS bundle base.html serves instead of the CDNs, '
+        'and report page weight before and after. Run collectstatic afterwards to hash and compress them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fetch', action='store_true', help='Download missing vendor files first.')
+        parser.add_argument(
+            '--tailwind', default=os.environ.get('TAILWIND_CLI') or shutil.which('tailwindcss'),
+            help='Path to the standalone Tailwind v3 CLI (default: $TAILWIND_CLI or tailwindcss on PATH).',
+        )
+
+    def handle(self, *args, **options):
+        if options['fetch']:
+            try:
+                fetched = fetch_vendor_files(progress=lambda name: self.stderr.write(f'Fetched {name}'))
+            except URLError as exc:
+                raise CommandError(f'Could not download vendor files: {exc.reason}')
+            self.stdout.write(f'{fetched} vendor files downloaded.')
+        if not options['tailwind']:
+            raise CommandError(
+                'Tailwind CLI not found. Download the standalone tailwindcss v3 binary and pass --tailwind '
+                'or set TAILWIND_CLI.'
+            )
+        try:
+            bundles = build_bundles(options['tailwind'])
+        except FileNotFoundError as exc:
+            raise CommandError(str(exc))
+        except subprocess.CalledProcessError as exc:
+            raise CommandError(f"Tailwind failed: {exc.stderr.decode(errors='replace')}")
+        self._report('Before (CDN and unbundled files)', [path for path in UNBUNDLED if path.exists()])
+        self._report('After (bundles)', bundles)
+        self.stdout.write(self.style.SUCCESS('Bundles written; run collectstatic to hash and compress them.'))
+
+    def _report(self, title, paths):
+        self.stdout.write(f'\n{title}')
+        self.stdout.write(f"  {'file':<32} {'raw':>10} {'gzip':>10} {'brotli':>10}")
+        for name, raw, gzipped, brotli in page_weight(paths):
+            brotli = '-' if brotli is None else f'{brotli:,}'
+            self.stdout.write(f'  {name:<32} {raw:>10,} {gzipped:>10,} {brotli:>10}')
@@ -0,0 +1,21 @@
+import time
+from django.core.management.base import BaseCommand
+from tracker.points import compact_ledger
+
+
+class Command(BaseCommand):
+    help = (
+        'Fold pending points ledger entries into UserProfile.points and DailyStats. The leaderboard and '
+        'ranks only see compacted points, so run it every minute or so (cron, or --interval).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, help='Keep running, compacting every this many seconds.')
+
+    def handle(self, *args, **options):
+        while True:
+            compacted = compact_ledger()
+            self.stdout.write(self.style.SUCCESS(f'Compacted {compacted} ledger entries.'))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
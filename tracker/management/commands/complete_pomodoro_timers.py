@@ -0,0 +1,18 @@
+import time
+from django.core.management.base import BaseCommand
+from tracker.timer import complete_due_timers
+
+
+class Command(BaseCommand):
+    help = 'Record the learning sessions of server-side Pomodoro timers that ran out with no client connected.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='Keep running, sweeping every N seconds.')
+
+    def handle(self, *args, **options):
+        while True:
+            completed = complete_due_timers()
+            self.stdout.write(self.style.SUCCESS(f'{completed} timers completed.'))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
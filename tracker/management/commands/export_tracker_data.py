@@ -0,0 +1,29 @@
+import sys
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from tracker.export import EXPORT_TYPES, export_stream
+
+
+class Command(BaseCommand):
+    help = "Stream a user's (or all users') tracker data as JSON Lines or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only export this username (default: all users).')
+        parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+        parser.add_argument('--gzip', action='store_true', help='Compress the output with gzip.')
+        parser.add_argument('--types', help=f"Comma-separated subset of: {', '.join(EXPORT_TYPES)}.")
+        parser.add_argument('--output', help='File to write (default: stdout).')
+
+    def handle(self, *args, **options):
+        user = User.objects.get(username=options['user']) if options['user'] else None
+        types = options['types'].split(',') if options['types'] else None
+        unknown = set(types or []) - set(EXPORT_TYPES)
+        if unknown:
+            raise CommandError(f"Unknown types: {', '.join(sorted(unknown))}")
+        out = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for chunk in export_stream(user, options['format'], options['gzip'], types):
+                out.write(chunk)
+        finally:
+            if options['output']:
+                out.close()
@@ -0,0 +1,41 @@
+import time
+from django.core.management.base import BaseCommand
+from tracker.importer import IMPORT_TYPES, Importer, open_rows
+
+
+class Command(BaseCommand):
+    help = (
+        f"Bulk-load {', '.join(IMPORT_TYPES)} from JSON Lines or CSV files in the export_tracker_data "
+        'layout (optionally .gz). Invalid rows are reported and skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+')
+        parser.add_argument('--format', choices=['jsonl', 'csv'], help='Default: guessed from the file name.')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows validated and written per transaction.')
+        parser.add_argument('--max-errors-shown', type=int, default=50)
+
+    def handle(self, *args, **options):
+        importer = Importer(chunk_size=options['chunk_size'])
+        start = time.perf_counter()
+
+        def progress(importer):
+            rows = sum(importer.imported.values())
+            rate = rows / (time.perf_counter() - start)
+            self.stdout.write(f'{rows} rows imported ({rate:.0f} rows/s), {len(importer.errors)} errors')
+
+        for path in options['paths']:
+            numbered_rows = ((f'{path}:{line}', row) for line, row in open_rows(path, options['format']))
+            importer.run(numbered_rows, progress=progress)
+
+        elapsed = time.perf_counter() - start
+        rows = sum(importer.imported.values())
+        for location, message in importer.errors[:options['max_errors_shown']]:
+            self.stderr.write(f'{location}: {message}')
+        if len(importer.errors) > options['max_errors_shown']:
+            self.stderr.write(f'... and {len(importer.errors) - options["max_errors_shown"]} more errors')
+        summary = ', '.join(f'{count} {kind}' for kind, count in importer.imported.items()) or 'nothing'
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {summary} in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f} rows/s); '
+            f'{len(importer.errors)} rows rejected.'
+        ))
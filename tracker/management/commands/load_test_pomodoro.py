@@ -0,0 +1,91 @@
+import multiprocessing
+import os
+import tempfile
+import time
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from tracker.models import UserProfile
+
+# Settings that reproduce Django's stock SQLite behaviour for --baseline runs
+BASELINE_PRAGMAS = {'journal_mode': 'delete', 'synchronous': 'full', 'busy_timeout': 5000}
+
+
+def _worker(args):
+    """Post ``requests`` Pomodoro sessions as one user; return (ok, locked, other errors, elapsed)."""
+    username, requests = args
+    connections.close_all()  # Never share the parent's SQLite handle across fork()
+    client = Client()
+    client.force_login(User.objects.get(username=username))
+    ok = locked = failed = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        try:
+            response = client.post('/pomodoro/', {'duration': 25})
+        except OperationalError as exc:
+            if 'locked' in str(exc):
+                locked += 1
+            else:
+                failed += 1
+            continue
+        if response.status_code == 200:
+            ok += 1
+        else:
+            failed += 1
+    connections.close_all()
+    return ok, locked, failed, time.perf_counter() - start
+
+
+class Command(BaseCommand):
+    help = (
+        'Hammer the pomodoro view from several processes against a throwaway SQLite test '
+        'database and report throughput and "database is locked" errors.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=50, help='Requests per process.')
+        parser.add_argument(
+            '--baseline', action='store_true',
+            help='Run with Django\'s default rollback journal and deferred transactions for comparison.',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('This load test only targets SQLite.')
+        if options['baseline']:
+            settings.SQLITE_PRAGMAS = BASELINE_PRAGMAS
+            connection.settings_dict['OPTIONS'].pop('transaction_mode', None)
+
+        workdir = tempfile.mkdtemp()
+        connection.settings_dict['TEST']['NAME'] = os.path.join(workdir, 'loadtest.sqlite3')
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            usernames = [f'load{i}' for i in range(options['processes'])]
+            users = User.objects.bulk_create([User(username=name) for name in usernames])
+            UserProfile.objects.bulk_create([UserProfile(user=user, role='student') for user in users])
+            connections.close_all()
+
+            context = multiprocessing.get_context('fork')
+            start = time.perf_counter()
+            with context.Pool(options['processes']) as pool:
+                results = pool.map(_worker, [(name, options['requests']) for name in usernames])
+            elapsed = time.perf_counter() - start
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        ok, locked, failed = (sum(result[i] for result in results) for i in range(3))
+        slowest = max(result[3] for result in results)
+        mode = 'baseline' if options['baseline'] else 'tuned'
+        self.stdout.write(
+            f"{mode}: {options['processes']} processes x {options['requests']} requests in {elapsed:.2f}s "
+            f'({ok / elapsed:.1f} req/s, slowest worker {slowest:.2f}s)\n'
+            f'  succeeded: {ok}\n  database is locked: {locked}\n  other failures: {failed}'
+        )
+        if locked or failed:
+            raise CommandError(f'{locked + failed} requests failed.')
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from tracker.images import (
+    OPTIMIZED_DIR, STATIC_IMAGES_DIR, optimize_static_images, pending_profile_ids, process_profile_picture,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Write resized WebP and recompressed variants of every image in tracker/static/images '
+        '(for {% responsive_image %}), and optionally process pending profile pictures.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help='Worker processes (default: one per CPU).')
+        parser.add_argument(
+            '--profiles', action='store_true',
+            help='Also normalize and thumbnail profile pictures still waiting to be processed.',
+        )
+
+    def handle(self, *args, **options):
+        def progress(name, entry, error):
+            if error:
+                self.stderr.write(self.style.WARNING(f'Skipped {name}: {error}'))
+                return
+            before = (STATIC_IMAGES_DIR / name).stat().st_size
+            largest = max(
+                (v for v in entry['variants'] if v['type'] == 'image/webp'), key=lambda variant: variant['width']
+            )
+            after = (OPTIMIZED_DIR / largest['name']).stat().st_size
+            self.stdout.write(f"  {name:<48} {before:>10,} -> {after:>9,} bytes ({largest['name']})")
+
+        manifest, failed = optimize_static_images(workers=options['workers'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(f'{len(manifest)} static images optimized, {len(failed)} skipped.'))
+        if options['profiles']:
+            processed = sum(process_profile_picture(pk) is not None for pk in pending_profile_ids())
+            self.stdout.write(self.style.SUCCESS(f'{processed} profile pictures processed.'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from tracker.leaderboard import rebuild_buckets
+
+
+class Command(BaseCommand):
+    help = 'Recompute the leaderboard rank histogram from UserProfile.points.'
+
+    def handle(self, *args, **options):
+        rebuild_buckets()
+        self.stdout.write(self.style.SUCCESS('Leaderboard buckets rebuilt.'))
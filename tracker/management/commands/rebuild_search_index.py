@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from tracker.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Re-create the full-text search index from tasks, session notes, roadmap steps and skills.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        def progress(kind, total):
+            self.stderr.write(f'{total} documents indexed ({kind})...')
+
+        total = rebuild_search_index(chunk_size=options['chunk_size'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(f'{total} documents indexed.'))
@@ -0,0 +1,16 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from tracker.analytics import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the analytics SessionRollup table from LearningSession history.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only rebuild this username.')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        user = User.objects.get(username=options['user']) if options['user'] else None
+        rebuild_rollups(user=user, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS('Session rollups rebuilt.'))
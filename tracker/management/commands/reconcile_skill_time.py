@@ -0,0 +1,16 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from tracker.skills import reconcile_skill_time
+
+
+class Command(BaseCommand):
+    help = 'Recompute UserSkill time_spent and proficiency_level from LearningSession history.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only reconcile this username.')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user = User.objects.get(username=options['user']) if options['user'] else None
+        repaired = reconcile_skill_time(user=user, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'{repaired} user skills repaired.'))
@@ -0,0 +1,41 @@
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from tracker.charts import (
+    CHART_BUILDERS, CHART_HEIGHT, CHART_WIDTH, IMAGE_FORMATS, chart_spec, render_images, renderer_available,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Pre-render progress chart images into the chart cache, in batches through the render pool. '
+        'Charts whose data has not changed are served from the cache and not rendered again.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(IMAGE_FORMATS), default='png')
+        parser.add_argument('--user', action='append', dest='usernames', help='Only this user (repeatable).')
+        parser.add_argument('--days', type=int, default=7, help='Otherwise, users active in the last N days.')
+        parser.add_argument('--batch', type=int, default=50, help='Charts submitted to the pool at once.')
+
+    def handle(self, *args, **options):
+        if not renderer_available():
+            raise CommandError('Rendering needs plotly and kaleido: pip install plotly kaleido')
+        users = User.objects.order_by('pk')
+        if options['usernames']:
+            users = users.filter(username__in=options['usernames'])
+        else:
+            since = timezone.localdate() - timedelta(days=options['days'] - 1)
+            users = users.filter(dailystats__day__gte=since).distinct()
+        jobs = []
+        rendered = failed = 0
+        for user in users.iterator():
+            jobs += [(chart_spec(user, kind), options['format'], CHART_WIDTH, CHART_HEIGHT) for kind in CHART_BUILDERS]
+            if len(jobs) >= options['batch']:
+                done = render_images(jobs)
+                rendered, failed = rendered + sum(d is not None for d in done), failed + done.count(None)
+                jobs = []
+        done = render_images(jobs)
+        rendered, failed = rendered + sum(d is not None for d in done), failed + done.count(None)
+        self.stdout.write(self.style.SUCCESS(f'{rendered} charts cached, {failed} failed.'))
@@ -0,0 +1,26 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from tracker.routers import REPLICA_ALIAS, sync_sqlite_replica
+
+
+class Command(BaseCommand):
+    help = (
+        'Stand-in replication for local testing: copy the primary SQLite database onto the '
+        'replica, once or every --interval seconds to simulate replication lag.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='Keep syncing every N seconds.')
+
+    def handle(self, *args, **options):
+        if REPLICA_ALIAS not in settings.DATABASES:
+            raise CommandError('No replica configured; set TRACKER_REPLICA_DB.')
+        if settings.DATABASES['default']['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('sync_replica only copies SQLite databases; use real replication elsewhere.')
+        while True:
+            sync_sqlite_replica()
+            self.stdout.write(f"Replica {settings.DATABASES[REPLICA_ALIAS]['NAME']} synced.")
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,132 @@
+import cProfile
+import io
+import pstats
+import random
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+# Request Profiling
+#
+# Opt-in via settings.TRACKER_PROFILING['ENABLED']. When disabled the
+# middleware raises MiddlewareNotUsed, so Django drops it from the stack and
+# requests pay nothing. When enabled it times each request and every SQL
+# statement (through connection.execute_wrapper, no DEBUG needed) and folds
+# the numbers into per-URL-name histograms held in this process.
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+CPROFILE_SAMPLES_KEPT = 20
+UNRESOLVED = '<unresolved>'  # One entry for every request that matched no URL, e.g. 404 probes
+
+_lock = threading.Lock()
+_stats = {}
+_profiles = deque(maxlen=CPROFILE_SAMPLES_KEPT)
+
+
+def _new_entry():
+    return {
+        'requests': 0,
+        'total_ms': 0.0,
+        'max_ms': 0.0,
+        'db_ms': 0.0,
+        'queries': 0,
+        'duplicate_queries': 0,
+        'latency_histogram': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+        'slowest_queries': [],
+    }
+
+
+class _QueryRecorder:
+    """execute_wrapper that records (sql, ms) for every statement."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, (time.perf_counter() - start) * 1000))
+
+
+def _record(url_name, wall_ms, queries, keep_slowest):
+    repeated = Counter(sql for sql, _ in queries)
+    bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if wall_ms <= bound), len(LATENCY_BUCKETS_MS))
+    with _lock:
+        entry = _stats.setdefault(url_name, _new_entry())
+        entry['requests'] += 1
+        entry['total_ms'] += wall_ms
+        entry['max_ms'] = max(entry['max_ms'], wall_ms)
+        entry['db_ms'] += sum(ms for _, ms in queries)
+        entry['queries'] += len(queries)
+        entry['duplicate_queries'] += sum(count - 1 for count in repeated.values() if count > 1)
+        entry['latency_histogram'][bucket] += 1
+        slowest = entry['slowest_queries'] + [{'sql': sql, 'ms': round(ms, 3)} for sql, ms in queries]
+        entry['slowest_queries'] = sorted(slowest, key=lambda query: query['ms'], reverse=True)[:keep_slowest]
+
+
+def profiling_snapshot():
+    """Return the aggregated per-URL stats and recent cProfile samples for this process."""
+    with _lock:
+        urls = {}
+        for url_name, entry in _stats.items():
+            requests = entry['requests']
+            urls[url_name] = {
+                **entry,
+                'avg_ms': round(entry['total_ms'] / requests, 3),
+                'avg_db_ms': round(entry['db_ms'] / requests, 3),
+                'avg_queries': round(entry['queries'] / requests, 2),
+                'latency_histogram': dict(zip(
+                    [f'<={bound}ms' for bound in LATENCY_BUCKETS_MS] + [f'>{LATENCY_BUCKETS_MS[-1]}ms'],
+                    entry['latency_histogram'],
+                )),
+            }
+        return {'urls': urls, 'cprofile_samples': list(_profiles)}
+
+
+def reset_profiling():
+    with _lock:
+        _stats.clear()
+        _profiles.clear()
+
+
+class ProfilingMiddleware:
+    """Record wall time, DB time, query counts and slow SQL per URL name."""
+
+    def __init__(self, get_response):
+        config = getattr(settings, 'TRACKER_PROFILING', {})
+        if not config.get('ENABLED'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = config.get('CPROFILE_SAMPLE_RATE', 0.0)
+        self.keep_slowest = config.get('SLOWEST_QUERIES', 5)
+
+    def __call__(self, request):
+        recorder = _QueryRecorder()
+        profiler = cProfile.Profile() if random.random() < self.sample_rate else None
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            if profiler:
+                profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler:
+                    profiler.disable()
+        wall_ms = (time.perf_counter() - start) * 1000
+        match = request.resolver_match
+        url_name = (match.view_name if match else None) or UNRESOLVED
+        _record(url_name, wall_ms, recorder.queries, self.keep_slowest)
+        if profiler:
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(30)
+            with _lock:
+                _profiles.append({'url_name': url_name, 'wall_ms': round(wall_ms, 3), 'stats': out.getvalue()})
+        return response
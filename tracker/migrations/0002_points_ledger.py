@@ -0,0 +1,44 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='skills',
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='points',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='learningsession',
+            name='skill',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='tracker.skill'),
+        ),
+        migrations.CreateModel(
+            name='PointsLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.IntegerField()),
+                ('reason', models.CharField(choices=[('task', 'Task Completed'), ('roadmap_step', 'Roadmap Step Completed'), ('pomodoro', 'Pomodoro Session'), ('daily_activity', 'Daily Activity')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('compacted_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('compacted_at__isnull', True)), fields=['user'], name='ledger_pending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:56
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_badges(apps, schema_editor):
+    UserBadge = apps.get_model('tracker', 'UserBadge')
+    # Keep the earliest award of each (user, badge) pair so the constraint can be added
+    first_awards = UserBadge.objects.values('user', 'badge').annotate(first=Min('id')).values('first')
+    UserBadge.objects.exclude(id__in=first_awards).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0002_points_ledger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_badges, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='userbadge',
+            constraint=models.UniqueConstraint(fields=('user', 'badge'), name='unique_user_badge'),
+        ),
+    ]
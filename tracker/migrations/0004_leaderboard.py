@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:59
+
+from collections import Counter
+from django.db import migrations, models
+
+
+def populate_buckets(apps, schema_editor):
+    UserProfile = apps.get_model('tracker', 'UserProfile')
+    LeaderboardBucket = apps.get_model('tracker', 'LeaderboardBucket')
+    counts = Counter(points // 100 for points in UserProfile.objects.values_list('points', flat=True).iterator())
+    LeaderboardBucket.objects.bulk_create(
+        [LeaderboardBucket(bucket=bucket, users=users) for bucket, users in counts.items()]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0003_userbadge_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.IntegerField(unique=True)),
+                ('users', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='learningsession',
+            name='date',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='points',
+            field=models.IntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(populate_buckets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0004_leaderboard'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailyactivity',
+            index=models.Index(fields=['user', 'date'], name='activity_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learningsession',
+            index=models.Index(fields=['user', 'date'], name='session_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='roadmapstep',
+            index=models.Index(fields=['user', 'completed'], name='roadmap_user_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['user', 'date'], name='schedule_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'completed'], name='task_user_completed_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:02
+
+import datetime
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def populate_rollups(apps, schema_editor):
+    LearningSession = apps.get_model('tracker', 'LearningSession')
+    SessionRollup = apps.get_model('tracker', 'SessionRollup')
+    totals = (
+        LearningSession.objects.annotate(day=TruncDate('date'))
+        .values('user_id', 'day', 'skill_id')
+        .annotate(total=Sum('duration'), count=Count('id'))
+        .order_by()
+    )
+    SessionRollup.objects.bulk_create(
+        SessionRollup(user_id=row['user_id'], day=row['day'], skill_id=row['skill_id'],
+                      duration=row['total'], sessions=row['count'])
+        for row in totals.iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0005_user_date_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('duration', models.DurationField(default=datetime.timedelta(0))),
+                ('sessions', models.IntegerField(default=0)),
+                ('skill', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='tracker.skill')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'day', 'skill'), name='unique_rollup_user_day_skill'), models.UniqueConstraint(condition=models.Q(('skill__isnull', True)), fields=('user', 'day'), name='unique_rollup_user_day_no_skill')],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
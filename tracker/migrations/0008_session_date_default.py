@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0007_daily_stats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='learningsession',
+            name='date',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0008_session_date_default'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailyactivity',
+            name='date',
+            field=models.DateField(default=django.utils.timezone.localdate),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0009_activity_date_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='roadmapstep',
+            name='roadmap_user_completed_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_user_completed_idx',
+        ),
+        migrations.AddIndex(
+            model_name='roadmapstep',
+            index=models.Index(fields=['user', 'skill', 'id'], name='roadmap_user_skill_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='roadmapstep',
+            index=models.Index(fields=['user', 'completed', 'skill', 'id'], name='roadmap_user_done_skill_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'due_date', 'id'], name='task_user_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'completed', 'due_date', 'id'], name='task_user_done_due_idx'),
+        ),
+    ]
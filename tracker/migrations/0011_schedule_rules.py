@@ -0,0 +1,54 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0010_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(max_length=200)),
+                ('time', models.TimeField()),
+                ('frequency', models.CharField(choices=[('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly')], max_length=10)),
+                ('interval', models.PositiveSmallIntegerField(default=1)),
+                ('weekdays', models.PositiveSmallIntegerField(default=0)),
+                ('starts_on', models.DateField()),
+                ('ends_on', models.DateField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ScheduleException',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('cancelled', models.BooleanField(default=False)),
+                ('new_date', models.DateField(blank=True, null=True)),
+                ('new_time', models.TimeField(blank=True, null=True)),
+                ('new_task', models.CharField(blank=True, max_length=200)),
+                ('rule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exceptions', to='tracker.schedulerule')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='schedulerule',
+            index=models.Index(fields=['user', 'starts_on'], name='schedule_rule_user_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scheduleexception',
+            index=models.Index(fields=['rule', 'new_date'], name='schedule_exception_moved_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='scheduleexception',
+            constraint=models.UniqueConstraint(fields=('rule', 'date'), name='unique_schedule_exception'),
+        ),
+    ]
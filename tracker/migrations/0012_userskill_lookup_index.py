@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0011_schedule_rules'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userskill',
+            index=models.Index(fields=['userprofile', 'skill'], name='userskill_profile_skill_idx'),
+        ),
+    ]
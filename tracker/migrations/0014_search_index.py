@@ -0,0 +1,72 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:21
+
+from django.db import migrations
+
+# SQLite: an external-content FTS5 table over tracker_searchdocument, kept in
+# step with it by triggers. Django remakes SQLite tables on most ALTERs, which
+# drops triggers, so re-run these statements after altering SearchDocument.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE tracker_searchdocument_fts USING fts5(
+        owner, title, body,
+        content='tracker_searchdocument', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER tracker_searchdocument_ai AFTER INSERT ON tracker_searchdocument BEGIN
+        INSERT INTO tracker_searchdocument_fts(rowid, owner, title, body)
+        VALUES (new.id, new.owner, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_searchdocument_ad AFTER DELETE ON tracker_searchdocument BEGIN
+        INSERT INTO tracker_searchdocument_fts(tracker_searchdocument_fts, rowid, owner, title, body)
+        VALUES ('delete', old.id, old.owner, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER tracker_searchdocument_au AFTER UPDATE ON tracker_searchdocument BEGIN
+        INSERT INTO tracker_searchdocument_fts(tracker_searchdocument_fts, rowid, owner, title, body)
+        VALUES ('delete', old.id, old.owner, old.title, old.body);
+        INSERT INTO tracker_searchdocument_fts(rowid, owner, title, body)
+        VALUES (new.id, new.owner, new.title, new.body);
+    END
+    """,
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS tracker_searchdocument_au',
+    'DROP TRIGGER IF EXISTS tracker_searchdocument_ad',
+    'DROP TRIGGER IF EXISTS tracker_searchdocument_ai',
+    'DROP TABLE IF EXISTS tracker_searchdocument_fts',
+]
+
+# PostgreSQL: a GIN index over the same tsvector expression search.py queries.
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX tracker_searchdocument_tsv_idx ON tracker_searchdocument
+    USING GIN (to_tsvector('simple', title || ' ' || body))
+    """,
+]
+POSTGRES_BACKWARD = ['DROP INDEX IF EXISTS tracker_searchdocument_tsv_idx']
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0013_search_document'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 from datetime import timedelta
 
 # User Profile
@@ -12,7 +13,7 @@ class UserProfile(models.Model):
     ])
     bio = models.TextField(blank=True, null=True)
     profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
-    points = models.IntegerField(default=0)  # For leaderboard and badges
+    points = models.IntegerField(default=0, db_index=True)  # For leaderboard and badges
 
     def __str__(self):
         return self.user.username
@@ -44,6 +45,11 @@ class UserSkill(models.Model):
     proficiency_level = models.IntegerField(default=1)
     time_spent = models.DurationField(default=timedelta(0))
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['userprofile', 'skill'], name='userskill_profile_skill_idx'),
+        ]
+
     def __str__(self):
         return f"{self.userprofile.user.username} - {self.skill.name}"
 
@@ -54,6 +60,11 @@ class Schedule(models.Model):
     time = models.TimeField()
     task = models.CharField(max_length=200)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'date'], name='schedule_user_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.date} - {self.time}: {self.task}"
 
@@ -69,6 +80,13 @@ class Task(models.Model):
     due_date = models.DateField(blank=True, null=True)
     completed = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination on (due_date, id), with and without the completion filter
+            models.Index(fields=['user', 'due_date', 'id'], name='task_user_due_idx'),
+            models.Index(fields=['user', 'completed', 'due_date', 'id'], name='task_user_done_due_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -77,9 +95,14 @@ class LearningSession(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     skill = models.ForeignKey(Skill, on_delete=models.CASCADE, null=True)
     duration = models.DurationField()
-    date = models.DateTimeField(auto_now_add=True)
+    date = models.DateTimeField(default=timezone.now, db_index=True)  # Settable for offline/imported sessions
     notes = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'date'], name='session_user_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.skill.name if self.skill else 'No Skill'} ({self.duration})"
 
@@ -90,6 +113,13 @@ class RoadmapStep(models.Model):
     description = models.TextField()
     completed = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination on (skill, id), with and without the completion filter
+            models.Index(fields=['user', 'skill', 'id'], name='roadmap_user_skill_idx'),
+            models.Index(fields=['user', 'completed', 'skill', 'id'], name='roadmap_user_done_skill_idx'),
+        ]
+
     def __str__(self):
         return self.description
 
@@ -109,6 +139,11 @@ class UserBadge(models.Model):
     badge = models.ForeignKey(Badge, on_delete=models.CASCADE)
     earned_date = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'badge'], name='unique_user_badge'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.badge.name}"
 
@@ -140,7 +175,167 @@ class DailyActivity(models.Model):
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
     time_of_day = models.TimeField(blank=True, null=True)
     is_completed = models.BooleanField(default=False)
-    date = models.DateField(auto_now_add=True)
+    date = models.DateField(default=timezone.localdate)  # Settable for imported history
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'date'], name='activity_user_date_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+# PointsLedgerEntry (Append-only record of every points award)
+class PointsLedgerEntry(models.Model):
+    REASON_CHOICES = [
+        ('task', 'Task Completed'),
+        ('roadmap_step', 'Roadmap Step Completed'),
+        ('pomodoro', 'Pomodoro Session'),
+        ('daily_activity', 'Daily Activity'),
+    ]
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    amount = models.IntegerField()
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+    compacted_at = models.DateTimeField(blank=True, null=True)  # Set once folded into UserProfile.points
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user'], condition=models.Q(compacted_at__isnull=True), name='ledger_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.amount:+d} ({self.reason})"
+
+# LeaderboardBucket (Histogram of profiles per points range, for rank lookups)
+class LeaderboardBucket(models.Model):
+    bucket = models.IntegerField(unique=True)  # points // leaderboard.BUCKET_SIZE
+    users = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Bucket {self.bucket}: {self.users} users"
+
+# SessionRollup (Per user, day and skill totals of LearningSession, for analytics)
+class SessionRollup(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    day = models.DateField()
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, null=True)
+    duration = models.DurationField(default=timedelta(0))
+    sessions = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day', 'skill'], name='unique_rollup_user_day_skill'),
+            models.UniqueConstraint(
+                fields=['user', 'day'], condition=models.Q(skill__isnull=True), name='unique_rollup_user_day_no_skill'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.day}: {self.duration} ({self.sessions} sessions)"
+
+# DailyStats (Per user and day totals for streaks and lifetime stats)
+class DailyStats(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    day = models.DateField()
+    minutes = models.FloatField(default=0)
+    sessions = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+    activities_completed = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day'], name='unique_daily_stats_user_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.day}: {self.minutes:.0f} min, {self.points} pts"
+
+# ScheduleRule (recurring study slot, expanded into occurrences on demand)
+class ScheduleRule(models.Model):
+    DAILY, WEEKLY, MONTHLY = 'daily', 'weekly', 'monthly'
+    WEEKDAY_NAMES = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    task = models.CharField(max_length=200)
+    time = models.TimeField()
+    frequency = models.CharField(max_length=10, choices=[
+        (DAILY, 'Daily'),
+        (WEEKLY, 'Weekly'),
+        (MONTHLY, 'Monthly')
+    ])
+    interval = models.PositiveSmallIntegerField(default=1)  # Every N days/weeks/months
+    weekdays = models.PositiveSmallIntegerField(default=0)  # Weekly only: bit 0 = Monday ... bit 6 = Sunday
+    starts_on = models.DateField()
+    ends_on = models.DateField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'starts_on'], name='schedule_rule_user_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task} ({self.frequency} at {self.time})"
+
+# ScheduleException (one occurrence of a rule cancelled or moved)
+class ScheduleException(models.Model):
+    rule = models.ForeignKey(ScheduleRule, on_delete=models.CASCADE, related_name='exceptions')
+    date = models.DateField()  # The occurrence being changed, as generated by the rule
+    cancelled = models.BooleanField(default=False)
+    new_date = models.DateField(blank=True, null=True)
+    new_time = models.TimeField(blank=True, null=True)
+    new_task = models.CharField(max_length=200, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['rule', 'date'], name='unique_schedule_exception'),
+        ]
+        indexes = [
+            models.Index(fields=['rule', 'new_date'], name='schedule_exception_moved_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.rule_id} {self.date}: {'cancelled' if self.cancelled else 'moved'}"
+
+# SearchDocument (searchable text of tasks, session notes, roadmap steps and skills)
+class SearchDocument(models.Model):
+    TASK, SESSION, ROADMAP_STEP, SKILL = 'task', 'session', 'roadmap_step', 'skill'
+
+    kind = models.CharField(max_length=20, choices=[
+        (TASK, 'Task'),
+        (SESSION, 'Learning session'),
+        (ROADMAP_STEP, 'Roadmap step'),
+        (SKILL, 'Skill')
+    ])
+    object_id = models.PositiveBigIntegerField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True)  # Null for shared skills
+    owner = models.CharField(max_length=24)  # "u<user id>" or "skills"; the token searches are scoped by
+    title = models.CharField(max_length=200, blank=True)
+    body = models.TextField(blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}"
+
+# PomodoroTimer (a user's server-side timer; only its timestamps are stored)
+class PomodoroTimer(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='pomodoro_timer')
+    skill = models.ForeignKey(Skill, on_delete=models.SET_NULL, blank=True, null=True)
+    notes = models.TextField(blank=True)
+    duration = models.DurationField()
+    started_at = models.DateTimeField()
+    ends_at = models.DateTimeField()  # Pushed back by each pause when the timer resumes
+    paused_at = models.DateTimeField(blank=True, null=True)
+    completed_at = models.DateTimeField(blank=True, null=True)  # Set when its LearningSession is recorded
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['completed_at', 'paused_at', 'ends_at'], name='pomodoro_timer_due_idx'),
+        ]
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f"{self.user.username} - {self.duration} (ends {self.ends_at})"
@@ -0,0 +1,116 @@
+import base64
+import json
+from datetime import date
+from django.db.models import Q
+from .models import Task, RoadmapStep
+
+# Keyset Pagination
+#
+# Pages are fetched by seeking past the last row shown, e.g.
+# ``due_date >= d AND (due_date > d OR id > i) ORDER BY due_date, id LIMIT n``,
+# which the (user, ..., due_date, id) indexes answer with a range scan. Unlike
+# OFFSET, the cost of a page does not grow with how deep into the list it is.
+# The position is handed to the client as an opaque cursor.
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(token):
+    """Return the list encoded in a cursor; raise ValueError if it is malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError('Invalid cursor.') from exc
+    if not isinstance(values, list) or not values or not all(_is_key(value) for value in values):
+        raise ValueError('Invalid cursor.')
+    return values
+
+
+def _is_key(value):
+    return isinstance(value, str) or _is_id(value)
+
+
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _after(fields, values, descending):
+    """Q for rows strictly past ``values`` in (fields...) order."""
+    op = 'lt' if descending else 'gt'
+    first, *rest = fields
+    if not rest:
+        return Q(**{f'{first}__{op}': values[0]})
+    # first >= v AND (first > v OR rest past the cursor): the leading bound is an index range
+    return Q(**{f'{first}__{op}e': values[0]}) & (
+        Q(**{f'{first}__{op}': values[0]}) | _after(rest, values[1:], descending)
+    )
+
+
+def keyset_page(queryset, fields, after=None, size=PAGE_SIZE, descending=False):
+    """
+    Return (rows, last) for the page following ``after`` in ``fields`` order.
+
+    ``fields`` are attnames ending in a unique column; ``last`` is the key of
+    the final row when more rows follow, otherwise None.
+    """
+    queryset = queryset.order_by(*(f'-{field}' if descending else field for field in fields))
+    if after:
+        queryset = queryset.filter(_after(fields, after, descending))
+    rows = list(queryset[:size + 1])
+    if len(rows) <= size:
+        return rows, None
+    rows = rows[:size]
+    return rows, [getattr(rows[-1], field) for field in fields]
+
+
+def task_page(user, cursor=None, size=PAGE_SIZE, priority=None, completed=None, descending=False):
+    """
+    Return (tasks, next cursor) ordered by (due_date, id).
+
+    Dated tasks come first and tasks without a due date follow, each section
+    read with its own index range so NULLs never force a sort.
+    """
+    tasks = Task.objects.filter(user=user)
+    if priority:
+        tasks = tasks.filter(priority=priority)
+    if completed is not None:
+        tasks = tasks.filter(completed=completed)
+    section, *after = decode_cursor(cursor) if cursor else ['dated']
+    rows = []
+    if section == 'dated':
+        if after:
+            try:
+                due_date, task_id = after
+                after = [date.fromisoformat(due_date), int(task_id)]
+            except (TypeError, ValueError) as exc:
+                raise ValueError('Invalid cursor.') from exc
+        rows, last = keyset_page(tasks.filter(due_date__isnull=False), ('due_date', 'id'), after, size, descending)
+        if last:
+            return rows, encode_cursor(['dated', last[0].isoformat(), last[1]])
+        section, after = 'undated', []
+    if section != 'undated' or len(after) > 1 or not all(_is_id(value) for value in after):
+        raise ValueError('Invalid cursor.')
+    undated = tasks.filter(due_date__isnull=True)
+    if len(rows) == size:  # Dated section ended exactly on a page boundary
+        return rows, encode_cursor(['undated']) if undated.exists() else None
+    more, last = keyset_page(undated, ('id',), after, size - len(rows), descending)
+    return rows + more, encode_cursor(['undated', last[0]]) if last else None
+
+
+def roadmap_page(user, cursor=None, size=PAGE_SIZE, skill_id=None, completed=None, descending=False):
+    """Return (steps, next cursor) ordered by (skill, id), with each step's skill joined in."""
+    steps = RoadmapStep.objects.filter(user=user).select_related('skill')
+    if skill_id:
+        steps = steps.filter(skill_id=skill_id)
+    if completed is not None:
+        steps = steps.filter(completed=completed)
+    after = decode_cursor(cursor) if cursor else None
+    if after is not None and (len(after) != 2 or not all(_is_id(value) for value in after)):
+        raise ValueError('Invalid cursor.')
+    rows, last = keyset_page(steps, ('skill_id', 'id'), after, size, descending)
+    return rows, encode_cursor(last) if last else None
@@ -0,0 +1,87 @@
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from .leaderboard import BUCKET_SIZE, move_users
+from .models import UserProfile, PointsLedgerEntry
+from .stats import record_daily_stats_many
+
+# Points Ledger Service
+#
+# Awards are appended to PointsLedgerEntry with a single INSERT, so concurrent
+# requests never read-modify-write (or lock) the UserProfile row. Pending
+# entries are periodically folded into UserProfile.points by compact_ledger(),
+# which applies every user's batch with one UPDATE ... SET points = points + (subquery)
+# and adds it to DailyStats with a few bulk statements.
+#
+# Balances shown to a user always include pending entries, but the leaderboard,
+# ranks and DailyStats only see compacted points, so compaction must be
+# scheduled or they go stale. Run it every minute or so, from cron:
+#
+#   * * * * * cd /path/to/project && python manage.py compact_points
+#
+# or as a long-running process: python manage.py compact_points --interval 60
+
+
+def award_points(user, amount, reason):
+    """Record a points award for a user without touching their profile row."""
+    return PointsLedgerEntry.objects.create(user=user, amount=amount, reason=reason)
+
+
+def _ledger_total(**filters):
+    """Subquery summing the outer profile's ledger entries matching ``filters``."""
+    return Coalesce(
+        Subquery(
+            PointsLedgerEntry.objects.filter(user=OuterRef('user'), **filters)
+            .values('user')
+            .annotate(total=Sum('amount'))
+            .values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def get_points(user):
+    """Return a user's live balance (compacted points + pending ledger entries) in one query."""
+    total = (
+        UserProfile.objects.filter(user=user)
+        .annotate(live_points=F('points') + _ledger_total(compacted_at__isnull=True))
+        .values_list('live_points', flat=True)
+        .first()
+    )
+    return total or 0
+
+
+def compact_ledger(user=None):
+    """
+    Fold pending ledger entries into UserProfile.points.
+
+    Pending rows are first stamped with a single UPDATE, then every affected
+    profile is incremented by the sum of exactly the rows carrying that stamp,
+    so awards inserted while compaction runs stay pending for the next pass.
+    Returns the number of ledger entries compacted.
+    """
+    stamp = timezone.now()
+    with transaction.atomic():
+        pending = PointsLedgerEntry.objects.filter(compacted_at__isnull=True)
+        if user is not None:
+            pending = pending.filter(user=user)
+        compacted = pending.update(compacted_at=stamp)
+        if compacted:
+            batch = PointsLedgerEntry.objects.filter(compacted_at=stamp)
+            profiles = UserProfile.objects.filter(user_id__in=batch.values('user_id'))
+            # Leaderboard buckets crossed by this batch, grouped in SQL
+            moves = (
+                profiles.annotate(new_points=F('points') + _ledger_total(compacted_at=stamp))
+                .values_list(F('points') / BUCKET_SIZE, F('new_points') / BUCKET_SIZE)
+                .annotate(users=Count('id'))
+                .order_by()
+            )
+            move_users(list(moves))
+            profiles.update(points=F('points') + _ledger_total(compacted_at=stamp))
+            daily_points = batch.annotate(day=TruncDate('created_at')).values('user_id', 'day').annotate(
+                points=Sum('amount')
+            ).order_by()
+            record_daily_stats_many({(row['user_id'], row['day']): {'points': row['points']} for row in daily_points})
+    return compacted
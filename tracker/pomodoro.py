@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from django.db import transaction
+from django.utils import timezone
+from .analytics import record_sessions
+from .badges import award_badges
+from .models import LearningSession
+from .points import award_points, get_points
+from .search import index_objects
+from .skills import linked_skill_ids
+
+# Pomodoro Session Ingestion
+#
+# Offline-capable clients upload many finished sessions at once. The batch is
+# validated in one pass (skill ids are checked against the user's linked
+# skills, read once), inserted with a single bulk_create and its points, rollups and
+# badges are applied once for the whole batch inside one transaction.
+
+POINTS_PER_MINUTE = 2
+MAX_BATCH_SIZE = 500
+MAX_SESSION_MINUTES = 240
+
+
+def validate_sessions(user, items):
+    """
+    Check a list of session dicts ({duration, skill_id?, notes?, date?}).
+
+    Returns (cleaned, errors) where errors maps item index to a message.
+    """
+    if not isinstance(items, list) or not items:
+        return [], {'batch': 'Expected a non-empty JSON array of sessions.'}
+    if len(items) > MAX_BATCH_SIZE:
+        return [], {'batch': f'At most {MAX_BATCH_SIZE} sessions per upload.'}
+    known_skills = None  # The user's linked skills, read on the first item that names one
+    now = timezone.now()
+    cleaned, errors = [], {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors[index] = 'Each session must be an object.'
+            continue
+        duration = item.get('duration')
+        if not isinstance(duration, int) or isinstance(duration, bool) or not 0 < duration <= MAX_SESSION_MINUTES:
+            errors[index] = f'duration must be a whole number of minutes between 1 and {MAX_SESSION_MINUTES}.'
+            continue
+        skill_id = item.get('skill_id')
+        if skill_id is not None:
+            if known_skills is None:
+                known_skills = linked_skill_ids(user)
+            if not isinstance(skill_id, int) or isinstance(skill_id, bool) or skill_id not in known_skills:
+                errors[index] = 'skill_id must be the id of one of your skills.'
+                continue
+        date = now
+        if item.get('date'):
+            try:
+                date = datetime.fromisoformat(item['date'])
+            except (TypeError, ValueError):
+                errors[index] = 'date must be an ISO 8601 datetime.'
+                continue
+            if timezone.is_naive(date):
+                date = timezone.make_aware(date)
+            if date > now:
+                errors[index] = 'date cannot be in the future.'
+                continue
+        cleaned.append({
+            'skill_id': skill_id,
+            'duration': timedelta(minutes=duration),
+            'notes': str(item.get('notes', '')),
+            'date': date,
+        })
+    return cleaned, errors
+
+
+def ingest_sessions(user, cleaned):
+    """Insert validated sessions and apply their points and badges; return a summary dict."""
+    with transaction.atomic():
+        sessions = LearningSession.objects.bulk_create(
+            [LearningSession(user=user, **fields) for fields in cleaned]
+        )
+        record_sessions(sessions)  # bulk_create sends no post_save signals
+        index_objects(sessions)
+        minutes = sum(int(session.duration.total_seconds() // 60) for session in sessions)
+        points_earned = minutes * POINTS_PER_MINUTE
+        award_points(user, points_earned, 'pomodoro')
+        total_points = get_points(user)
+        badges = award_badges(user, total_points)
+    return {
+        'sessions_recorded': len(sessions),
+        'points_earned': points_earned,
+        'total_points': total_points,
+        'badges_earned': [badge.name for badge in badges],
+    }
@@ -0,0 +1,70 @@
+import hashlib
+import random
+from django.core.cache import cache
+from django.utils import timezone
+from .catalog import get_catalog_ids, invalidate_catalog
+from .models import Quote
+
+# Quote Rotation
+#
+# Instead of ORDER BY RANDOM() over the whole table, the list of quote ids is
+# held in process memory (the ``quotes`` catalog in catalog.py, so workers
+# notice Quote writes through its version counter), an id is picked by index
+# and the row is fetched (and cached) by primary key. Only ids are kept in
+# memory, so the table can grow large. Rows are cached from the primary, never
+# from a replica that may not have seen the latest write yet.
+
+QUOTE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _quote_key(quote_id):
+    return f'quotes:{quote_id}'
+
+
+def get_quote_ids():
+    """Return all quote ids, reloading them only after a Quote write."""
+    return get_catalog_ids('quotes')
+
+
+def get_quote(quote_id):
+    """Fetch a single quote by primary key, served from cache when warm."""
+    quote = cache.get(_quote_key(quote_id))
+    if quote is None:
+        quote = Quote.objects.using('default').filter(pk=quote_id).first()
+        if quote is not None:
+            cache.set(_quote_key(quote_id), quote, QUOTE_CACHE_TIMEOUT)
+    return quote
+
+
+def get_quotes(quote_ids):
+    """Fetch several quotes in the given order with one cache read and at most one query."""
+    cached = cache.get_many([_quote_key(quote_id) for quote_id in quote_ids])
+    found = {quote.pk: quote for quote in cached.values()}
+    missing = [quote_id for quote_id in quote_ids if quote_id not in found]
+    if missing:
+        fetched = Quote.objects.using('default').in_bulk(missing)
+        cache.set_many({_quote_key(pk): quote for pk, quote in fetched.items()}, QUOTE_CACHE_TIMEOUT)
+        found.update(fetched)
+    return [found[quote_id] for quote_id in quote_ids if quote_id in found]
+
+
+def random_quote():
+    """Return a uniformly random quote, or None if there are none."""
+    ids = get_quote_ids()
+    return get_quote(random.choice(ids)) if ids else None
+
+
+def quote_of_the_day(user, day=None):
+    """Return a quote that stays fixed for a given user for the whole day."""
+    ids = get_quote_ids()
+    if not ids:
+        return None
+    day = day or timezone.localdate()
+    digest = hashlib.sha1(f'{user.pk}:{day.isoformat()}'.encode()).digest()
+    return get_quote(ids[int.from_bytes(digest[:8], 'big') % len(ids)])
+
+
+def invalidate_quote(quote_id):
+    """Make every worker reload its quote ids, and drop the cached copy of one quote."""
+    invalidate_catalog('quotes')
+    cache.delete(_quote_key(quote_id))
@@ -0,0 +1,142 @@
+import calendar
+import time
+from datetime import date, timedelta
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from .models import Schedule, ScheduleRule, ScheduleException
+
+# Recurring Schedules
+#
+# A ScheduleRule is stored once and expanded lazily: occurrence_dates() jumps
+# straight to the first occurrence inside the requested window and yields only
+# the dates in it, so the cost of a week view is the number of occurrences
+# shown, not the age or length of the rule. One-off Schedule rows and the
+# exceptions (cancelled / moved occurrences) are merged in with one query
+# each, and the result per user and window start is cached behind a per-user
+# version counter bumped by the signals in signals.py.
+
+CALENDAR_DAYS = 7
+CALENDAR_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _ceil_to(value, step):
+    return -(-value // step) * step
+
+
+def occurrence_dates(rule, start, end):
+    """Yield the dates in [start, end] on which ``rule`` occurs, in order."""
+    first = max(start, rule.starts_on)
+    last = min(end, rule.ends_on) if rule.ends_on else end
+    if first > last:
+        return
+    step = max(rule.interval, 1)
+    if rule.frequency == ScheduleRule.DAILY:
+        day = rule.starts_on + timedelta(days=_ceil_to((first - rule.starts_on).days, step))
+        while day <= last:
+            yield day
+            day += timedelta(days=step)
+    elif rule.frequency == ScheduleRule.WEEKLY:
+        weekdays = rule.weekdays or 1 << rule.starts_on.weekday()
+        anchor = rule.starts_on - timedelta(days=rule.starts_on.weekday())  # Monday of the first week
+        week = anchor + timedelta(weeks=_ceil_to((first - anchor).days // 7, step))
+        while week <= last:
+            for offset in range(7):
+                day = week + timedelta(days=offset)
+                if weekdays & (1 << offset) and first <= day <= last:
+                    yield day
+            week += timedelta(weeks=step)
+    elif rule.frequency == ScheduleRule.MONTHLY:
+        start_month = rule.starts_on.year * 12 + rule.starts_on.month - 1
+        month = start_month + _ceil_to(first.year * 12 + first.month - 1 - start_month, step)
+        while month <= last.year * 12 + last.month - 1:
+            year, month_index = divmod(month, 12)
+            if rule.starts_on.day <= calendar.monthrange(year, month_index + 1)[1]:  # Short months are skipped
+                day = date(year, month_index + 1, rule.starts_on.day)
+                if first <= day <= last:
+                    yield day
+            month += step
+
+
+def occurs_on(rule, day):
+    """Return True if ``rule`` generates an occurrence on ``day``."""
+    return next(occurrence_dates(rule, day, day), None) is not None
+
+
+def expand_occurrences(user, start, end):
+    """Return every one-off and recurring slot between start and end as dicts sorted by date and time."""
+    occurrences = [
+        {'date': s.date, 'time': s.time, 'task': s.task, 'schedule_id': s.id, 'rule_id': None}
+        for s in Schedule.objects.filter(user=user, date__range=(start, end))
+    ]
+    rules = {
+        rule.id: rule for rule in ScheduleRule.objects.filter(user=user, starts_on__lte=end)
+        .filter(Q(ends_on__isnull=True) | Q(ends_on__gte=start))
+    }
+    exceptions = {}
+    if rules:
+        exceptions = {
+            (exc.rule_id, exc.date): exc for exc in ScheduleException.objects.filter(rule_id__in=rules)
+            .filter(Q(date__range=(start, end)) | Q(new_date__range=(start, end)))
+        }
+    for rule in rules.values():
+        for day in occurrence_dates(rule, start, end):
+            if (rule.id, day) not in exceptions:
+                occurrences.append(
+                    {'date': day, 'time': rule.time, 'task': rule.task, 'schedule_id': None, 'rule_id': rule.id}
+                )
+    for (rule_id, original), exc in exceptions.items():
+        day = exc.new_date or original
+        if exc.cancelled or not start <= day <= end or not occurs_on(rules[rule_id], original):
+            continue
+        occurrences.append({
+            'date': day,
+            'time': exc.new_time or rules[rule_id].time,
+            'task': exc.new_task or rules[rule_id].task,
+            'schedule_id': None,
+            'rule_id': rule_id,
+            'original_date': original,
+        })
+    return sorted(occurrences, key=lambda occurrence: (occurrence['date'], occurrence['time']))
+
+
+def _version_key(user_id):
+    return f'calendar:{user_id}:version'
+
+
+def _calendar_version(user_id):
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def calendar_window(user, start=None, days=CALENDAR_DAYS):
+    """Return [{'date', 'occurrences'}] for ``days`` days from ``start`` (default today), cached per user."""
+    start = start or timezone.localdate()
+    key = f'calendar:{user.pk}:{_calendar_version(user.pk)}:{start.isoformat()}:{days}'
+    window = cache.get(key)
+    if window is None:
+        end = start + timedelta(days=days - 1)
+        by_day = {start + timedelta(days=offset): [] for offset in range(days)}
+        for occurrence in expand_occurrences(user, start, end):
+            by_day[occurrence['date']].append(occurrence)
+        window = [{'date': day, 'occurrences': items} for day, items in by_day.items()]
+        cache.set(key, window, CALENDAR_CACHE_TIMEOUT)
+    return window
+
+
+def weekly_calendar(user, day=None):
+    """Return the Monday-to-Sunday calendar of the week containing ``day`` (default today)."""
+    day = day or timezone.localdate()
+    return calendar_window(user, day - timedelta(days=day.weekday()))
+
+
+def invalidate_calendar(user_id):
+    """Make every worker rebuild a user's cached calendar windows."""
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), time.time_ns(), None)
@@ -0,0 +1,102 @@
+import sqlite3
+import time
+from contextvars import ContextVar
+from functools import wraps
+from django.conf import settings
+
+# Primary / Replica Routing
+#
+# With a ``replica`` alias in DATABASES, reads of the catalog models (which
+# only change through the admin) and all tracker reads made inside views
+# decorated with @replica_reads go to the replica; everything else, and every
+# write, goes to ``default``. Any write pins the browser to the primary for
+# REPLICA_PIN_SECONDS via a cookie, so users always read their own writes
+# despite replication lag. Related lookups follow the object they start from,
+# so code that reads a row with .using('default') gets its relations from
+# there too. Without a replica alias the router is a no-op.
+
+REPLICA_ALIAS = 'replica'
+PIN_COOKIE = 'pin_primary'
+CATALOG_MODELS = {'quote', 'video', 'badge', 'skill'}
+
+_replica_view = ContextVar('replica_view', default=False)
+_pinned = ContextVar('pinned_to_primary', default=False)
+_wrote = ContextVar('wrote_to_primary', default=False)
+
+
+def pin_seconds():
+    return getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+
+
+def replica_reads(view):
+    """Let a read-only view send its tracker queries to the replica."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = _replica_view.set(True)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _replica_view.reset(token)
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    def __init__(self):
+        self.replica = REPLICA_ALIAS if REPLICA_ALIAS in settings.DATABASES else None
+
+    def db_for_read(self, model, **hints):
+        if not self.replica or model._meta.app_label != 'tracker' or _pinned.get() or _wrote.get():
+            return None
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db  # Related rows come from wherever their parent object was read
+        if model._meta.model_name in CATALOG_MODELS or _replica_view.get():
+            return self.replica
+        return None
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {'default', REPLICA_ALIAS}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # The replica receives schema and data through replication only
+        return False if db == REPLICA_ALIAS else None
+
+
+class ReadYourWritesMiddleware:
+    """Route a browser to the primary for a short window after it writes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            pinned = float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            pinned = False
+        pinned_token, wrote_token = _pinned.set(pinned), _wrote.set(False)
+        try:
+            response = self.get_response(request)
+            if _wrote.get():
+                seconds = pin_seconds()
+                response.set_cookie(PIN_COOKIE, str(time.time() + seconds), max_age=seconds, httponly=True)
+        finally:
+            _pinned.reset(pinned_token)
+            _wrote.reset(wrote_token)
+        return response
+
+
+def sync_sqlite_replica(source='default', target=REPLICA_ALIAS):
+    """Stand-in replication for local testing: copy the primary SQLite file onto the replica."""
+    src = sqlite3.connect(settings.DATABASES[source]['NAME'])
+    dst = sqlite3.connect(settings.DATABASES[target]['NAME'])
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
@@ -0,0 +1,190 @@
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db import connection, transaction
+from django.db.models import Q
+from .models import SearchDocument, Task, LearningSession, RoadmapStep, Skill, UserSkill
+
+# Full-Text Search
+#
+# Searchable text lives in SearchDocument, one row per task, session note,
+# roadmap step and skill, written by the signals in signals.py (and by the
+# bulk paths that bypass them). On SQLite an FTS5 table over it is maintained
+# by triggers (migration 0014); on PostgreSQL a GIN tsvector index serves the
+# same query; other databases fall back to icontains. Results are scoped to
+# the user with an "owner" token, so the index itself skips other users' rows.
+
+SEARCH_LIMIT = 20
+SHARED_OWNER = 'skills'
+WORD = re.compile(r'\w+')
+
+# kind -> (model, owner lookup or None for shared rows, title attname, body attname)
+SEARCH_SOURCES = {
+    SearchDocument.TASK: (Task, 'user_id', 'title', None),
+    SearchDocument.SESSION: (LearningSession, 'user_id', None, 'notes'),
+    SearchDocument.ROADMAP_STEP: (RoadmapStep, 'user_id', None, 'description'),
+    SearchDocument.SKILL: (Skill, None, 'name', 'description'),
+}
+KINDS_BY_MODEL = {model: kind for kind, (model, _, _, _) in SEARCH_SOURCES.items()}
+
+_unindexed_in_bulk = ContextVar('unindexed_in_bulk', default=frozenset())
+
+
+def _owner(user_id):
+    return f'u{user_id}' if user_id is not None else SHARED_OWNER
+
+
+def _document(kind, values):
+    """Build an unsaved SearchDocument from a dict of source attnames, or None if there is no text."""
+    _, owner_field, title_field, body_field = SEARCH_SOURCES[kind]
+    title = (values.get(title_field) or '')[:200] if title_field else ''
+    body = (values.get(body_field) or '') if body_field else ''
+    if not (title.strip() or body.strip()):
+        return None
+    user_id = values[owner_field] if owner_field else None
+    return SearchDocument(
+        kind=kind, object_id=values['id'], user_id=user_id, owner=_owner(user_id), title=title, body=body,
+    )
+
+
+def index_object(instance, created=False):
+    """Create, refresh or drop the search document of one saved object."""
+    kind = KINDS_BY_MODEL[type(instance)]
+    document = _document(kind, vars(instance))
+    if document is None:
+        if not created:
+            SearchDocument.objects.filter(kind=kind, object_id=instance.pk).delete()
+        return
+    fields = {'user_id': document.user_id, 'owner': document.owner, 'title': document.title, 'body': document.body}
+    if created:
+        SearchDocument.objects.bulk_create([document], ignore_conflicts=True)
+    else:
+        SearchDocument.objects.update_or_create(kind=kind, object_id=instance.pk, defaults=fields)
+
+
+def index_objects(instances):
+    """Index freshly bulk-created objects with one INSERT."""
+    documents = []
+    for instance in instances:
+        document = _document(KINDS_BY_MODEL[type(instance)], vars(instance))
+        if document is not None:
+            documents.append(document)
+    SearchDocument.objects.bulk_create(documents, ignore_conflicts=True)
+
+
+def unindex_object(instance):
+    if (type(instance), instance.pk) in _unindexed_in_bulk.get():
+        return  # Already dropped by unindex_objects()
+    SearchDocument.objects.filter(kind=KINDS_BY_MODEL[type(instance)], object_id=instance.pk).delete()
+
+
+@contextmanager
+def unindex_objects(model, ids):
+    """
+    Drop the documents of objects about to be deleted with one DELETE.
+
+    Inside the block the per-row post_delete handler skips these objects, so a
+    QuerySet.delete() over them costs no extra query per row.
+    """
+    SearchDocument.objects.filter(kind=KINDS_BY_MODEL[model], object_id__in=ids).delete()
+    token = _unindexed_in_bulk.set(_unindexed_in_bulk.get() | {(model, pk) for pk in ids})
+    try:
+        yield
+    finally:
+        _unindexed_in_bulk.reset(token)
+
+
+def rebuild_search_index(chunk_size=2000, progress=None):
+    """Re-create every SearchDocument from the source tables in streamed batches; return the count."""
+    total = 0
+    with transaction.atomic():
+        SearchDocument.objects.all().delete()
+        for kind, (model, owner_field, title_field, body_field) in SEARCH_SOURCES.items():
+            fields = ['id'] + [field for field in (owner_field, title_field, body_field) if field]
+            batch = []
+            for values in model.objects.order_by('pk').values(*fields).iterator(chunk_size=chunk_size):
+                document = _document(kind, values)
+                if document is not None:
+                    batch.append(document)
+                if len(batch) >= chunk_size:
+                    SearchDocument.objects.bulk_create(batch)
+                    total += len(batch)
+                    batch = []
+                    if progress:
+                        progress(kind, total)
+            SearchDocument.objects.bulk_create(batch)
+            total += len(batch)
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                # Re-derive the index from the content table, then merge its segments
+                cursor.execute("INSERT INTO tracker_searchdocument_fts(tracker_searchdocument_fts) VALUES ('rebuild')")
+                cursor.execute("INSERT INTO tracker_searchdocument_fts(tracker_searchdocument_fts) VALUES ('optimize')")
+    return total
+
+
+def _user_skill_ids(user):
+    return UserSkill.objects.filter(userprofile__user=user).values('skill_id')
+
+
+def _fts5_query(user, words, kinds, limit):
+    terms = ' '.join(f'"{word}"' for word in words[:-1]) + f' "{words[-1]}"*'  # Last word is a prefix
+    match = f'owner : ("{_owner(user.pk)}" OR "{SHARED_OWNER}") AND {{title body}} : ({terms})'
+    skill_sql, skill_params = _user_skill_ids(user).query.sql_with_params()
+    kind_sql = f" AND d.kind IN ({', '.join(['%s'] * len(kinds))})" if kinds else ''
+    sql = f"""
+        SELECT d.kind, d.object_id, d.title,
+               snippet(tracker_searchdocument_fts, CASE WHEN d.body != '' THEN 2 ELSE 1 END, '**', '**', '…', 12)
+        FROM tracker_searchdocument_fts
+        JOIN tracker_searchdocument d ON d.id = tracker_searchdocument_fts.rowid
+        WHERE tracker_searchdocument_fts MATCH %s
+          AND (d.kind != 'skill' OR d.object_id IN ({skill_sql})){kind_sql}
+        ORDER BY bm25(tracker_searchdocument_fts, 0, 10, 1)
+        LIMIT %s
+    """
+    return sql, [match, *skill_params, *kinds, limit]
+
+
+def _postgres_query(user, words, kinds, limit):
+    terms = ' & '.join(words[:-1] + [f'{words[-1]}:*'])
+    skill_sql, skill_params = _user_skill_ids(user).query.sql_with_params()
+    kind_sql = f" AND d.kind IN ({', '.join(['%s'] * len(kinds))})" if kinds else ''
+    sql = f"""
+        SELECT d.kind, d.object_id, d.title,
+               ts_headline('simple', d.title || ' ' || d.body, q,
+                           'StartSel=**, StopSel=**, MaxWords=12, MinWords=4')
+        FROM tracker_searchdocument d, to_tsquery('simple', %s) q
+        WHERE to_tsvector('simple', d.title || ' ' || d.body) @@ q
+          AND d.owner IN (%s, %s)
+          AND (d.kind != 'skill' OR d.object_id IN ({skill_sql})){kind_sql}
+        ORDER BY ts_rank(to_tsvector('simple', d.title || ' ' || d.body), q) DESC
+        LIMIT %s
+    """
+    return sql, [terms, _owner(user.pk), SHARED_OWNER, *skill_params, *kinds, limit]
+
+
+def search(user, text, kinds=None, limit=SEARCH_LIMIT):
+    """Return up to ``limit`` ranked matches for ``text`` among the user's items and linked skills."""
+    words = WORD.findall(text.lower())
+    if not words:
+        return []
+    kinds = [kind for kind in kinds or [] if kind in SEARCH_SOURCES]
+    if connection.vendor not in ('sqlite', 'postgresql'):
+        documents = SearchDocument.objects.filter(
+            Q(owner=_owner(user.pk)) | Q(kind=SearchDocument.SKILL, object_id__in=_user_skill_ids(user))
+        )
+        if kinds:
+            documents = documents.filter(kind__in=kinds)
+        for word in words:
+            documents = documents.filter(Q(title__icontains=word) | Q(body__icontains=word))
+        return [
+            {'kind': d.kind, 'id': d.object_id, 'title': d.title, 'snippet': d.body[:120]}
+            for d in documents[:limit]
+        ]
+    build = _fts5_query if connection.vendor == 'sqlite' else _postgres_query
+    sql, params = build(user, words, kinds, limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            {'kind': kind, 'id': object_id, 'title': title, 'snippet': snippet}
+            for kind, object_id, title, snippet in cursor.fetchall()
+        ]
@@ -0,0 +1,124 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .analytics import record_sessions
+from .catalog import invalidate_catalog
+from .dashboard import invalidate_dashboard
+from .leaderboard import bucket_for, move_users
+from .quotes import invalidate_quote
+from .recurrence import invalidate_calendar
+from .search import index_object, unindex_object
+from .models import (
+    Badge, Quote, Video, UserProfile, Task, Schedule, ScheduleRule, ScheduleException, Skill, UserSkill, UserBadge,
+    DailyActivity, LearningSession, RoadmapStep,
+)
+
+# Signal handlers (imported from TrackerConfig.ready())
+
+
+@receiver([post_save, post_delete], sender=Badge)
+def badge_changed(sender, **kwargs):
+    """Reload the badge catalog (and threshold index) on next use."""
+    invalidate_catalog('badges')
+
+
+@receiver([post_save, post_delete], sender=Video)
+def video_changed(sender, **kwargs):
+    """Reload the video catalog on next use."""
+    invalidate_catalog('videos')
+
+
+@receiver([post_save, post_delete], sender=Quote)
+def quote_changed(sender, instance, **kwargs):
+    """Refresh the cached quote ids (and this quote) on next use."""
+    invalidate_quote(instance.pk)
+
+
+@receiver(pre_save, sender=UserProfile)
+def profile_saving(sender, instance, update_fields=None, **kwargs):
+    """Remember the stored points when a save may overwrite them."""
+    if instance.pk and (update_fields is None or 'points' in update_fields):
+        instance._stored_points = UserProfile.objects.filter(pk=instance.pk).values_list('points', flat=True).first()
+
+
+@receiver(post_save, sender=UserProfile)
+def profile_saved(sender, instance, created, **kwargs):
+    """Keep the leaderboard histogram in step with direct profile saves (admin, registration)."""
+    if created:
+        move_users([(None, bucket_for(instance.points), 1)])
+    elif getattr(instance, '_stored_points', None) is not None:
+        old_points = instance.__dict__.pop('_stored_points')
+        if old_points != instance.points:
+            move_users([(bucket_for(old_points), bucket_for(instance.points), 1)])
+
+
+@receiver(post_delete, sender=UserProfile)
+def profile_deleted(sender, instance, **kwargs):
+    move_users([(bucket_for(instance.points), None, 1)])
+
+
+@receiver([post_save, post_delete], sender=Task)
+@receiver([post_save, post_delete], sender=Schedule)
+@receiver([post_save, post_delete], sender=UserBadge)
+@receiver([post_save, post_delete], sender=DailyActivity)
+def user_item_changed(sender, instance, **kwargs):
+    """Drop the owner's cached dashboard when one of their items changes."""
+    invalidate_dashboard(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Schedule)
+@receiver([post_save, post_delete], sender=ScheduleRule)
+def schedule_changed(sender, instance, **kwargs):
+    """Rebuild the owner's cached calendar windows on next use."""
+    invalidate_calendar(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=ScheduleException)
+def schedule_exception_changed(sender, instance, **kwargs):
+    invalidate_calendar(instance.rule.user_id)
+
+
+@receiver([post_save, post_delete], sender=UserSkill)
+def user_skill_changed(sender, instance, **kwargs):
+    invalidate_dashboard(instance.userprofile.user_id)
+
+
+@receiver([post_save, post_delete], sender=Skill)
+def skill_catalog_changed(sender, **kwargs):
+    """Reload the skill catalog on next use."""
+    invalidate_catalog('skills')
+
+
+@receiver(post_save, sender=Skill)
+def skill_changed(sender, instance, **kwargs):
+    """A shared Skill row appears on the dashboard of every user linked to it."""
+    user_ids = UserSkill.objects.filter(skill=instance).values_list('userprofile__user_id', flat=True)
+    invalidate_dashboard(*user_ids)
+
+
+@receiver(post_save, sender=LearningSession)
+def session_saved(sender, instance, created, **kwargs):
+    """Add new sessions to the analytics rollup (bulk inserts call record_sessions directly)."""
+    if created:
+        record_sessions([instance])
+
+
+@receiver(post_delete, sender=LearningSession)
+def session_deleted(sender, instance, **kwargs):
+    record_sessions([instance], sign=-1)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=LearningSession)
+@receiver(post_save, sender=RoadmapStep)
+@receiver(post_save, sender=Skill)
+def searchable_saved(sender, instance, created, **kwargs):
+    """Keep the item's search document in step (bulk inserts call index_objects directly)."""
+    index_object(instance, created)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=LearningSession)
+@receiver(post_delete, sender=RoadmapStep)
+@receiver(post_delete, sender=Skill)
+def searchable_deleted(sender, instance, **kwargs):
+    unindex_object(instance)
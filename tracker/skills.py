@@ -0,0 +1,85 @@
+from bisect import bisect_right
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Q, Sum, Value, When
+from .dashboard import invalidate_dashboard
+from .models import LearningSession, UserSkill
+
+# Skill Progress
+#
+# UserSkill.time_spent is kept current as sessions are recorded: each batch
+# adds its per-skill duration with one UPDATE ... SET time_spent = time_spent
+# + delta, and the same statement moves proficiency_level to the band the new
+# total falls in. Reading a user's progress on a skill is then one row lookup.
+# reconcile_skill_time() recomputes everything from session history to repair
+# drift (e.g. sessions logged before the skill was added to the profile).
+
+# Hours of study at which proficiency_level rises to 2, 3, 4, ...
+PROFICIENCY_HOURS = (10, 50, 100, 250)
+
+
+def proficiency_thresholds():
+    return [timedelta(hours=hours) for hours in getattr(settings, 'SKILL_PROFICIENCY_HOURS', PROFICIENCY_HOURS)]
+
+
+def linked_skill_ids(user):
+    """Return the ids of the skills on a user's profile, with one query."""
+    return set(UserSkill.objects.filter(userprofile__user=user).values_list('skill_id', flat=True))
+
+
+def proficiency_for(time_spent):
+    """Return the proficiency level (1 = below the first threshold) for a total study time."""
+    return bisect_right(proficiency_thresholds(), time_spent) + 1
+
+
+def record_skill_time(user_id, skill_id, duration):
+    """Add (or with a negative duration, remove) study time on a user's skill and update its proficiency."""
+    # In an UPDATE every F() reads the old value, so "new total >= threshold"
+    # is written as "old total >= threshold - duration".
+    levels = [
+        When(Q(time_spent__gte=threshold - duration), then=Value(level))
+        for level, threshold in reversed(list(enumerate(proficiency_thresholds(), start=2)))
+    ]
+    updated = UserSkill.objects.filter(userprofile__user_id=user_id, skill_id=skill_id).update(
+        time_spent=F('time_spent') + duration,
+        proficiency_level=Case(*levels, default=Value(1)),
+    )
+    if updated:
+        invalidate_dashboard(user_id)  # QuerySet.update() sends no post_save signal
+    return updated
+
+
+def reconcile_skill_time(user=None, chunk_size=1000):
+    """Recompute time_spent and proficiency for every UserSkill from session history; return rows repaired."""
+    user_skills = UserSkill.objects.order_by('pk')
+    if user is not None:
+        user_skills = user_skills.filter(userprofile__user=user)
+    repaired, last_pk = 0, 0
+    while True:
+        with transaction.atomic():
+            chunk = list(
+                user_skills.filter(pk__gt=last_pk).select_for_update()
+                .select_related('userprofile')[:chunk_size]
+            )
+            if not chunk:
+                return repaired
+            last_pk = chunk[-1].pk
+            totals = {
+                (row['user_id'], row['skill_id']): row['total']
+                for row in LearningSession.objects.filter(
+                    user_id__in={us.userprofile.user_id for us in chunk},
+                    skill_id__in={us.skill_id for us in chunk},
+                ).values('user_id', 'skill_id').annotate(total=Sum('duration')).order_by()
+            }
+            changed = []
+            for user_skill in chunk:
+                total = totals.get((user_skill.userprofile.user_id, user_skill.skill_id)) or timedelta(0)
+                level = proficiency_for(total)
+                if (user_skill.time_spent, user_skill.proficiency_level) != (total, level):
+                    user_skill.time_spent, user_skill.proficiency_level = total, level
+                    changed.append(user_skill)
+            UserSkill.objects.bulk_update(changed, ['time_spent', 'proficiency_level'])
+            if changed:
+                invalidate_dashboard(*{us.userprofile.user_id for us in changed})
+            repaired += len(changed)
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# SQLite Tuning
+#
+# Applied to every new SQLite connection through the connection_created
+# signal. WAL lets readers run alongside the single writer, synchronous=NORMAL
+# is durable across application crashes under WAL (a power loss can drop the
+# last commits, never corrupt the file), mmap serves reads from the page cache
+# and busy_timeout makes a blocked writer wait instead of failing with
+# "database is locked". Override any value with settings.SQLITE_PRAGMAS.
+
+PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,  # ms
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -20000,  # KiB
+    'temp_store': 'memory',
+}
+
+
+def sqlite_pragmas():
+    return {**PRAGMAS, **getattr(settings, 'SQLITE_PRAGMAS', {})}
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply the tuning PRAGMAs to a freshly opened SQLite connection."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f'PRAGMA {name} = {value}')
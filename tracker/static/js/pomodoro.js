@@ -4,11 +4,13 @@ class PomodoroTimer {
         this.duration = 25; // Default 25 minutes
         this.timeLeft = this.duration * 60; // Convert to seconds
         this.isRunning = false;
-        this.timer = null;
+        this.isPaused = false;
+        this.events = null;
 
         this.initializeElements();
         this.bindEvents();
         this.loadDailyStats();
+        this.syncWithServer();  // Picks a running timer back up after a reload
     }
 
     initializeElements() {
@@ -29,33 +31,96 @@ class PomodoroTimer {
         this.durationSelect.addEventListener('change', (e) => this.setDuration(e.target.value));
     }
 
-    start() {
-        if (!this.isRunning) {
-            this.isRunning = true;
-            this.startBtn.style.display = 'none';
-            this.pauseBtn.style.display = 'inline-block';
-
-            this.timer = setInterval(() => {
-                this.timeLeft--;
-                this.updateDisplay();
-                this.updateProgressBar();
-
-                if (this.timeLeft <= 0) {
-                    this.complete();
+    // The timer itself runs on the server (/pomodoro/timer/); this page only sends
+    // start/pause/resume/cancel and renders the events pushed over /pomodoro/timer/events/.
+    syncWithServer() {
+        fetch('/pomodoro/timer/')
+            .then(response => response.json())
+            .then(state => this.applyState(state));
+    }
+
+    sendAction(action, extra = {}) {
+        return fetch('/pomodoro/timer/', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json', 'X-CSRFToken': Utils.getCookie('csrftoken')},
+            body: JSON.stringify({action, ...extra})
+        })
+            .then(response => response.json())
+            .then(state => {
+                if (state.status === 'error') {
+                    Utils.showToast(state.message, 'danger');
+                } else {
+                    this.applyState(state);
                 }
-            }, 1000);
+            });
+    }
+
+    start() {
+        if (this.isPaused) {
+            this.sendAction('resume');
+        } else {
+            this.sendAction('start', {
+                minutes: this.duration,
+                skill_id: parseInt(this.skillSelect.value) || null,
+                notes: this.notesInput.value
+            });
         }
     }
 
     pause() {
-        this.isRunning = false;
-        clearInterval(this.timer);
-        this.startBtn.style.display = 'inline-block';
-        this.pauseBtn.style.display = 'none';
+        this.sendAction('pause');
     }
 
     reset() {
-        this.pause();
+        if (this.isRunning || this.isPaused) {
+            this.sendAction('cancel');
+        }
+        this.showIdle();
+    }
+
+    applyState(state) {
+        this.isRunning = state.status === 'running';
+        this.isPaused = state.status === 'paused';
+        if (!this.isRunning && !this.isPaused) {
+            this.closeStream();
+            this.showIdle();
+            return;
+        }
+        this.duration = state.duration / 60;
+        this.timeLeft = state.remaining;
+        this.startBtn.style.display = this.isRunning ? 'none' : 'inline-block';
+        this.pauseBtn.style.display = this.isRunning ? 'inline-block' : 'none';
+        this.updateDisplay();
+        this.updateProgressBar();
+        this.openStream();
+    }
+
+    openStream() {
+        if (this.events) {
+            return;
+        }
+        this.events = new EventSource('/pomodoro/timer/events/');
+        this.events.addEventListener('state', (e) => this.applyState(JSON.parse(e.data)));
+        this.events.addEventListener('tick', (e) => {
+            this.timeLeft = JSON.parse(e.data).remaining;
+            this.updateDisplay();
+            this.updateProgressBar();
+        });
+        this.events.addEventListener('complete', (e) => this.complete(JSON.parse(e.data)));
+    }
+
+    closeStream() {
+        // Close explicitly: an EventSource left open would reconnect (i.e. poll) forever
+        if (this.events) {
+            this.events.close();
+            this.events = null;
+        }
+    }
+
+    showIdle() {
+        this.isRunning = this.isPaused = false;
+        this.startBtn.style.display = 'inline-block';
+        this.pauseBtn.style.display = 'none';
         this.timeLeft = this.duration * 60;
         this.updateDisplay();
         this.updateProgressBar();
@@ -78,37 +143,15 @@ class PomodoroTimer {
         this.progressBar.style.width = `${progress}%`;
     }
 
-    complete() {
-        this.pause();
+    complete(result) {
+        this.closeStream();
+        this.showIdle();
         this.playCompletionSound();
-        this.saveSession();
+        Utils.showToast(`Session completed! +${result.points_earned} XP`, 'success');
         this.showCompletionModal();
         this.updateDailyStats();
     }
 
-    saveSession() {
-        const formData = new FormData();
-        formData.append('duration', this.duration);
-        formData.append('skill_id', this.skillSelect.value);
-        formData.append('notes', this.notesInput.value);
-        formData.append('csrfmiddlewaretoken', Utils.getCookie('csrftoken'));
-
-        fetch('/pomodoro/', {
-            method: 'POST',
-            body: formData
-        })
-            .then(response => response.json())
-            .then(data => {
-                if (data.status === 'success') {
-                    Utils.showToast(`Session completed! +${data.points_earned} XP`, 'success');
-                }
-            })
-            .catch(error => {
-                console.error('Error:', error);
-                Utils.showToast('Error saving session', 'danger');
-            });
-    }
-
     playCompletionSound() {
         // Play completion sound
         const audio = new Audio('data:audio/wav;base64,UklGRnoGAABXQVZFZm10IBAAAAABAAEAQB8AAEAfAAABAAgAZGF0YQoGAACBhYqFbF1fdJivrJBhNjVgodDbq2EcBj+a2/LDciUFLIHO8tiJNwgZaLvt559NEAxQp+PwtmMcBjiR1/LMeSwFJHfH8N2QQAoUXrTp66hVFApGn+DyvmAXIDhd3LGTMAoAPP/5mB');
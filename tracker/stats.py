@@ -0,0 +1,133 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .models import DailyStats, DailyActivity, LearningSession, PointsLedgerEntry
+
+# Daily Learning Stats
+#
+# DailyStats holds one small row per user per active day. Session, points and
+# activity writes add to it as they happen, so streaks and lifetime totals
+# are computed over a user's active days (cached until the next write) rather
+# than over their raw history. The cached values are read from the primary.
+
+STATS_CACHE_TIMEOUT = 60 * 60
+STAT_FIELDS = ('minutes', 'sessions', 'points', 'activities_completed')
+
+
+def _cache_key(user_id):
+    return f'stats:{user_id}:{timezone.localdate().isoformat()}'
+
+
+def record_daily_stats(user_id, day, **deltas):
+    """Add deltas (minutes, sessions, points, activities_completed) to a user's row for ``day``."""
+    deltas = {field: value for field, value in deltas.items() if value}
+    if not deltas:
+        return
+    row = DailyStats.objects.filter(user_id=user_id, day=day)
+    increments = {field: F(field) + value for field, value in deltas.items()}
+    if not row.update(**increments):
+        try:
+            with transaction.atomic():
+                DailyStats.objects.create(user_id=user_id, day=day, **deltas)
+        except IntegrityError:  # Another request created the row first
+            row.update(**increments)
+    cache.delete(_cache_key(user_id))
+
+
+def record_daily_stats_many(rows, batch_size=500):
+    """
+    Add ``{(user_id, day): {field: delta}}`` to many rows at once: per batch,
+    one locking read, one UPDATE for the rows that exist and one INSERT for
+    the rest, instead of a round trip per row.
+    """
+    rows = {key: {field: value for field, value in deltas.items() if value} for key, deltas in rows.items()}
+    keys = [key for key, deltas in rows.items() if deltas]
+    with transaction.atomic():
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start:start + batch_size]
+            existing = {
+                (stats.user_id, stats.day): stats
+                for stats in DailyStats.objects.select_for_update().filter(
+                    user_id__in={user_id for user_id, day in batch}, day__in={day for user_id, day in batch},
+                )
+            }
+            updated, missing = [], []
+            for key in batch:
+                stats = existing.get(key)
+                if stats is None:
+                    missing.append(DailyStats(user_id=key[0], day=key[1], **rows[key]))
+                    continue
+                for field, value in rows[key].items():
+                    setattr(stats, field, getattr(stats, field) + value)
+                updated.append(stats)
+            DailyStats.objects.bulk_update(updated, sorted({field for key in batch for field in rows[key]}))
+            try:
+                with transaction.atomic():
+                    DailyStats.objects.bulk_create(missing)
+            except IntegrityError:  # Another request created one of the rows first
+                for stats in missing:
+                    record_daily_stats(stats.user_id, stats.day, **rows[(stats.user_id, stats.day)])
+    cache.delete_many([_cache_key(user_id) for user_id in {user_id for user_id, day in keys}])
+
+
+def backfill_daily_stats(user=None, chunk_size=2000):
+    """Rebuild DailyStats from sessions, compacted ledger entries and completed activities."""
+    sessions = LearningSession.objects.all()
+    ledger = PointsLedgerEntry.objects.filter(compacted_at__isnull=False)  # Pending entries add themselves on compaction
+    activities = DailyActivity.objects.filter(is_completed=True)
+    existing = DailyStats.objects.all()
+    if user is not None:
+        sessions, ledger = sessions.filter(user=user), ledger.filter(user=user)
+        activities, existing = activities.filter(user=user), existing.filter(user=user)
+    totals = defaultdict(lambda: dict.fromkeys(STAT_FIELDS, 0))
+    for row in (sessions.annotate(day=TruncDate('date')).values('user_id', 'day')
+                .annotate(total=Sum('duration'), count=Count('id')).order_by().iterator(chunk_size=chunk_size)):
+        stats = totals[(row['user_id'], row['day'])]
+        stats['minutes'] = row['total'].total_seconds() / 60
+        stats['sessions'] = row['count']
+    for row in (ledger.annotate(day=TruncDate('created_at')).values('user_id', 'day')
+                .annotate(total=Sum('amount')).order_by().iterator(chunk_size=chunk_size)):
+        totals[(row['user_id'], row['day'])]['points'] = row['total']
+    for row in (activities.values('user_id', 'date').annotate(count=Count('id'))
+                .order_by().iterator(chunk_size=chunk_size)):
+        totals[(row['user_id'], row['date'])]['activities_completed'] = row['count']
+    with transaction.atomic():
+        user_ids = set(existing.values_list('user_id', flat=True).distinct())
+        existing.delete()
+        DailyStats.objects.bulk_create(
+            (DailyStats(user_id=user_id, day=day, **stats) for (user_id, day), stats in totals.items()),
+            batch_size=chunk_size,
+        )
+    # Only the rebuilt users' stats are stale; the rest of the shared cache is left alone
+    user_ids.update(user_id for user_id, day in totals)
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids])
+
+
+def get_learning_stats(user):
+    """Return current/best learning streak and lifetime totals for a user (cached)."""
+    key = _cache_key(user.pk)
+    stats = cache.get(key)
+    if stats is not None:
+        return stats
+    rows = DailyStats.objects.using('default').filter(user=user)
+    stats = rows.aggregate(
+        total_minutes=Sum('minutes'), total_sessions=Sum('sessions'),
+        total_points=Sum('points'), total_activities_completed=Sum('activities_completed'),
+    )
+    stats = {name: value or 0 for name, value in stats.items()}
+    stats['total_minutes'] = round(stats['total_minutes'])
+    current = best = 0
+    previous = None
+    for day in rows.filter(sessions__gt=0).order_by('day').values_list('day', flat=True):
+        current = current + 1 if previous and day - previous == timedelta(days=1) else 1
+        best = max(best, current)
+        previous = day
+    if previous is None or previous < timezone.localdate() - timedelta(days=1):
+        current = 0  # Streak broken: nothing logged today or yesterday
+    stats.update(current_streak=current, best_streak=best)
+    cache.set(key, stats, STATS_CACHE_TIMEOUT)
+    return stats
@@ -0,0 +1,52 @@
+import gzip
+import re
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # Optional; pip install brotli to also write .br variants
+    brotli = None
+
+# Static File Storage
+#
+# collectstatic names every file after a hash of its content (app.3f2a9c81d0e4.css),
+# so the files can be cached forever and a new build is a new URL. Text files
+# are also written pre-compressed (.gz, and .br when brotli is installed) for
+# the web server, or serve_static, to send in place of the original.
+
+COMPRESSIBLE = ('.css', '.js', '.json', '.svg', '.txt', '.map', '.ttf', '.eot', '.html')
+MIN_COMPRESS_SIZE = 256  # Below this the headers outweigh the saving
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.\w+$')  # app.3f2a9c81d0e4.css
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:  # Not collected yet (development, tests): use the plain name
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            if name.endswith(COMPRESSIBLE):
+                self._write_compressed(name)
+
+    def _write_compressed(self, name):
+        with self.open(name) as original:
+            data = original.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        variants = {'.gz': gzip.compress(data, 9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(data, quality=11)
+        for suffix, compressed in variants.items():
+            if len(compressed) < len(data):
+                if self.exists(name + suffix):
+                    self.delete(name + suffix)
+                self._save(name + suffix, ContentFile(compressed))
@@ -0,0 +1,18 @@
+from functools import cache
+from django import template
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from ..assets import BUNDLE_CSS, BUNDLE_JS
+
+register = template.Library()
+
+
+@cache
+def _bundles_built():
+    return all(staticfiles_storage.exists(name) or finders.find(name) for name in (BUNDLE_CSS, BUNDLE_JS))
+
+
+@register.simple_tag
+def assets_built():
+    """True once build_assets has produced the CSS and JS bundles (checked once per process)."""
+    return _bundles_built()
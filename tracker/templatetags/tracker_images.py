@@ -0,0 +1,62 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from ..images import AVATAR_SIZES, avatar_name, picture_processed, static_manifest
+
+register = template.Library()
+
+
+def _avatar_size(minimum):
+    return next((size for size in AVATAR_SIZES if size >= minimum), AVATAR_SIZES[-1])
+
+
+@register.simple_tag
+def avatar(picture, size=48, alt=''):
+    """A profile picture (FieldFile or stored name) at ``size`` CSS pixels, with 2x and WebP thumbnails once processed."""
+    name = getattr(picture, 'name', picture) or ''
+    if not name:
+        return ''
+    if not picture_processed(name):  # Still being processed: the original, scaled by the browser
+        return format_html(
+            '<img src="{}" width="{}" height="{}" alt="{}" loading="lazy" style="object-fit: cover">',
+            default_storage.url(name), size, size, alt,
+        )
+    ext = name.rsplit('.', 1)[-1]
+    one, two = _avatar_size(size), _avatar_size(2 * size)
+
+    def srcset(variant_ext):
+        return ', '.join(
+            f'{default_storage.url(avatar_name(name, thumbnail, variant_ext))} {density}x'
+            for density, thumbnail in ((1, one), (2, two))
+        )
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}">'
+        '<img src="{}" srcset="{}" width="{}" height="{}" alt="{}" loading="lazy" decoding="async"></picture>',
+        srcset('webp'), default_storage.url(avatar_name(name, one, ext)), srcset(ext), size, size, alt,
+    )
+
+
+@register.simple_tag
+def responsive_image(path, alt='', sizes='100vw', loading='lazy', **attrs):
+    """
+    A static image as <picture> with the WebP and fallback widths written by
+    optimize_images, or a plain <img> for images it hasn't processed. Extra
+    keyword arguments (e.g. class) become attributes of the <img>.
+    """
+    extra = format_html_join('', ' {}="{}"', attrs.items())
+    entry = static_manifest().get(path)
+    if not entry:
+        return format_html('<img src="{}" alt="{}" loading="{}"{}>', static(path), alt, loading, extra)
+    webp = [variant for variant in entry['variants'] if variant['type'] == 'image/webp']
+    fallback = [variant for variant in entry['variants'] if variant['type'] != 'image/webp']
+
+    def srcset(variants):
+        return ', '.join(f"{static('images/optimized/' + variant['name'])} {variant['width']}w" for variant in variants)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" loading="{}" decoding="async"{}>'
+        '</picture>',
+        srcset(webp), sizes, static('images/optimized/' + fallback[-1]['name']), srcset(fallback), sizes,
+        entry['width'], entry['height'], alt, loading, extra,
+    )
@@ -1,3 +1,1375 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import tempfile
+from datetime import date, time, timedelta
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock, skipUnless
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection, connections, router
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from . import views
+from .badges import award_badges
+from .bulk import ROADMAP_STEP_POINTS, TASK_POINTS, bulk_roadmap_steps, bulk_tasks
+from .analytics import rebuild_rollups
+from .assets import minify_css, purge_css
+from .benchmarks import check_budgets, load_budgets, run_benchmarks, seed_population
+from .catalog import CATALOG_PAGE_SIZE, get_catalog
+from .charts import CHART_BUILDERS, CHART_DAYS, chart_key, chart_spec
+from .dashboard import get_dashboard_snapshot
+from .images import AVATAR_SIZES, MAX_PICTURE_SIDE, process_profile_picture, static_manifest
+from .importer import Importer, open_rows
+from .leaderboard import rank_of, top_learners
+from .middleware import UNRESOLVED, profiling_snapshot, reset_profiling
+from .models import (
+    UserProfile, Skill, UserSkill, Schedule, Task, LearningSession, RoadmapStep,
+    Badge, UserBadge, DailyActivity, DailyStats, PointsLedgerEntry, SessionRollup, SearchDocument, ScheduleRule, ScheduleException, PomodoroTimer, Quote, Video,
+)
+from .pagination import encode_cursor, roadmap_page, task_page
+from .routers import PIN_COOKIE, REPLICA_ALIAS, PrimaryReplicaRouter, ReadYourWritesMiddleware, replica_reads
+from .points import award_points, compact_ledger, get_points
+from .pomodoro import POINTS_PER_MINUTE
+from .quotes import get_quote, get_quotes, quote_of_the_day, random_quote
+from .recurrence import expand_occurrences, occurrence_dates, occurs_on
+from .search import rebuild_search_index, search
+from .sqlite import PRAGMAS
+from .skills import reconcile_skill_time
+from .stats import backfill_daily_stats, get_learning_stats
+from .storage import CompressedManifestStaticFilesStorage
+from .templatetags.tracker_images import avatar, responsive_image
+from .timer import complete_due_timers, get_timer, start_timer
 
-# Create your tests here.
+# A plan line that reads a whole table without any index, e.g. "SCAN tracker_task"
+FULL_SCAN = re.compile(r'^SCAN (TABLE )?(?P<table>\w+)( AS \w+)?$')
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite syntax')
+class HotQueryIndexTests(TestCase):
+    """Seed a synthetic population and check each view's queries are index lookups."""
+
+    USERS = 50
+    ROWS_PER_USER = 40
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        users = User.objects.bulk_create([User(username=f'learner{i}') for i in range(cls.USERS)])
+        profiles = UserProfile.objects.bulk_create(
+            [UserProfile(user=user, role='student', points=i * 7) for i, user in enumerate(users)]
+        )
+        skills = Skill.objects.bulk_create(
+            [Skill(name=f'Skill {i}', level='beginner', category='programming') for i in range(10)]
+        )
+        badges = Badge.objects.bulk_create(
+            [Badge(name=f'Badge {i}', description='', icon='', points_required=i * 100) for i in range(5)]
+        )
+        UserSkill.objects.bulk_create(
+            [UserSkill(userprofile=profile, skill=skill) for profile in profiles for skill in skills[:3]]
+        )
+        UserBadge.objects.bulk_create([UserBadge(user=user, badge=badges[0]) for user in users])
+        rows = range(cls.ROWS_PER_USER)
+        Schedule.objects.bulk_create(
+            [Schedule(user=user, date=today + timedelta(days=i - 20), time='09:00', task='Study')
+             for user in users for i in rows]
+        )
+        Task.objects.bulk_create(
+            [Task(user=user, title=f'Task {i}', priority='medium', completed=i % 2 == 0,
+                  due_date=today + timedelta(days=i % 7) if i % 3 else None)
+             for user in users for i in rows]
+        )
+        RoadmapStep.objects.bulk_create(
+            [RoadmapStep(user=user, skill=skills[i % 10], description=f'Step {i}')
+             for user in users for i in rows]
+        )
+        LearningSession.objects.bulk_create(
+            [LearningSession(user=user, skill=skills[i % 10], duration=timedelta(minutes=25))
+             for user in users for i in rows]
+        )
+        DailyActivity.objects.bulk_create(
+            [DailyActivity(user=user, title=f'Activity {i}', category='other') for user in users for i in rows]
+        )
+        rules = ScheduleRule.objects.bulk_create(
+            [ScheduleRule(user=user, task='Study', time='09:00', frequency=ScheduleRule.DAILY,
+                          starts_on=today - timedelta(days=365)) for user in users]
+        )
+        ScheduleException.objects.bulk_create(
+            [ScheduleException(rule=rule, date=today + timedelta(days=1), cancelled=True) for rule in rules]
+        )
+        PointsLedgerEntry.objects.bulk_create(
+            [PointsLedgerEntry(user=user, amount=10, reason='task') for user in users for i in range(3)]
+        )
+        rebuild_search_index()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        cls.user = users[cls.USERS // 2]
+
+    def setUp(self):
+        cache.clear()
+
+    def assertUsesIndexes(self, func, ordered=False):
+        """Fail on full scans, and with ``ordered`` also on sorts the index should have made unnecessary."""
+        with CaptureQueriesContext(connection) as captured:
+            func()
+        self.assertTrue(captured.captured_queries)
+        for query in captured.captured_queries:
+            if not query['sql'].startswith('SELECT'):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                plan = [row[-1] for row in cursor.fetchall()]
+            scans = [line for line in plan if FULL_SCAN.match(line)]
+            self.assertFalse(scans, f"Full table scan in {query['sql']!r}: {plan}")
+            if ordered:
+                sorts = [line for line in plan if 'TEMP B-TREE' in line]
+                self.assertFalse(sorts, f"Sort in {query['sql']!r}: {plan}")
+
+    def test_dashboard(self):
+        self.assertUsesIndexes(lambda: get_dashboard_snapshot(self.user))
+
+    def test_schedule(self):
+        self.assertUsesIndexes(lambda: list(
+            Schedule.objects.filter(user=self.user, date__gte=timezone.localdate())
+        ))
+        today = timezone.localdate()
+        self.assertUsesIndexes(lambda: expand_occurrences(self.user, today, today + timedelta(days=6)))
+
+    def test_task_list(self):
+        self.assertUsesIndexes(lambda: list(Task.objects.filter(user=self.user)))
+        self.assertUsesIndexes(lambda: list(Task.objects.filter(user=self.user, completed=False)))
+        _, cursor = task_page(self.user, size=5)
+        self.assertUsesIndexes(lambda: task_page(self.user, cursor, size=5), ordered=True)
+        self.assertUsesIndexes(lambda: task_page(self.user, cursor, size=5, completed=False), ordered=True)
+        self.assertUsesIndexes(lambda: task_page(self.user, size=40, descending=True), ordered=True)
+
+    def test_daily_activities(self):
+        self.assertUsesIndexes(lambda: list(
+            DailyActivity.objects.filter(user=self.user, date=timezone.localdate())
+        ))
+
+    def test_roadmap(self):
+        self.assertUsesIndexes(lambda: list(RoadmapStep.objects.filter(user=self.user)))
+        _, cursor = roadmap_page(self.user, size=5)
+        self.assertUsesIndexes(lambda: roadmap_page(self.user, cursor, size=5), ordered=True)
+        self.assertUsesIndexes(lambda: roadmap_page(self.user, cursor, size=5, completed=True), ordered=True)
+
+    def test_learning_sessions(self):
+        since = timezone.now() - timedelta(days=7)
+        self.assertUsesIndexes(lambda: list(LearningSession.objects.filter(user=self.user, date__gte=since)))
+
+    def test_points_and_rank(self):
+        self.assertUsesIndexes(lambda: get_points(self.user))
+        self.assertUsesIndexes(lambda: rank_of(self.user))
+
+    def test_search(self):
+        self.assertUsesIndexes(lambda: search(self.user, 'step'))
+
+    def test_due_pomodoro_timer_sweep(self):
+        start_timer(self.user, 25)
+        PomodoroTimer.objects.filter(user=self.user).update(ends_at=timezone.now() - timedelta(seconds=1))
+        get_catalog('badges')  # Loaded whole by design; only the sweep's own queries are checked
+        self.assertUsesIndexes(complete_due_timers)
+
+    def test_progress_charts(self):
+        for kind in CHART_BUILDERS:
+            self.assertUsesIndexes(lambda: chart_spec(self.user, kind))
+
+
+class ViewQueryBudgetTests(TestCase):
+    """Every URL stays within the query budget in benchmark_budgets.json (latency is left to benchmark_views)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = seed_population(users=5, skills=5, sessions=10, tasks=10)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_query_budgets(self):
+        report = run_benchmarks(self.user, iterations=2)
+        self.assertEqual(check_budgets(report, load_budgets(), latency=False), [])
+
+    def test_error_status_fails_within_budget(self):
+        report = {'dashboard': {'status': 500, 'queries': 1, 'p95_ms': 1}}
+        budgets = {'dashboard': {'max_queries': 4, 'max_p95_ms': 250}}
+        self.assertEqual(check_budgets(report, budgets), ['dashboard: responded 500'])
+
+
+class TaskPaginationTests(TestCase):
+    """Keyset pages walk every task exactly once, in every direction and filter; malformed cursors are rejected."""
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        cls.user = User.objects.create_user('pager')
+        Task.objects.bulk_create(
+            [Task(user=cls.user, title=f'Task {i}', priority='medium', completed=i % 2 == 0,
+                  due_date=today + timedelta(days=i % 7) if i % 3 else None)
+             for i in range(40)]
+        )
+
+    def test_task_pages_cover_every_task_once(self):
+        for completed in (None, True):
+            for descending in (False, True):
+                seen, cursor = [], None
+                while True:
+                    tasks, cursor = task_page(self.user, cursor, size=7, completed=completed, descending=descending)
+                    seen += [task.id for task in tasks]
+                    if cursor is None:
+                        break
+                expected = Task.objects.filter(user=self.user)
+                if completed is not None:
+                    expected = expected.filter(completed=completed)
+                dated = expected.filter(due_date__isnull=False).order_by(
+                    *(['-due_date', '-id'] if descending else ['due_date', 'id']))
+                undated = expected.filter(due_date__isnull=True).order_by('-id' if descending else 'id')
+                self.assertEqual(seen, [task.id for task in [*dated, *undated]])
+
+    def test_malformed_cursors(self):
+        self.client.force_login(self.user)
+        cursors = {
+            '/tasks/': [['undated', [1]], ['undated', 'x'], ['undated', 1, 2], ['dated', [1], 2],
+                        ['dated', '2026-01-01'], ['later'], [True], [None], {'a': 1}, []],
+            '/roadmap/': [[{'a': 1}, 2], [1, [2]], ['1', 2], [1, 2, 3], [1.5, 2], [False, 2]],
+        }
+        for path, values in cursors.items():
+            for value in values:
+                with self.subTest(path=path, cursor=value):
+                    cursor = encode_cursor(value)
+                    response = self.client.get(path, {'cursor': cursor, 'format': 'json'})
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(response.json()['message'], 'Invalid cursor.')
+                    self.assertRedirects(self.client.get(path, {'cursor': cursor}), path)
+        self.assertEqual(self.client.get('/tasks/', {'cursor': 'not base64!'}).status_code, 302)
+
+
+class SearchTests(TestCase):
+    """Search matches word prefixes, and only within the user's own items and linked skills."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('finder')
+        profile = UserProfile.objects.create(user=cls.user, role='student')
+        other = User.objects.create_user('other')
+        UserProfile.objects.create(user=other, role='student')
+        cls.tasks = [Task.objects.create(user=cls.user, title=title, priority='low')
+                     for title in ('Task 1', 'Task 12', 'Task 2')]
+        Task.objects.create(user=other, title='Task 1', priority='low')
+        cls.linked = Skill.objects.create(name='Skill linked', level='beginner', category='programming')
+        Skill.objects.create(name='Skill unlinked', level='beginner', category='programming')
+        UserSkill.objects.create(userprofile=profile, skill=cls.linked)
+
+    def test_prefix_match_on_own_tasks(self):
+        results = search(self.user, 'task 1', kinds=['task'])
+        self.assertEqual({result['id'] for result in results}, {self.tasks[0].id, self.tasks[1].id})
+
+    def test_skills_limited_to_linked(self):
+        self.assertEqual([result['id'] for result in search(self.user, 'skill', kinds=['skill'])], [self.linked.id])
+
+
+class PomodoroTimerTests(TestCase):
+    """A timer that runs out records exactly one session, whoever notices first."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('timer')
+        UserProfile.objects.create(user=self.user, role='student')
+
+    def test_due_timer_records_one_session(self):
+        start_timer(self.user, 25)
+        PomodoroTimer.objects.filter(user=self.user).update(ends_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(complete_due_timers(), 1)
+        self.assertEqual(complete_due_timers(), 0)
+        self.assertIsNotNone(get_timer(self.user).completed_at)
+        session = LearningSession.objects.get(user=self.user)
+        self.assertEqual(session.duration, timedelta(minutes=25))
+        self.assertEqual(get_points(self.user), 25 * POINTS_PER_MINUTE)
+
+
+class PointsLedgerTests(TestCase):
+    """Live balances, and compaction folding each ledger entry in exactly once."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('ledger')
+        UserProfile.objects.create(user=self.user, role='student', points=100)
+
+    def test_live_balance_includes_pending_entries(self):
+        award_points(self.user, 10, 'task')
+        award_points(self.user, 5, 'pomodoro')
+        self.assertEqual(get_points(self.user), 115)
+        self.assertEqual(UserProfile.objects.get(user=self.user).points, 100)
+
+    def test_compaction_is_idempotent(self):
+        award_points(self.user, 10, 'task')
+        self.assertEqual(compact_ledger(), 1)
+        self.assertEqual(compact_ledger(), 0)
+        self.assertEqual(UserProfile.objects.get(user=self.user).points, 110)
+        self.assertEqual(get_points(self.user), 110)
+
+    def test_award_during_compaction_stays_pending(self):
+        award_points(self.user, 10, 'task')
+        # Lands after the batch is stamped but before the profiles are updated
+        with mock.patch('tracker.points.move_users', side_effect=lambda moves: award_points(self.user, 7, 'task')):
+            self.assertEqual(compact_ledger(), 1)
+        self.assertEqual(UserProfile.objects.get(user=self.user).points, 110)
+        self.assertEqual(get_points(self.user), 117)
+        self.assertEqual(compact_ledger(), 1)
+        self.assertEqual(UserProfile.objects.get(user=self.user).points, 117)
+
+    def test_daily_stats_written_in_bulk(self):
+        users = [self.user] + [User.objects.create_user(f'learner{i}') for i in range(5)]
+        today, yesterday = timezone.localdate(), timezone.now() - timedelta(days=1)
+        DailyStats.objects.create(user=self.user, day=today, points=3, sessions=1)
+        for user in users:
+            award_points(user, 10, 'task')
+            PointsLedgerEntry.objects.filter(pk=award_points(user, 4, 'task').pk).update(created_at=yesterday)
+
+        def count_queries(entries):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(compact_ledger(), entries)
+            return len(queries)
+        queries = count_queries(len(users) * 2)
+        yesterday = timezone.localdate(yesterday)
+        self.assertEqual(
+            set(DailyStats.objects.values_list('user__username', 'day', 'points', 'sessions')),
+            {('ledger', today, 13, 1), ('ledger', yesterday, 4, 0)}
+            | {(user.username, day, points, 0) for user in users[1:] for day, points in ((today, 10), (yesterday, 4))},
+        )
+
+        more = users + [User.objects.create_user(f'late{i}') for i in range(20)]
+        for user in more:
+            award_points(user, 1, 'task')
+        self.assertEqual(count_queries(len(more)), queries)  # Same statements for four times the users
+        self.assertEqual(DailyStats.objects.get(user=self.user, day=today).points, 14)
+        self.assertEqual(DailyStats.objects.get(user=more[-1], day=today).points, 1)
+
+
+class BadgeAwardTests(TestCase):
+    """Every points path awards badges, and badges added below a user's total are caught up."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('badger')
+        UserProfile.objects.create(user=self.user, role='student')
+        Badge.objects.create(name='First', description='', icon='', points_required=10)
+
+    def _post(self, view, *args, data=None):
+        request = RequestFactory().post('/', data or {})
+        request.user = self.user
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        return view(request, *args)
+
+    def _held(self):
+        return set(UserBadge.objects.filter(user=self.user).values_list('badge__name', flat=True))
+
+    def test_single_item_completion_awards_badges(self):
+        task = Task.objects.create(user=self.user, title='Read', priority='low')
+        self._post(views.mark_task_complete, task.pk)  # 10 points
+        self.assertEqual(self._held(), {'First'})
+        Badge.objects.create(name='Steps', description='', icon='', points_required=30)
+        skill = Skill.objects.create(name='Go', level='beginner', category='programming')
+        step = RoadmapStep.objects.create(user=self.user, skill=skill, description='Tour')
+        self._post(views.mark_roadmap_step_complete, step.pk)  # 30 points
+        self.assertEqual(self._held(), {'First', 'Steps'})
+        Badge.objects.create(name='Habits', description='', icon='', points_required=35)
+        self._post(views.daily_activities, data={'title': 'Walk', 'category': 'other'})  # 35 points
+        self.assertEqual(self._held(), {'First', 'Steps', 'Habits'})
+
+    def test_badge_added_below_total_is_caught_up(self):
+        award_points(self.user, 50, 'task')
+        self.assertEqual([badge.name for badge in award_badges(self.user, 50)], ['First'])
+        Badge.objects.create(name='Late', description='', icon='', points_required=20)
+        self.assertEqual([badge.name for badge in award_badges(self.user, get_points(self.user))], ['Late'])
+        self.assertEqual(award_badges(self.user, get_points(self.user)), [])
+        self.assertEqual(self._held(), {'First', 'Late'})
+
+
+class DashboardInvalidationTests(TestCase):
+    """A cached dashboard snapshot is rebuilt after a write to any model it shows."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('dash')
+        self.profile = UserProfile.objects.create(user=self.user, role='student')
+        self.skill = Skill.objects.create(name='Rust', level='beginner', category='programming')
+        get_dashboard_snapshot(self.user)  # Cached before each write below
+
+    def snapshot(self, section, field):
+        return [item[field] for item in get_dashboard_snapshot(self.user)[section]]
+
+    def test_task(self):
+        task = Task.objects.create(user=self.user, title='Read', priority='low')
+        self.assertEqual(self.snapshot('tasks', 'title'), ['Read'])
+        task.title = 'Reread'
+        task.save()
+        self.assertEqual(self.snapshot('tasks', 'title'), ['Reread'])
+        task.delete()
+        self.assertEqual(self.snapshot('tasks', 'title'), [])
+
+    def test_schedule(self):
+        Schedule.objects.create(user=self.user, date=timezone.localdate(), time='09:00', task='Study')
+        self.assertEqual(self.snapshot('schedules', 'task'), ['Study'])
+
+    def test_user_badge(self):
+        badge = Badge.objects.create(name='Star', description='', icon='', points_required=0)
+        UserBadge.objects.create(user=self.user, badge=badge)
+        self.assertEqual(self.snapshot('badges', 'name'), ['Star'])
+
+    def test_daily_activity(self):
+        activity = DailyActivity.objects.create(user=self.user, title='Walk', category='other')
+        self.assertEqual(self.snapshot('activities', 'is_completed'), [False])
+        activity.is_completed = True
+        activity.save()
+        self.assertEqual(self.snapshot('activities', 'is_completed'), [True])
+
+    def test_user_skill_and_shared_skill(self):
+        link = UserSkill.objects.create(userprofile=self.profile, skill=self.skill)
+        self.assertEqual(self.snapshot('skills', 'name'), ['Rust'])
+        self.skill.name = 'Rust 2024'
+        self.skill.save()
+        self.assertEqual(self.snapshot('skills', 'name'), ['Rust 2024'])
+        link.delete()
+        self.assertEqual(self.snapshot('skills', 'name'), [])
+
+
+class LeaderboardTests(TestCase):
+    """The public leaderboard page and histogram ranks, including ties and bucket boundaries."""
+
+    def setUp(self):
+        cache.clear()
+        self.users = {}
+        for name, points in [('ada', 420), ('bo', 150), ('cy', 150), ('di', 99), ('ed', 50)]:
+            self.users[name] = User.objects.create_user(name, password='pw')
+            UserProfile.objects.create(user=self.users[name], role='student', points=points)
+
+    def test_rank_of(self):
+        ranks = {name: rank_of(user) for name, user in self.users.items()}
+        self.assertEqual(ranks, {'ada': 1, 'bo': 2, 'cy': 2, 'di': 4, 'ed': 5})
+        award_points(self.users['ed'], 400, 'task')
+        compact_ledger()  # ed moves from the 0-99 bucket to 400-499, above ada
+        self.assertEqual(rank_of(self.users['ed']), 1)
+        self.assertEqual(rank_of(self.users['ada']), 2)
+        self.assertIsNone(rank_of(User.objects.create_user('no-profile')))
+
+    def test_anonymous_page(self):
+        response = self.client.get('/leaderboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([learner['username'] for learner in response.context['users']], ['ada', 'bo', 'cy', 'di', 'ed'])
+        self.assertNotIn('my_rank', response.context)
+
+    def test_rank_shown_when_logged_in(self):
+        self.client.force_login(self.users['di'])
+        self.assertContains(self.client.get('/leaderboard/'), 'Your rank: #4')
+
+
+class MotivationPageTests(TestCase):
+    """Quote and video pages on the motivation view paginate independently."""
+
+    def setUp(self):
+        cache.clear()
+        Quote.objects.bulk_create(Quote(text=f'quote {i}', author='anon') for i in range(CATALOG_PAGE_SIZE + 5))
+        Video.objects.bulk_create(Video(title=f'video {i}', url=f'https://example.com/{i}') for i in range(3))
+        self.client.force_login(User.objects.create_user('learner', password='pw'))
+
+    def test_pages(self):
+        first = self.client.get('/motivation/')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([q.text for q in first.context['quotes']], [f'quote {i}' for i in range(CATALOG_PAGE_SIZE)])
+        self.assertEqual(len(first.context['videos']), 3)
+
+        second = self.client.get('/motivation/', {'page': 2, 'video_page': 1})
+        self.assertEqual([q.text for q in second.context['quotes']], [f'quote {i}' for i in range(CATALOG_PAGE_SIZE, CATALOG_PAGE_SIZE + 5)])
+        self.assertContains(second, 'Page 2 of 2')
+        self.assertContains(second, 'href="?page=1&video_page=1"')
+
+        past_end = self.client.get('/motivation/', {'page': 99, 'video_page': 'x'})
+        self.assertEqual(past_end.context['quotes'].number, 2)
+        self.assertEqual(past_end.context['videos'].number, 1)
+
+    def test_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self.client.get('/motivation/').status_code, 302)
+
+
+class QuoteRotationTests(TestCase):
+    """Quote of the day, random quotes and the quote cache, including refresh after writes."""
+
+    def setUp(self):
+        cache.clear()
+        self.quotes = [Quote.objects.create(text=f'quote {i}', author='anon') for i in range(10)]
+        self.user = User.objects.create_user('learner', password='pw')
+
+    def test_quote_of_the_day_is_fixed_per_user_and_day(self):
+        day = date(2024, 3, 1)
+        quote = quote_of_the_day(self.user, day)
+        self.assertIn(quote, self.quotes)
+        with self.assertNumQueries(0):
+            self.assertEqual(quote_of_the_day(self.user, day), quote)
+        week = {quote_of_the_day(self.user, day + timedelta(days=i)).pk for i in range(14)}
+        self.assertGreater(len(week), 1)
+        with mock.patch('django.utils.timezone.localdate', return_value=day):
+            self.assertEqual(quote_of_the_day(self.user), quote)
+
+    def test_random_quote(self):
+        self.assertIn(random_quote(), self.quotes)
+        with mock.patch('tracker.quotes.random.choice', return_value=self.quotes[3].pk):
+            self.assertEqual(random_quote(), self.quotes[3])
+
+    def test_no_quotes(self):
+        Quote.objects.all().delete()
+        self.assertIsNone(random_quote())
+        self.assertIsNone(quote_of_the_day(self.user))
+
+    def test_get_quotes_keeps_order_and_caches(self):
+        ids = [self.quotes[5].pk, self.quotes[1].pk, 0, self.quotes[8].pk]
+        with self.assertNumQueries(1):
+            self.assertEqual(get_quotes(ids), [self.quotes[5], self.quotes[1], self.quotes[8]])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_quotes(ids[:2]), [self.quotes[5], self.quotes[1]])
+        self.assertEqual(get_quotes([]), [])
+
+    def test_cache_refreshes_after_save_and_delete(self):
+        quote = self.quotes[0]
+        self.assertEqual(get_quote(quote.pk).text, 'quote 0')
+        quote.text = 'edited'
+        quote.save()
+        self.assertEqual(get_quote(quote.pk).text, 'edited')
+        self.assertEqual(get_quotes([quote.pk])[0].text, 'edited')
+
+        for day in range(30):
+            quote_of_the_day(self.user, date(2024, 1, 1) + timedelta(days=day))
+        deleted = self.quotes[1].pk
+        self.quotes[1].delete()
+        self.assertIsNone(get_quote(deleted))
+        shown = {quote_of_the_day(self.user, date(2024, 1, 1) + timedelta(days=day)).pk for day in range(30)}
+        self.assertNotIn(deleted, shown)
+        added = Quote.objects.create(text='new', author='anon')
+        with mock.patch('tracker.quotes.random.choice', side_effect=max):
+            self.assertEqual(random_quote(), added)
+
+
+class LearningStatsTests(TestCase):
+    """Streaks and totals from DailyStats, and the backfill that rebuilds it."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('learner', password='pw')
+        self.now = timezone.now()
+
+    def log(self, days_ago, minutes=30, user=None):
+        LearningSession.objects.create(
+            user=user or self.user, duration=timedelta(minutes=minutes), date=self.now - timedelta(days=days_ago),
+        )
+
+    def test_streaks(self):
+        for days_ago in (9, 8, 7, 6, 4, 1, 0, 0):
+            self.log(days_ago)
+        stats = get_learning_stats(self.user)
+        self.assertEqual((stats['current_streak'], stats['best_streak']), (2, 4))
+        self.assertEqual((stats['total_minutes'], stats['total_sessions']), (240, 8))
+
+    def test_streak_broken_after_a_missed_day(self):
+        self.log(3)
+        self.log(2)
+        stats = get_learning_stats(self.user)
+        self.assertEqual((stats['current_streak'], stats['best_streak']), (0, 2))
+
+    def test_write_invalidates_cached_stats(self):
+        self.log(1)
+        self.assertEqual(get_learning_stats(self.user)['current_streak'], 1)
+        self.log(0)
+        self.assertEqual(get_learning_stats(self.user)['current_streak'], 2)
+
+    def stats_rows(self):
+        return sorted(DailyStats.objects.values_list(
+            'user_id', 'day', 'minutes', 'sessions', 'points', 'activities_completed',
+        ))
+
+    def test_backfill_matches_incremental_rows(self):
+        other = User.objects.create_user('other', password='pw')
+        for days_ago in (2, 1, 1, 0):
+            self.log(days_ago, minutes=45)
+        self.log(0, user=other)
+        award_points(self.user, 40, 'task')
+        compact_ledger()
+        award_points(self.user, 5, 'task')  # Pending: added by its own compaction, not by the backfill
+        activity = DailyActivity.objects.create(user=self.user, title='Read', category='other')
+        self.client.force_login(self.user)
+        self.client.get(f'/activities/{activity.pk}/complete/')
+        incremental = self.stats_rows()
+        self.assertEqual(len(incremental), 4)
+
+        DailyStats.objects.all().delete()
+        backfill_daily_stats()
+        self.assertEqual(self.stats_rows(), incremental)
+
+    def test_backfill_clears_only_stats_keys(self):
+        self.log(0)
+        before = get_learning_stats(self.user)
+        cache.set('unrelated', 'kept')
+        LearningSession.objects.filter(user=self.user).update(duration=timedelta(minutes=90))
+        backfill_daily_stats()
+        self.assertEqual(cache.get('unrelated'), 'kept')
+        self.assertEqual(get_learning_stats(self.user)['total_minutes'], before['total_minutes'] + 60)
+
+    def test_backfill_one_user(self):
+        other = User.objects.create_user('other', password='pw')
+        self.log(0)
+        self.log(0, user=other)
+        DailyStats.objects.update(minutes=0)
+        get_learning_stats(self.user), get_learning_stats(other)
+        backfill_daily_stats(user=self.user)
+        self.assertEqual(get_learning_stats(self.user)['total_minutes'], 30)
+        self.assertEqual(get_learning_stats(other)['total_minutes'], 0)  # Untouched, still cached
+
+
+class SessionRollupTests(TestCase):
+    """SessionRollup, DailyStats and skill time follow session writes, deletes and batch uploads."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('learner', password='pw')
+        self.profile = UserProfile.objects.create(user=self.user, role='student')
+        self.skill = Skill.objects.create(name='Go', level='beginner')
+        self.user_skill = UserSkill.objects.create(userprofile=self.profile, skill=self.skill)
+        self.yesterday = timezone.now() - timedelta(days=1)
+
+    def rollups(self):
+        return sorted(SessionRollup.objects.values_list('day', 'skill_id', 'duration', 'sessions'))
+
+    def test_delete_subtracts(self):
+        keep = LearningSession.objects.create(user=self.user, skill=self.skill, duration=timedelta(minutes=25))
+        removed = LearningSession.objects.create(user=self.user, skill=self.skill, duration=timedelta(minutes=50))
+        LearningSession.objects.create(user=self.user, duration=timedelta(minutes=10), date=self.yesterday)
+        removed.delete()
+        self.assertEqual(self.rollups(), [
+            (timezone.localdate(self.yesterday), None, timedelta(minutes=10), 1),
+            (timezone.localdate(), self.skill.pk, timedelta(minutes=25), 1),
+        ])
+        self.user_skill.refresh_from_db()
+        self.assertEqual(self.user_skill.time_spent, keep.duration)
+        today = DailyStats.objects.get(user=self.user, day=timezone.localdate())
+        self.assertEqual((today.minutes, today.sessions), (25, 1))
+
+        incremental = self.rollups()
+        rebuild_rollups()
+        self.assertEqual(self.rollups(), incremental)
+
+    def test_batch_upload(self):
+        self.client.force_login(self.user)
+        response = self.client.post('/pomodoro/batch/', [
+            {'duration': 25, 'skill_id': self.skill.pk},
+            {'duration': 25, 'skill_id': self.skill.pk},
+            {'duration': 40, 'date': self.yesterday.isoformat()},
+        ], content_type='application/json')
+        self.assertEqual(response.json()['sessions_recorded'], 3)
+        self.assertEqual(self.rollups(), [
+            (timezone.localdate(self.yesterday), None, timedelta(minutes=40), 1),
+            (timezone.localdate(), self.skill.pk, timedelta(minutes=50), 2),
+        ])
+        self.user_skill.refresh_from_db()
+        self.assertEqual(self.user_skill.time_spent, timedelta(minutes=50))
+
+        daily = self.client.get('/analytics/').json()['daily']
+        self.assertEqual([(day['minutes'], day['sessions']) for day in daily[-2:]], [(40.0, 1), (50.0, 2)])
+
+
+class ExportTests(TestCase):
+    """The export view streams only the requesting user's rows, as JSON Lines or CSV."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('learner', password='pw')
+        other = User.objects.create_user('other', password='pw')
+        Task.objects.create(user=self.user, title='Read, then write', priority='high', due_date=date(2026, 5, 1))
+        Task.objects.create(user=other, title='Not mine', priority='low')
+        LearningSession.objects.create(user=self.user, duration=timedelta(minutes=90), notes='chapter 3')
+        self.client.force_login(self.user)
+
+    def export(self, **params):
+        response = self.client.get('/export/', params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def test_jsonl(self):
+        records = [json.loads(line) for line in self.export(types='tasks,sessions').decode().splitlines()]
+        self.assertEqual(records[0], {
+            'type': 'tasks', 'user': 'learner', 'id': records[0]['id'], 'title': 'Read, then write',
+            'priority': 'high', 'due_date': '2026-05-01', 'completed': False,
+        })
+        self.assertEqual([(r['type'], r.get('duration'), r.get('notes')) for r in records[1:]], [
+            ('sessions', 90.0, 'chapter 3'),
+        ])
+
+    def test_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.export(format='csv').decode())))
+        self.assertEqual([(row['type'], row['user']) for row in rows], [('tasks', 'learner'), ('sessions', 'learner')])
+        self.assertEqual((rows[0]['title'], rows[0]['due_date'], rows[0]['notes']), ('Read, then write', '2026-05-01', ''))
+        self.assertEqual(rows[1]['duration'], '90.0')
+
+    def test_gzip(self):
+        self.assertEqual(gzip.decompress(self.export(format='csv', gzip='1')), self.export(format='csv'))
+
+
+class ImporterTests(TestCase):
+    """Bad rows are reported with their line number and never abort the import."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('learner', password='pw')
+
+    def test_rejects_bad_rows(self):
+        lines = [
+            '{"type": "sessions", "user": "learner", "duration": 25, "notes": "ok"}',
+            '[1, 2]',
+            '"just a string"',
+            '{"type": "sessions", "user": "learner", "duration": NaN}',
+            '{"type": "sessions", "user": "learner", "duration": 1e12}',
+            '{"type": "sessions", "user": "learner", "duration": 1e400}',
+            '{"type": "sessions", "user": "learner", "duration": 0}',
+            '{"type": "sessions", "user": "learner", "duration": -5}',
+            '{"type": "sessions", "user": "learner", "duration": 241}',
+            '{"type": "sessions", "user": "learner", "duration": [25]}',
+            '{"type": "sessions", "user": ["learner"], "duration": 25}',
+            '{"type": "sessions", "user": "learner", "duration": 25, "skill": {"name": "Go"}}',
+            '{"type": "daily_activities", "user": "learner", "title": "Walk", "category": "other", "date": [2026]}',
+            '{"type": "tasks", "user": "learner", "title": "Read", "priority": "low"}',
+            '{not json',
+        ]
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as handle:
+            handle.write('\n'.join(lines))
+        self.addCleanup(os.unlink, handle.name)
+        importer = Importer(chunk_size=4)
+        importer.run(open_rows(handle.name))
+
+        self.assertEqual(dict(importer.imported), {'sessions': 1, 'tasks': 1})
+        self.assertEqual([line for line, message in importer.errors], [2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 15])
+        errors = dict(importer.errors)
+        self.assertEqual(errors[2], 'Each row must be an object.')
+        self.assertEqual(errors[4], 'duration must be more than 0 and at most 240 minutes.')
+        self.assertEqual(errors[11], "Unknown user ['learner'].")
+        self.assertEqual(LearningSession.objects.get(user=self.user).duration, timedelta(minutes=25))
+
+
+@override_settings(TRACKER_PROFILING={'ENABLED': True})
+class ProfilingMiddlewareTests(TestCase):
+    """Requests are profiled under their URL name; unmatched paths share one entry."""
+
+    def setUp(self):
+        reset_profiling()
+        self.addCleanup(reset_profiling)
+
+    def test_entries_by_url_name(self):
+        self.client.get('/leaderboard/')
+        self.client.get('/leaderboard/')
+        for number in range(3):
+            self.client.get(f'/no-such-page-{number}/')
+        urls = profiling_snapshot()['urls']
+        self.assertEqual(sorted(urls), [UNRESOLVED, 'leaderboard'])
+        self.assertEqual((urls['leaderboard']['requests'], urls[UNRESOLVED]['requests']), (2, 3))
+        self.assertGreater(urls['leaderboard']['queries'], 0)
+
+
+class ReplicaRouterTests(TestCase):
+    """Reads go to the replica only where allowed; writes, and reads after them, use the primary."""
+
+    def setUp(self):
+        cache.clear()
+        with mock.patch.dict(settings.DATABASES, {REPLICA_ALIAS: {}}):
+            self.router = PrimaryReplicaRouter()
+        self.user = User.objects.create_user('learner', password='pw')
+        UserProfile.objects.create(user=self.user, role='student', points=30)
+
+    def request(self, view, cookies=None):
+        """Run ``view(request)`` through ReadYourWritesMiddleware and return what it returned."""
+        result = {}
+
+        def wrapped(request):
+            result['value'] = view(request)
+            return HttpResponse()
+        request = RequestFactory().get('/')
+        request.COOKIES.update(cookies or {})
+        result['response'] = ReadYourWritesMiddleware(wrapped)(request)
+        return result
+
+    def routes(self, request):
+        return {model.__name__: self.router.db_for_read(model) for model in (Task, Quote, User)}
+
+    def test_outside_replica_views(self):
+        self.assertEqual(self.request(self.routes)['value'], {'Task': None, 'Quote': REPLICA_ALIAS, 'User': None})
+
+    def test_inside_replica_views(self):
+        routes = self.request(replica_reads(self.routes))['value']
+        self.assertEqual(routes, {'Task': REPLICA_ALIAS, 'Quote': REPLICA_ALIAS, 'User': None})
+
+        def related(request):
+            return self.router.db_for_read(Task, instance=User.objects.using('default').get(pk=self.user.pk))
+        self.assertEqual(self.request(replica_reads(related))['value'], 'default')
+
+    def test_writes_go_to_primary(self):
+        def write_then_read(request):
+            return self.router.db_for_write(Task), self.routes(request)
+        result = self.request(replica_reads(write_then_read))
+        self.assertEqual(result['value'], ('default', {'Task': None, 'Quote': None, 'User': None}))
+        pin = result['response'].cookies[PIN_COOKIE].value
+
+        pinned = self.request(replica_reads(self.routes), cookies={PIN_COOKIE: pin})
+        self.assertEqual(pinned['value'], {'Task': None, 'Quote': None, 'User': None})
+        self.assertNotIn(PIN_COOKIE, pinned['response'].cookies)
+
+    def test_without_replica(self):
+        self.router = PrimaryReplicaRouter()
+        self.assertEqual(self.request(replica_reads(self.routes))['value'], {'Task': None, 'Quote': None, 'User': None})
+
+    def test_cached_reads_use_primary(self):
+        # The test run has no replica connection, so any query routed there raises
+        quotes = Quote.objects.bulk_create([Quote(text=f'quote {i}', author='anon') for i in range(3)])
+        LearningSession.objects.create(user=self.user, duration=timedelta(minutes=20))
+
+        def cached_reads(request):
+            return (
+                get_dashboard_snapshot(self.user), top_learners(), get_learning_stats(self.user),
+                quote_of_the_day(self.user), get_quotes([quote.pk for quote in quotes]),
+            )
+        with mock.patch.object(router.routers[0], 'replica', REPLICA_ALIAS):
+            snapshot, top, stats, quote, page = self.request(replica_reads(cached_reads))['value']
+        self.assertEqual(snapshot['tasks'], [])
+        self.assertEqual([learner['username'] for learner in top], ['learner'])
+        self.assertEqual(stats['total_minutes'], 20)
+        self.assertIn(quote, quotes)
+        self.assertEqual(page, quotes)
+
+
+class BulkOperationTests(TestCase):
+    """Bulk actions touch only the caller's rows, report what changed and cost the same for any batch size."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('learner', password='pw')
+        UserProfile.objects.create(user=self.user, role='student')
+        self.other = User.objects.create_user('other', password='pw')
+        self.skill = Skill.objects.create(name='Go', level='beginner')
+        Badge.objects.create(name='Busy', description='', icon='', points_required=3 * TASK_POINTS)
+        self.tasks = Task.objects.bulk_create(
+            [Task(user=self.user, title=f'Task {i}', priority='low') for i in range(60)]
+        )
+        self.others_task = Task.objects.create(user=self.other, title='Not mine', priority='low')
+
+    def task_ids(self, count):
+        return [task.id for task in self.tasks[:count]] + [self.others_task.id]
+
+    def test_complete_tasks(self):
+        summary = bulk_tasks(self.user, 'complete', self.task_ids(3))
+        self.assertEqual(summary, {'updated': 3, 'points_earned': 3 * TASK_POINTS, 'badges_earned': ['Busy']})
+        self.assertEqual(get_points(self.user), 3 * TASK_POINTS)
+        self.assertEqual(bulk_tasks(self.user, 'complete', self.task_ids(3)),
+                         {'updated': 0, 'points_earned': 0, 'badges_earned': []})  # Repeats earn nothing
+        self.assertFalse(Task.objects.get(pk=self.others_task.pk).completed)
+
+    def test_update_and_delete_tasks(self):
+        self.assertEqual(bulk_tasks(self.user, 'reprioritize', self.task_ids(4), priority='high'), {'updated': 4})
+        due = date(2026, 12, 1)
+        self.assertEqual(bulk_tasks(self.user, 'reschedule', self.task_ids(2), due_date=due), {'updated': 2})
+        self.assertEqual(bulk_tasks(self.user, 'delete', self.task_ids(5)), {'deleted': 5})
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 55)
+        self.others_task.refresh_from_db()
+        self.assertEqual((self.others_task.priority, self.others_task.due_date), ('low', None))
+
+    def test_roadmap_steps(self):
+        mine = RoadmapStep.objects.bulk_create(
+            [RoadmapStep(user=self.user, skill=self.skill, description=f'Step {i}') for i in range(3)]
+        )
+        theirs = RoadmapStep.objects.create(user=self.other, skill=self.skill, description='Not mine')
+        ids = [step.id for step in mine] + [theirs.id]
+        summary = bulk_roadmap_steps(self.user, 'complete', ids[1:])
+        self.assertEqual((summary['updated'], summary['points_earned']), (2, 2 * ROADMAP_STEP_POINTS))
+        self.assertEqual(bulk_roadmap_steps(self.user, 'delete', ids), {'deleted': 3})
+        self.assertTrue(RoadmapStep.objects.filter(pk=theirs.pk, completed=False).exists())
+
+    def test_view(self):
+        self.client.force_login(self.user)
+        response = self.client.post('/tasks/bulk/', {'action': 'complete', 'ids': self.task_ids(2)},
+                                    content_type='application/json')
+        self.assertEqual(response.json(), {
+            'status': 'success', 'action': 'complete', 'updated': 2, 'points_earned': 2 * TASK_POINTS,
+            'badges_earned': [],
+        })
+        response = self.client.post('/roadmap/bulk/', {'action': 'reprioritize', 'ids': [1]},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_rejects_out_of_range_ids(self):
+        self.client.force_login(self.user)
+        for ids in ([2 ** 70], [2 ** 63], [0], [-1], [1, True], ['1'], []):
+            for path in ('/tasks/bulk/', '/roadmap/bulk/'):
+                with self.subTest(path=path, ids=ids):
+                    response = self.client.post(path, {'action': 'delete', 'ids': ids}, content_type='application/json')
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(response.json()['message'], 'ids must be a non-empty list of positive integers.')
+        response = self.client.post('/tasks/bulk/', {'action': 'delete', 'ids': [2 ** 63 - 1]},
+                                    content_type='application/json')
+        self.assertEqual(response.json()['deleted'], 0)
+
+    def test_query_count_does_not_grow(self):
+        Badge.objects.all().delete()  # Keep a badge award out of only one of the two batches
+        get_catalog('badges')  # Loaded once per process, not per request
+        with CaptureQueriesContext(connection) as few:
+            bulk_tasks(self.user, 'complete', self.task_ids(2))
+        with CaptureQueriesContext(connection) as many:
+            bulk_tasks(self.user, 'complete', [task.id for task in self.tasks[2:]])
+        self.assertEqual(len(many), len(few))
+        with CaptureQueriesContext(connection) as few:
+            bulk_tasks(self.user, 'reprioritize', self.task_ids(2), priority='high')
+        with CaptureQueriesContext(connection) as many:
+            bulk_tasks(self.user, 'reprioritize', self.task_ids(60), priority='medium')
+        self.assertEqual(len(many), len(few))
+
+    def test_delete_unindexes_in_constant_queries(self):
+        steps = RoadmapStep.objects.bulk_create(
+            [RoadmapStep(user=self.user, skill=self.skill, description=f'Step {i}') for i in range(30)]
+        )
+        rebuild_search_index()
+        queries = []
+        for model, delete, ids in [
+            (Task, bulk_tasks, self.task_ids(2)),
+            (Task, bulk_tasks, [task.id for task in self.tasks[2:]]),
+            (RoadmapStep, bulk_roadmap_steps, [step.id for step in steps[:2]]),
+            (RoadmapStep, bulk_roadmap_steps, [step.id for step in steps[2:]]),
+        ]:
+            with CaptureQueriesContext(connection) as captured:
+                delete(self.user, 'delete', ids)
+            queries.append(len(captured))
+        self.assertEqual(len(set(queries)), 1, queries)
+        self.assertEqual(Task.objects.filter(user=self.user).count() + RoadmapStep.objects.filter(user=self.user).count(), 0)
+        self.assertEqual(SearchDocument.objects.filter(user=self.user).count(), 0)
+        self.assertEqual(SearchDocument.objects.filter(user=self.other).count(), 1)
+        self.others_task.delete()  # Outside a bulk delete the post_delete handler unindexes as usual
+        self.assertFalse(SearchDocument.objects.filter(user=self.other).exists())
+
+
+class RecurrenceTests(TestCase):
+    """Rules expand to the right dates in any window, and exceptions cancel or move single occurrences."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('learner', password='pw')
+
+    def rule(self, frequency, starts_on, **fields):
+        return ScheduleRule.objects.create(
+            user=self.user, task='Practice', time=time(19), frequency=frequency, starts_on=starts_on, **fields
+        )
+
+    def dates(self, rule, start, end):
+        return list(occurrence_dates(rule, start, end))
+
+    def test_daily(self):
+        rule = self.rule(ScheduleRule.DAILY, date(2026, 1, 1), interval=3, ends_on=date(2026, 1, 16))
+        self.assertEqual(self.dates(rule, date(2026, 1, 5), date(2026, 1, 12)), [date(2026, 1, 7), date(2026, 1, 10)])
+        self.assertEqual(self.dates(rule, date(2026, 1, 14), date(2026, 2, 1)), [date(2026, 1, 16)])
+        self.assertEqual(self.dates(rule, date(2025, 12, 1), date(2025, 12, 31)), [])
+        self.assertTrue(occurs_on(rule, date(2026, 1, 4)))
+        self.assertFalse(occurs_on(rule, date(2026, 1, 5)))
+
+    def test_weekly(self):
+        # Mondays and Wednesdays every other week, starting on a Wednesday
+        rule = self.rule(ScheduleRule.WEEKLY, date(2026, 1, 7), interval=2, weekdays=0b101)
+        self.assertEqual(self.dates(rule, date(2026, 1, 1), date(2026, 2, 4)), [
+            date(2026, 1, 7), date(2026, 1, 19), date(2026, 1, 21), date(2026, 2, 2), date(2026, 2, 4),
+        ])
+        self.assertEqual(self.dates(rule, date(2026, 1, 20), date(2026, 2, 3)), [date(2026, 1, 21), date(2026, 2, 2)])
+        self.assertEqual(self.dates(rule, date(2026, 1, 26), date(2026, 2, 1)), [])  # An off week
+        weekly = self.rule(ScheduleRule.WEEKLY, date(2026, 1, 7))  # No weekdays: the start date's weekday
+        self.assertEqual(self.dates(weekly, date(2026, 1, 1), date(2026, 1, 21)),
+                         [date(2026, 1, 7), date(2026, 1, 14), date(2026, 1, 21)])
+
+    def test_monthly(self):
+        rule = self.rule(ScheduleRule.MONTHLY, date(2026, 1, 31))
+        self.assertEqual(self.dates(rule, date(2026, 1, 1), date(2026, 8, 31)), [
+            date(2026, 1, 31), date(2026, 3, 31), date(2026, 5, 31), date(2026, 7, 31), date(2026, 8, 31),
+        ])  # Months without a 31st are skipped, not moved
+        every_other = self.rule(ScheduleRule.MONTHLY, date(2026, 1, 31), interval=2, ends_on=date(2027, 1, 30))
+        self.assertEqual(self.dates(every_other, date(2026, 2, 1), date(2027, 12, 31)),
+                         [date(2026, 3, 31), date(2026, 5, 31), date(2026, 7, 31)])
+        mid_month = self.rule(ScheduleRule.MONTHLY, date(2025, 11, 15), interval=3)
+        self.assertEqual(self.dates(mid_month, date(2026, 2, 16), date(2026, 8, 15)), [date(2026, 5, 15), date(2026, 8, 15)])
+
+    def test_exceptions(self):
+        rule = self.rule(ScheduleRule.DAILY, date(2026, 1, 1))
+        Schedule.objects.create(user=self.user, date=date(2026, 1, 9), time=time(8), task='One-off')
+        ScheduleException.objects.bulk_create([
+            ScheduleException(rule=rule, date=date(2026, 1, 6), cancelled=True),
+            ScheduleException(rule=rule, date=date(2026, 1, 7), new_date=date(2026, 1, 9), new_time=time(7),
+                              new_task='Moved'),
+            ScheduleException(rule=rule, date=date(2026, 1, 2), new_date=date(2026, 1, 10)),  # Moved into the window
+            ScheduleException(rule=rule, date=date(2026, 1, 8), new_date=date(2026, 1, 20)),  # Moved out of it
+            ScheduleException(rule=rule, date=date(2025, 12, 31), new_date=date(2026, 1, 10)),  # Not an occurrence
+        ])
+        occurrences = expand_occurrences(self.user, date(2026, 1, 5), date(2026, 1, 10))
+        self.assertEqual([(o['date'].day, o['time'].hour, o['task'], o.get('original_date')) for o in occurrences], [
+            (5, 19, 'Practice', None),
+            (9, 7, 'Moved', date(2026, 1, 7)),
+            (9, 8, 'One-off', None),
+            (9, 19, 'Practice', None),
+            (10, 19, 'Practice', None),
+            (10, 19, 'Practice', date(2026, 1, 2)),
+        ])
+
+
+@override_settings(SKILL_PROFICIENCY_HOURS=(1, 3))
+class SkillTimeTests(TestCase):
+    """Session writes keep UserSkill time and proficiency current and refresh the dashboard."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('learner', password='pw')
+        profile = UserProfile.objects.create(user=self.user, role='student')
+        self.skill = Skill.objects.create(name='Go', level='beginner')
+        self.user_skill = UserSkill.objects.create(userprofile=profile, skill=self.skill)
+
+    def log(self, minutes):
+        return LearningSession.objects.create(user=self.user, skill=self.skill, duration=timedelta(minutes=minutes))
+
+    def dashboard_skill(self):
+        (skill,) = get_dashboard_snapshot(self.user)['skills']
+        return skill['time_spent'], skill['proficiency_level']
+
+    def test_time_and_proficiency(self):
+        self.log(30)
+        self.assertEqual(self.dashboard_skill(), (timedelta(minutes=30), 1))
+        last = self.log(30)  # Exactly one hour reaches the first threshold
+        self.assertEqual(self.dashboard_skill(), (timedelta(hours=1), 2))
+        self.log(150)
+        self.assertEqual(self.dashboard_skill(), (timedelta(minutes=210), 3))
+        last.delete()
+        self.assertEqual(self.dashboard_skill(), (timedelta(minutes=180), 3))
+        LearningSession.objects.filter(user=self.user).first().delete()
+        self.assertEqual(self.dashboard_skill(), (timedelta(minutes=150), 2))
+
+    def test_reconcile(self):
+        LearningSession.objects.bulk_create(  # No signals: time_spent drifts
+            [LearningSession(user=self.user, skill=self.skill, duration=timedelta(minutes=45)) for _ in range(2)]
+        )
+        self.assertEqual(self.dashboard_skill(), (timedelta(0), 1))
+        self.assertEqual(reconcile_skill_time(), 1)
+        self.assertEqual(self.dashboard_skill(), (timedelta(minutes=90), 2))
+        self.assertEqual(reconcile_skill_time(), 0)
+
+
+class PomodoroSessionTests(TestCase):
+    """Pomodoro sessions can only be recorded against skills on the user's own profile."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('learner', password='pw')
+        profile = UserProfile.objects.create(user=self.user, role='student')
+        self.skill = Skill.objects.create(name='Rust', level='beginner')
+        self.unlinked = Skill.objects.create(name='Cobol', level='beginner')
+        UserSkill.objects.create(userprofile=profile, skill=self.skill)
+        self.client.force_login(self.user)
+
+    def test_page_lists_own_skills(self):
+        response = self.client.get('/pomodoro/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['skills']), [self.skill])
+
+    def test_post_with_skill(self):
+        response = self.client.post('/pomodoro/', {'duration': 25, 'skill_id': self.skill.pk, 'notes': 'ch. 4'})
+        self.assertEqual(response.json(), {
+            'status': 'success', 'points_earned': 25 * POINTS_PER_MINUTE, 'total_points': 25 * POINTS_PER_MINUTE,
+        })
+        session = LearningSession.objects.get(user=self.user)
+        self.assertEqual((session.skill, session.duration, session.notes), (self.skill, timedelta(minutes=25), 'ch. 4'))
+        response = self.client.post('/pomodoro/', {'duration': 25, 'skill_id': self.unlinked.pk})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(LearningSession.objects.count(), 1)
+
+    def test_batch_rejects_bad_skill_ids(self):
+        response = self.client.post('/pomodoro/batch/', [
+            {'duration': 25, 'skill_id': self.skill.pk},
+            {'duration': 25, 'skill_id': [self.skill.pk]},
+            {'duration': 25, 'skill_id': {'id': self.skill.pk}},
+            {'duration': 25, 'skill_id': self.unlinked.pk},
+            {'duration': 25, 'skill_id': True},
+            {'duration': 25, 'skill_id': None},
+        ], content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        message = 'skill_id must be the id of one of your skills.'
+        self.assertEqual(response.json()['errors'], {'1': message, '2': message, '3': message, '4': message})
+        self.assertFalse(LearningSession.objects.exists())
+
+    def test_timer_rejects_bad_skill_ids(self):
+        for skill_id in ([self.skill.pk], {'id': self.skill.pk}, self.unlinked.pk, True, str(self.skill.pk)):
+            with self.subTest(skill_id=skill_id):
+                response = self.client.post('/pomodoro/timer/', {'action': 'start', 'skill_id': skill_id},
+                                            content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['message'], 'skill_id must be the id of one of your skills.')
+        self.assertFalse(PomodoroTimer.objects.exists())
+        response = self.client.post('/pomodoro/timer/', {'action': 'start', 'skill_id': self.skill.pk},
+                                    content_type='application/json')
+        self.assertEqual(response.json()['skill_id'], self.skill.pk)
+
+
+class ProgressChartTests(TestCase):
+    """The XP curve counts compacted and pending awards on the day they were made and ends at the live balance."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('learner', password='pw')
+        UserProfile.objects.create(user=self.user, role='student', points=100)
+
+    def award(self, amount, days_ago):
+        entry = award_points(self.user, amount, 'task')
+        PointsLedgerEntry.objects.filter(pk=entry.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+
+    def test_xp_curve(self):
+        self.award(10, 3)
+        self.award(5, 200)
+        compact_ledger()  # Now in DailyStats; the 200-day-old award is before the window
+        self.award(20, 200)  # Pending and before the window: part of the starting balance
+        self.award(7, 1)
+        self.award(3, 0)
+        xp = chart_spec(self.user, 'xp')['data'][0]
+        self.assertEqual(len(xp['y']), CHART_DAYS)
+        self.assertEqual(xp['x'][-1], timezone.localdate().isoformat())
+        self.assertEqual(xp['y'][0], 125)
+        self.assertEqual(xp['y'][-5:], [125, 135, 135, 142, 145])
+        self.assertEqual(xp['y'][-1], get_points(self.user))
+
+    def test_chart_key(self):
+        key = chart_key(chart_spec(self.user, 'xp'), 'png')
+        self.assertEqual(chart_key(chart_spec(self.user, 'xp'), 'png'), key)
+        self.assertNotEqual(chart_key(chart_spec(self.user, 'xp'), 'svg'), key)
+        self.award(1, 0)
+        self.assertNotEqual(chart_key(chart_spec(self.user, 'xp'), 'png'), key)
+
+
+class StaticAssetTests(TestCase):
+    """CSS purging and minifying, pre-compressed variants and serve_static's negotiation and caching headers."""
+
+    CSS = """/* header */ @charset "utf-8";
+        .used { color: red }
+        .unused { color: blue }
+        .used, .gone a { margin: 0 }
+        @media (min-width: 1px) { .unused { a: b } .used:hover { a: b } }
+        @media print { .unused { a: b } }
+        @font-face { font-family: 'Keep'; src: url(keep.woff) }
+        @font-face { font-family: 'Drop'; src: url(drop.woff) }
+        .used { font-family: Keep; animation: spin 1s }
+        @keyframes spin { to { opacity: 0 } }
+        @keyframes fade { to { opacity: 0 } }
+        .alert-danger { color: red }
+        .used::before { content: "a  /* kept */ ;  b" }
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name) / 'static'
+        self.root.mkdir()
+        override = override_settings(STATIC_ROOT=self.root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_purge_and_minify(self):
+        self.assertEqual(minify_css(purge_css(self.CSS, {'used'})), (
+            '.used{color:red}.used{margin:0}@media (min-width: 1px){.used:hover{a:b}}'
+            "@font-face{font-family:'Keep';src:url(keep.woff)}.used{font-family:Keep;animation:spin 1s}"
+            '@keyframes spin{to{opacity:0}}.alert-danger{color:red}.used::before{content:"a  /* kept */ ;  b"}'
+        ))
+        self.assertEqual(minify_css('.a  >  .b ,  .c :hover {\n  color: red ;\n}'), '.a>.b,.c :hover{color:red}')
+
+    def test_compressed_variants(self):
+        storage = CompressedManifestStaticFilesStorage(location=self.root)
+        (self.root / 'big.css').write_text('.used { color: red }\n' * 100)
+        (self.root / 'small.css').write_text('.a{}')
+        storage._write_compressed('big.css')
+        storage._write_compressed('small.css')
+        self.assertEqual(gzip.decompress((self.root / 'big.css.gz').read_bytes()), (self.root / 'big.css').read_bytes())
+        self.assertFalse((self.root / 'small.css.gz').exists())
+
+    def _get(self, path, encoding=None):
+        headers = {'Accept-Encoding': encoding} if encoding is not None else {}
+        response = views.serve_static(RequestFactory().get(f'/static/{path}', headers=headers), path)
+        response.body = b''.join(response.streaming_content)
+        response.close()
+        return response
+
+    def test_negotiates_encoding(self):
+        for name, data in [('app.0123456789ab.css', b'plain'), ('app.0123456789ab.css.gz', b'gz'),
+                           ('app.0123456789ab.css.br', b'br'), ('site.css', b'plain'), ('site.css.gz', b'gz')]:
+            (self.root / name).write_bytes(data)
+        for path, accepted, body, encoding in [
+            ('app.0123456789ab.css', 'gzip, deflate, br', b'br', 'br'),
+            ('app.0123456789ab.css', 'gzip', b'gz', 'gzip'),
+            ('app.0123456789ab.css', None, b'plain', None),
+            ('site.css', 'br, gzip', b'gz', 'gzip'),  # No .br variant
+        ]:
+            with self.subTest(path=path, accepted=accepted):
+                response = self._get(path, accepted)
+                self.assertEqual(response.body, body)
+                self.assertEqual(response.get('Content-Encoding'), encoding)
+                self.assertEqual(response['Content-Type'], 'text/css')
+                self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_cache_control(self):
+        (self.root / 'app.0123456789ab.css').write_bytes(b'plain')
+        (self.root / 'site.css').write_bytes(b'plain')
+        self.assertEqual(self._get('app.0123456789ab.css')['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(self._get('site.css')['Cache-Control'], 'no-cache')
+
+    def test_missing_and_traversal(self):
+        (self.root.parent / 'outside.txt').write_bytes(b'secret')
+        with self.assertRaises(Http404):
+            self._get('missing.css')
+        with self.assertRaises(SuspiciousFileOperation):
+            self._get('../outside.txt')
+
+
+class ImageProcessingTests(TestCase):
+    """Profile picture thumbnails, the avatar and responsive_image srcsets, and the optimize_images command."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        override = override_settings(MEDIA_ROOT=self.tmp / 'media')
+        override.enable()
+        self.addCleanup(override.disable)
+        self.profile = UserProfile.objects.create(user=User.objects.create_user('learner'), role='student')
+
+    def _upload(self, image, name='profile_pics/upload.png'):
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG')
+        name = default_storage.save(name, io.BytesIO(buffer.getvalue()))
+        UserProfile.objects.filter(pk=self.profile.pk).update(profile_picture=name)
+        return name
+
+    def _open(self, name):
+        with default_storage.open(name) as stored:
+            image = Image.open(stored)
+            image.load()
+        return image
+
+    def test_profile_picture_thumbnails(self):
+        upload = self._upload(Image.new('RGB', (2000, 1000), 'red'))
+        processed = process_profile_picture(self.profile.pk)
+        self.assertEqual(processed, 'profile_pics/n/upload.jpg')
+        self.assertEqual(UserProfile.objects.get(pk=self.profile.pk).profile_picture.name, processed)
+        self.assertFalse(default_storage.exists(upload))
+        picture = self._open(processed)
+        self.assertEqual((picture.format, picture.size), ('JPEG', (MAX_PICTURE_SIDE, MAX_PICTURE_SIDE // 2)))
+        for size in AVATAR_SIZES:
+            for ext, fmt in (('jpg', 'JPEG'), ('webp', 'WEBP')):
+                thumbnail = self._open(f'profile_pics/n/upload-{size}.{ext}')
+                self.assertEqual((thumbnail.format, thumbnail.size), (fmt, (size, size)))
+        self.assertIsNone(process_profile_picture(self.profile.pk))  # Already processed
+
+    def test_transparent_picture_stays_png(self):
+        self._upload(Image.new('RGBA', (60, 60), (0, 0, 255, 128)))
+        processed = process_profile_picture(self.profile.pk)
+        self.assertEqual(processed, 'profile_pics/n/upload.png')
+        self.assertEqual(self._open(processed).mode, 'RGBA')
+        self.assertEqual(self._open('profile_pics/n/upload-192.png').size, (192, 192))
+
+    def test_unreadable_picture_is_discarded(self):
+        name = default_storage.save('profile_pics/broken.png', io.BytesIO(b'not an image'))
+        UserProfile.objects.filter(pk=self.profile.pk).update(profile_picture=name)
+        with self.assertLogs('tracker.images', 'WARNING'):
+            self.assertIsNone(process_profile_picture(self.profile.pk))
+        self.assertEqual(UserProfile.objects.get(pk=self.profile.pk).profile_picture.name, '')
+        self.assertFalse(default_storage.exists(name))
+
+    def test_avatar_srcset(self):
+        self.assertEqual(avatar(''), '')
+        self.assertEqual(
+            avatar('profile_pics/upload.png', 40, 'me'),
+            '<img src="/media/profile_pics/upload.png" width="40" height="40" alt="me" loading="lazy" style="object-fit: cover">',
+        )
+        html = avatar('profile_pics/n/me.jpg', 48)
+        self.assertIn('<source type="image/webp" srcset="/media/profile_pics/n/me-48.webp 1x, /media/profile_pics/n/me-96.webp 2x">', html)
+        self.assertIn('src="/media/profile_pics/n/me-48.jpg" srcset="/media/profile_pics/n/me-48.jpg 1x, /media/profile_pics/n/me-96.jpg 2x"', html)
+        self.assertIn('srcset="/media/profile_pics/n/me-192.webp 1x, /media/profile_pics/n/me-192.webp 2x"', avatar('profile_pics/n/me.jpg', 150))
+
+    def test_optimize_images_and_responsive_image(self):
+        source_dir, optimized_dir = self.tmp / 'images', self.tmp / 'images' / 'optimized'
+        source_dir.mkdir()
+        Image.new('RGB', (800, 400), 'green').save(source_dir / 'wide.jpg')
+        Image.new('RGBA', (100, 100), (0, 0, 0, 0)).save(source_dir / 'icon.png')
+        (source_dir / 'broken.png').write_bytes(b'not an image')
+        self._upload(Image.new('RGB', (50, 50)))
+        self.addCleanup(static_manifest.cache_clear)
+        out, err = io.StringIO(), io.StringIO()
+        with mock.patch.multiple('tracker.images', STATIC_IMAGES_DIR=source_dir, OPTIMIZED_DIR=optimized_dir,
+                                 MANIFEST_PATH=optimized_dir / 'manifest.json', ProcessPoolExecutor=ThreadPoolExecutor), \
+                mock.patch.multiple('tracker.management.commands.optimize_images',
+                                    STATIC_IMAGES_DIR=source_dir, OPTIMIZED_DIR=optimized_dir):
+            call_command('optimize_images', '--profiles', stdout=out, stderr=err)
+            manifest = static_manifest()
+            html = responsive_image('images/wide.jpg', alt='wide', sizes='50vw', **{'class': 'hero'})
+        self.assertIn('2 static images optimized, 1 skipped.', out.getvalue())
+        self.assertIn('1 profile pictures processed.', out.getvalue())
+        self.assertIn('Skipped broken.png', err.getvalue())
+        self.assertEqual(
+            [(v['name'], v['type']) for v in manifest['images/icon.png']['variants']],
+            [('icon-100.webp', 'image/webp'), ('icon-100.png', 'image/png')],
+        )
+        self.assertEqual([v['width'] for v in manifest['images/wide.jpg']['variants']], [320, 320, 640, 640, 800, 800])
+        self.assertEqual(Image.open(optimized_dir / 'wide-320.webp').size, (320, 160))
+        self.assertIn(
+            'srcset="/static/images/optimized/wide-320.webp 320w, /static/images/optimized/wide-640.webp 640w, '
+            '/static/images/optimized/wide-800.webp 800w" sizes="50vw"', html,
+        )
+        self.assertIn('src="/static/images/optimized/wide-800.jpg"', html)
+        self.assertIn('width="800" height="400" alt="wide" loading="lazy" decoding="async" class="hero">', html)
+
+    def test_responsive_image_without_variants(self):
+        with mock.patch('tracker.templatetags.tracker_images.static_manifest', return_value={}):
+            self.assertEqual(
+                responsive_image('images/logo.png', alt='Logo', loading='eager'),
+                '<img src="/static/images/logo.png" alt="Logo" loading="eager">',
+            )
+
+
+@skipUnless(connection.vendor == 'sqlite', 'PRAGMAs are SQLite syntax')
+class SqliteTuningTests(TestCase):
+    """New SQLite connections get the tuning PRAGMAs, with settings.SQLITE_PRAGMAS taking precedence."""
+
+    SYNCHRONOUS = {'off': 0, 'normal': 1, 'full': 2, 'extra': 3}
+
+    def _pragmas(self):
+        # The test database lives in memory, where journal_mode can't be WAL, so open a file
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_dict = {**connection.settings_dict, 'NAME': os.path.join(tmp.name, 'db.sqlite3')}
+        wrapper = type(connections['default'])(settings_dict, 'tuning')
+        self.addCleanup(wrapper.close)
+        with wrapper.cursor() as cursor:
+            return {
+                name: cursor.execute(f'PRAGMA {name}').fetchone()[0]
+                for name in ('journal_mode', 'synchronous', 'busy_timeout')
+            }
+
+    def test_defaults(self):
+        self.assertEqual(self._pragmas(), {
+            'journal_mode': PRAGMAS['journal_mode'],
+            'synchronous': self.SYNCHRONOUS[PRAGMAS['synchronous']],
+            'busy_timeout': PRAGMAS['busy_timeout'],
+        })
+
+    @override_settings(SQLITE_PRAGMAS={'synchronous': 'full', 'busy_timeout': 250})
+    def test_settings_override(self):
+        self.assertEqual(self._pragmas(), {'journal_mode': 'wal', 'synchronous': 2, 'busy_timeout': 250})
@@ -0,0 +1,218 @@
+import asyncio
+import json
+import time
+from datetime import timedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from .models import PomodoroTimer
+from .pomodoro import MAX_SESSION_MINUTES, ingest_sessions
+from .skills import linked_skill_ids
+
+# Server-Side Pomodoro Timer
+#
+# The server owns the timer, so it survives reloads and is shared by every tab.
+# A timer row stores only timestamps (start, end, pause); the time left is
+# derived from the clock whenever it is read. timer_events() streams a timer as
+# Server-Sent Events from an async view: each connection is a coroutine that
+# sleeps until the next tick, so a timer costs no polling requests. Ticks only
+# read a per-user version counter from the cache, and the database is re-read
+# only after start/pause/resume/cancel bump it. When a timer runs out, the
+# stream that sees it (or get_timer() on the next read, or the
+# complete_pomodoro_timers command for clients that never return) records the
+# LearningSession. The conditional UPDATE in complete_timer() makes sure only
+# one of them does.
+
+TIMER_ACTIONS = ('start', 'pause', 'resume', 'cancel')
+DEFAULT_MINUTES = 25
+TICK_SECONDS = getattr(settings, 'POMODORO_TICK_SECONDS', 1)
+HEARTBEAT_SECONDS = 15  # Keeps proxies from closing the stream of a paused timer
+RETRY_MS = 5000
+
+
+def _version_key(user_id):
+    return f'pomodoro:{user_id}:version'
+
+
+def _bump_version(user_id):
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), time.time_ns(), None)
+
+
+def timer_state(timer, now=None):
+    """Return the JSON-ready state of a timer (or of no timer)."""
+    if timer is None:
+        return {'status': 'idle'}
+    now = now or timezone.now()
+    if timer.completed_at:
+        status, remaining = 'completed', timedelta(0)
+    elif timer.paused_at:
+        status, remaining = 'paused', timer.ends_at - timer.paused_at
+    else:
+        status, remaining = 'running', max(timer.ends_at - now, timedelta(0))
+    return {
+        'status': status,
+        'remaining': round(remaining.total_seconds()),
+        'duration': round(timer.duration.total_seconds()),
+        'started_at': timer.started_at.isoformat(),
+        'ends_at': timer.ends_at.isoformat(),
+        'completed_at': timer.completed_at.isoformat() if timer.completed_at else None,
+        'skill_id': timer.skill_id,
+    }
+
+
+def parse_timer_request(user, body):
+    """
+    Validate a timer request body ({action, minutes?, skill_id?, notes?}).
+
+    Returns (action, params); raises ValueError with a user-facing message.
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise ValueError('Request body must be JSON.') from None
+    if not isinstance(payload, dict):
+        raise ValueError('Expected a JSON object.')
+    action = payload.get('action')
+    if action not in TIMER_ACTIONS:
+        raise ValueError(f"action must be one of {', '.join(TIMER_ACTIONS)}.")
+    if action != 'start':
+        return action, {}
+    minutes = payload.get('minutes', DEFAULT_MINUTES)
+    if not isinstance(minutes, int) or isinstance(minutes, bool) or not 0 < minutes <= MAX_SESSION_MINUTES:
+        raise ValueError(f'minutes must be a whole number between 1 and {MAX_SESSION_MINUTES}.')
+    skill_id = payload.get('skill_id')
+    if skill_id is not None and (
+        not isinstance(skill_id, int) or isinstance(skill_id, bool) or skill_id not in linked_skill_ids(user)
+    ):
+        raise ValueError('skill_id must be the id of one of your skills.')
+    return action, {'minutes': minutes, 'skill_id': skill_id, 'notes': str(payload.get('notes', ''))}
+
+
+def complete_timer(timer, now=None):
+    """Record the session of a timer that has run out; return the ingest summary, or None if already done."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        claimed = PomodoroTimer.objects.filter(
+            pk=timer.pk, completed_at__isnull=True, paused_at__isnull=True, ends_at__lte=now,
+        ).update(completed_at=timer.ends_at)
+        if not claimed:
+            return None
+        timer.completed_at = timer.ends_at
+        summary = ingest_sessions(timer.user, [{
+            'skill_id': timer.skill_id, 'duration': timer.duration, 'notes': timer.notes, 'date': timer.ends_at,
+        }])
+    _bump_version(timer.user_id)
+    return summary
+
+
+def complete_due_timers(now=None):
+    """Record the sessions of every timer that ran out with no client watching; return how many."""
+    now = now or timezone.now()
+    due = PomodoroTimer.objects.filter(
+        completed_at__isnull=True, paused_at__isnull=True, ends_at__lte=now,
+    ).select_related('user')
+    return sum(complete_timer(timer, now) is not None for timer in due)
+
+
+def get_timer(user):
+    """Return the user's timer (completing it first if it has run out), or None."""
+    timer = PomodoroTimer.objects.filter(user=user).select_related('user').first()
+    if timer and not timer.completed_at and not timer.paused_at and timer.ends_at <= timezone.now():
+        complete_timer(timer)
+    return timer
+
+
+def start_timer(user, minutes=DEFAULT_MINUTES, skill_id=None, notes=''):
+    """Start a new timer, replacing a finished one; raise ValueError if one is still active."""
+    timer = get_timer(user)
+    if timer and not timer.completed_at:
+        raise ValueError('A timer is already active; cancel it first.')
+    now = timezone.now()
+    duration = timedelta(minutes=minutes)
+    timer, _ = PomodoroTimer.objects.update_or_create(user=user, defaults={
+        'skill_id': skill_id, 'notes': notes, 'duration': duration,
+        'started_at': now, 'ends_at': now + duration, 'paused_at': None, 'completed_at': None,
+    })
+    _bump_version(user.pk)
+    return timer
+
+
+def pause_timer(user):
+    """Freeze the user's running timer."""
+    timer = get_timer(user)
+    if not timer or timer.completed_at or timer.paused_at:
+        raise ValueError('No running timer.')
+    now = timezone.now()
+    if not PomodoroTimer.objects.filter(pk=timer.pk, paused_at__isnull=True, ends_at__gt=now).update(paused_at=now):
+        raise ValueError('No running timer.')  # Ran out or was paused elsewhere in the meantime
+    timer.paused_at = now
+    _bump_version(user.pk)
+    return timer
+
+
+def resume_timer(user):
+    """Restart a paused timer, moving its end back by the time spent paused."""
+    timer = get_timer(user)
+    if not timer or timer.completed_at or not timer.paused_at:
+        raise ValueError('No paused timer.')
+    ends_at = timer.ends_at + (timezone.now() - timer.paused_at)
+    if not PomodoroTimer.objects.filter(pk=timer.pk, paused_at=timer.paused_at).update(ends_at=ends_at, paused_at=None):
+        raise ValueError('No paused timer.')
+    timer.ends_at, timer.paused_at = ends_at, None
+    _bump_version(user.pk)
+    return timer
+
+
+def cancel_timer(user):
+    """Discard the user's active timer without recording a session."""
+    if not PomodoroTimer.objects.filter(user=user, completed_at__isnull=True).delete()[0]:
+        raise ValueError('No active timer.')
+    _bump_version(user.pk)
+
+
+TIMER_HANDLERS = {'start': start_timer, 'pause': pause_timer, 'resume': resume_timer, 'cancel': cancel_timer}
+
+
+def _event(name, data):
+    return f'event: {name}\ndata: {json.dumps(data)}\n\n'
+
+
+async def timer_events(user, tick=TICK_SECONDS):
+    """
+    Yield Server-Sent Events for the user's timer: a ``state`` event, ``tick`` events
+    while it runs, ``state`` again after every change, then ``complete`` (with the
+    points earned) or a final ``state`` once there is nothing left to watch.
+    """
+    version = await cache.aget(_version_key(user.pk))
+    timer = await PomodoroTimer.objects.filter(user=user).select_related('user').afirst()
+    yield f'retry: {RETRY_MS}\n' + _event('state', timer_state(timer))
+    quiet = 0
+    while timer and not timer.completed_at:
+        if timer.paused_at:
+            await asyncio.sleep(tick)
+        else:
+            remaining = (timer.ends_at - timezone.now()).total_seconds()
+            if remaining <= 0:
+                summary = await sync_to_async(complete_timer)(timer)
+                if summary is not None:
+                    yield _event('complete', {**timer_state(timer), **summary})
+                    return
+                remaining = tick  # Completed elsewhere; the version bump is picked up below
+            await asyncio.sleep(min(tick, remaining))
+        latest = await cache.aget(_version_key(user.pk))
+        if latest != version:
+            version = latest
+            timer = await PomodoroTimer.objects.filter(user=user).select_related('user').afirst()
+            yield _event('state', timer_state(timer))
+        elif timer.paused_at:
+            quiet += tick
+            if quiet >= HEARTBEAT_SECONDS:
+                quiet = 0
+                yield ': keep-alive\n\n'
+        elif timer.ends_at > timezone.now():  # Otherwise the next pass sends "complete" instead
+            yield _event('tick', {'remaining': round((timer.ends_at - timezone.now()).total_seconds())})
@@ -1,11 +1,46 @@
-from django.shortcuts import render, redirect
+from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
-from django.http import JsonResponse
-from datetime import datetime, timedelta
-from .models import UserProfile, Skill, Schedule, Task, RoadmapStep, Badge, Quote, Video, LearningSession, DailyActivity
-from .forms import RegistrationForm, SkillForm, ScheduleForm, TaskForm, DailyActivityForm
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.core.paginator import Paginator
+from django.views.decorators.http import require_POST
+from django.conf import settings
+from django.utils._os import safe_join
+from asgiref.sync import sync_to_async
+import json
+import mimetypes
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from django.utils import timezone
+from .models import UserProfile, Skill, ScheduleRule, ScheduleException, Task, RoadmapStep, LearningSession, DailyActivity
+from .forms import (
+    RegistrationForm, SkillForm, ScheduleForm, ScheduleRuleForm, ScheduleExceptionForm, TaskForm, DailyActivityForm,
+)
+from .points import award_points, get_points
+from .badges import award_badges
+from .dashboard import get_dashboard_snapshot, invalidate_dashboard
+from .quotes import get_quote_ids, get_quotes, quote_of_the_day
+from .catalog import CATALOG_PAGE_SIZE, get_catalog
+from .leaderboard import top_learners, window_leaders, rank_of
+from .analytics import learning_analytics
+from .charts import CHART_BUILDERS, CHART_HEIGHT, CHART_WIDTH, IMAGE_FORMATS, chart_key, chart_spec, render_images, renderer_available
+from .stats import get_learning_stats, record_daily_stats
+from .pomodoro import POINTS_PER_MINUTE, validate_sessions, ingest_sessions
+from .export import EXPORT_TYPES, export_stream
+from .timer import TIMER_HANDLERS, get_timer, parse_timer_request, timer_events, timer_state
+from .bulk import (
+    TASK_POINTS, ROADMAP_STEP_POINTS, TASK_ACTIONS, ROADMAP_ACTIONS,
+    parse_bulk_request, bulk_tasks, bulk_roadmap_steps,
+)
+from .recurrence import calendar_window, weekly_calendar, occurs_on
+from .search import SEARCH_LIMIT, search
+from .images import schedule_profile_picture
+from .pagination import PAGE_SIZE, MAX_PAGE_SIZE, task_page, roadmap_page
+from .middleware import profiling_snapshot, reset_profiling
+from .routers import replica_reads
+from .storage import HASHED_NAME
 
 # User Authentication Views
 def register(request):
@@ -55,33 +90,25 @@ def profile(request):
         profile_picture = request.FILES.get('profile_picture')
         profile.bio = bio
         profile.role = role
+        replaced = profile.profile_picture.name
         if profile_picture:
             profile.profile_picture = profile_picture
-        profile.save()
+        profile.save(update_fields=['bio', 'role', 'profile_picture'])  # Never overwrite points
+        if profile_picture:
+            schedule_profile_picture(profile.pk, replaced)  # Thumbnails are made off the request path
         messages.success(request, 'Profile updated successfully.')
         return redirect('dashboard')
-    return render(request, 'tracker/profile.html', {'profile': profile})
+    return render(request, 'profile.html', {'profile': profile})
 
 # Dashboard View
 @login_required
+@replica_reads
 def dashboard(request):
     """Display user dashboard with skills, tasks, schedules, badges, and daily activities."""
-    skills = Skill.objects.filter(user=request.user)
-    tasks = Task.objects.filter(user=request.user, completed=False)
-    schedules = Schedule.objects.filter(user=request.user, date__gte=datetime.now().date())
-    badges = UserBadge.objects.filter(user=request.user)
-    quote = Quote.objects.order_by('?').first()  # Random quote
-    activities = DailyActivity.objects.filter(user=request.user, date=datetime.now().date())
-    
-    context = {
-        'skills': skills,
-        'tasks': tasks,
-        'schedules': schedules,
-        'badges': badges,
-        'quote': quote,
-        'activities': activities,
-    }
-    return render(request, 'tracker/dashboard.html', context)
+    context = dict(get_dashboard_snapshot(request.user))  # Cached; see tracker/dashboard.py
+    context['quote'] = quote_of_the_day(request.user)  # Same quote all day, fetched by primary key
+    context['stats'] = get_learning_stats(request.user)  # Streaks and lifetime totals
+    return render(request, 'dashboard.html', context)
 
 # Home Page View
 def home(request):
@@ -102,7 +129,7 @@ def add_skill(request):
             return redirect('dashboard')
     else:
         form = SkillForm()
-    return render(request, 'tracker/add_skill.html', {'form': form})
+    return render(request, 'add_skill.html', {'form': form})
 
 @login_required
 def edit_skill(request, skill_id):
@@ -116,7 +143,7 @@ def edit_skill(request, skill_id):
             return redirect('dashboard')
     else:
         form = SkillForm(instance=skill)
-    return render(request, 'tracker/edit_skill.html', {'form': form})
+    return render(request, 'edit_skill.html', {'form': form})
 
 @login_required
 def delete_skill(request, skill_id):
@@ -126,29 +153,57 @@ def delete_skill(request, skill_id):
         skill.delete()
         messages.success(request, 'Skill deleted successfully.')
         return redirect('dashboard')
-    return render(request, 'tracker/confirm_delete.html', {'item': skill, 'type': 'skill'})
+    return render(request, 'confirm_delete.html', {'item': skill, 'type': 'skill'})
 
 # Learning Tracker & Scheduler Views
 @login_required
 def schedule(request):
-    """Create and view daily/weekly schedules."""
+    """Create one-off or recurring schedule slots and show the next 7 days."""
+    form, rule_form = ScheduleForm(), ScheduleRuleForm()
     if request.method == 'POST':
-        form = ScheduleForm(request.POST)
-        if form.is_valid():
-            schedule = form.save(commit=False)
-            schedule.user = request.user
-            schedule.save()
+        recurring = 'frequency' in request.POST
+        if recurring:
+            rule_form = ScheduleRuleForm(request.POST)
+        else:
+            form = ScheduleForm(request.POST)
+        submitted = rule_form if recurring else form
+        if submitted.is_valid():
+            slot = submitted.save(commit=False)
+            slot.user = request.user
+            slot.save()
             messages.success(request, 'Schedule created successfully.')
             return redirect('dashboard')
+    days = calendar_window(request.user)
+    return render(request, 'schedule.html', {'form': form, 'rule_form': rule_form, 'days': days})
+
+@login_required
+def schedule_calendar(request):
+    """Return the week containing ?week=YYYY-MM-DD (default this week) with recurring slots expanded, as JSON."""
+    try:
+        day = date.fromisoformat(request.GET['week']) if 'week' in request.GET else None
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'week must be YYYY-MM-DD.'}, status=400)
+    return JsonResponse({'days': weekly_calendar(request.user, day)})  # DjangoJSONEncoder writes ISO dates
+
+@login_required
+@require_POST
+def schedule_exception(request, rule_id):
+    """Cancel, move or rename one occurrence of a recurring slot."""
+    rule = get_object_or_404(ScheduleRule, id=rule_id, user=request.user)
+    form = ScheduleExceptionForm(request.POST)
+    if not form.is_valid():
+        messages.error(request, 'Please correct the schedule change.')
+    elif not occurs_on(rule, form.cleaned_data['date']):
+        messages.error(request, 'That date is not an occurrence of this schedule.')
     else:
-        form = ScheduleForm()
-    schedules = Schedule.objects.filter(user=request.user, date__gte=datetime.now().date())
-    return render(request, 'tracker/schedule.html', {'form': form, 'schedules': schedules})
+        fields = dict(form.cleaned_data)
+        ScheduleException.objects.update_or_create(rule=rule, date=fields.pop('date'), defaults=fields)
+        messages.success(request, 'Schedule updated.')
+    return redirect('schedule')
 
 @login_required
 def task_list(request):
-    """Display and manage user tasks."""
-    tasks = Task.objects.filter(user=request.user)
+    """Display and manage user tasks, a page at a time (?priority=, ?status=open|done, ?order=desc, ?cursor=)."""
     if request.method == 'POST':
         form = TaskForm(request.POST)
         if form.is_valid():
@@ -159,17 +214,30 @@ def task_list(request):
             return redirect('task_list')
     else:
         form = TaskForm()
-    return render(request, 'tracker/task_list.html', {'tasks': tasks, 'form': form})
+    priority = request.GET.get('priority')
+    try:
+        tasks, next_cursor = task_page(request.user, priority=priority, **_page_params(request))
+    except ValueError as exc:
+        return _page_error(request, exc)
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'results': [
+                {'id': t.id, 'title': t.title, 'priority': t.priority,
+                 'due_date': t.due_date and t.due_date.isoformat(), 'completed': t.completed}
+                for t in tasks
+            ],
+            'next': next_cursor,
+        })
+    return render(request, 'task_list.html', {'tasks': tasks, 'next_cursor': next_cursor, 'form': form})
 
 @login_required
 def mark_task_complete(request, task_id):
     """Mark a task as completed and award points."""
-    task = Task.objects.get(id=task_id, user=request.user)
-    task.completed = True
-    task.save()
-    profile = UserProfile.objects.get(user=request.user)
-    profile.points += 10  # Award 10 points for task completion
-    profile.save()
+    # Conditional UPDATE: only an open task flips to completed, so repeat clicks award nothing
+    if Task.objects.filter(id=task_id, user=request.user, completed=False).update(completed=True):
+        award_points(request.user, TASK_POINTS, 'task')
+        check_and_award_badges(request)
+        invalidate_dashboard(request.user.pk)  # QuerySet.update() sends no post_save signal
     messages.success(request, 'Task marked as completed.')
     return redirect('task_list')
 
@@ -180,53 +248,114 @@ def pomodoro_session(request):
         duration = int(request.POST.get('duration', 25))
         skill_id = request.POST.get('skill_id')
         notes = request.POST.get('notes', '')
-        skill = Skill.objects.get(id=skill_id, user=request.user) if skill_id else None
+        skill = get_object_or_404(Skill, id=skill_id, userskill__userprofile__user=request.user) if skill_id else None
         session = LearningSession.objects.create(
             user=request.user,
             skill=skill,
             duration=timedelta(minutes=duration),
             notes=notes
         )
-        profile = UserProfile.objects.get(user=request.user)
-        points_earned = duration * 2  # 2 points per minute
-        profile.points += points_earned
-        profile.save()
+        points_earned = duration * POINTS_PER_MINUTE  # 2 points per minute
+        award_points(request.user, points_earned, 'pomodoro')
+        total_points = get_points(request.user)
         # Check for badge eligibility
-        check_and_award_badges(request.user, profile.points)
+        check_and_award_badges(request, total_points)
         return JsonResponse({
             'status': 'success',
             'points_earned': points_earned,
-            'total_points': profile.points
+            'total_points': total_points
         })
-    skills = Skill.objects.filter(user=request.user)
-    return render(request, 'tracker/pomodoro.html', {'skills': skills})
+    skills = Skill.objects.filter(userskill__userprofile__user=request.user)  # Skills are shared; link via UserSkill
+    return render(request, 'pomodoro.html', {'skills': skills})
+
+@login_required
+@require_POST
+async def pomodoro_batch(request):
+    """Record a JSON array of finished Pomodoro sessions (e.g. queued by an offline client)."""
+    try:
+        items = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Request body must be JSON.'}, status=400)
+    user = await request.auser()
+    cleaned, errors = await sync_to_async(validate_sessions)(user, items)
+    if errors:
+        return JsonResponse({'status': 'error', 'errors': errors}, status=400)
+    summary = await sync_to_async(ingest_sessions)(user, cleaned)
+    return JsonResponse({'status': 'success', **summary})
+
+@login_required
+def pomodoro_timer(request):
+    """Return the user's server-side timer; POST {action: start|pause|resume|cancel, minutes?, skill_id?, notes?}."""
+    if request.method == 'POST':
+        try:
+            action, params = parse_timer_request(request.user, request.body)
+            TIMER_HANDLERS[action](request.user, **params)
+        except ValueError as exc:
+            return JsonResponse({'status': 'error', 'message': str(exc)}, status=400)
+    return JsonResponse(timer_state(get_timer(request.user)))
+
+@login_required
+async def pomodoro_timer_events(request):
+    """Stream the user's timer as Server-Sent Events until it completes, is cancelled or the client leaves."""
+    response = StreamingHttpResponse(timer_events(await request.auser()), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Don't let nginx hold ticks back
+    return response
+
+@login_required
+@require_POST
+def tasks_bulk(request):
+    """Complete, reprioritize, reschedule or delete many tasks: {action, ids, priority?, due_date?}."""
+    try:
+        action, ids, params = parse_bulk_request(request.body, TASK_ACTIONS)
+    except ValueError as exc:
+        return JsonResponse({'status': 'error', 'message': str(exc)}, status=400)
+    return JsonResponse({'status': 'success', 'action': action, **bulk_tasks(request.user, action, ids, **params)})
 
 @login_required
 def roadmap(request):
-    """Display and manage roadmap steps."""
-    steps = RoadmapStep.objects.filter(user=request.user)
+    """Display and manage roadmap steps, a page at a time (?skill=, ?status=open|done, ?order=desc, ?cursor=)."""
     if request.method == 'POST':
         skill_id = request.POST.get('skill_id')
         description = request.POST.get('description')
-        skill = Skill.objects.get(id=skill_id, user=request.user)
+        skill = Skill.objects.get(id=skill_id, userskill__userprofile__user=request.user)
         RoadmapStep.objects.create(user=request.user, skill=skill, description=description)
         messages.success(request, 'Roadmap step added successfully.')
         return redirect('roadmap')
-    skills = Skill.objects.filter(user=request.user)
-    return render(request, 'tracker/roadmap.html', {'steps': steps, 'skills': skills})
+    try:
+        steps, next_cursor = roadmap_page(request.user, skill_id=request.GET.get('skill'), **_page_params(request))
+    except ValueError as exc:
+        return _page_error(request, exc)
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'results': [
+                {'id': step.id, 'skill': step.skill.name, 'description': step.description, 'completed': step.completed}
+                for step in steps
+            ],
+            'next': next_cursor,
+        })
+    skills = Skill.objects.filter(userskill__userprofile__user=request.user)  # Skills are shared; link via UserSkill
+    return render(request, 'roadmap.html', {'steps': steps, 'next_cursor': next_cursor, 'skills': skills})
 
 @login_required
 def mark_roadmap_step_complete(request, step_id):
     """Mark a roadmap step as completed and award points."""
-    step = RoadmapStep.objects.get(id=step_id, user=request.user)
-    step.completed = True
-    step.save()
-    profile = UserProfile.objects.get(user=request.user)
-    profile.points += 20  # Award 20 points for step completion
-    profile.save()
+    if RoadmapStep.objects.filter(id=step_id, user=request.user, completed=False).update(completed=True):
+        award_points(request.user, ROADMAP_STEP_POINTS, 'roadmap_step')
+        check_and_award_badges(request)
     messages.success(request, 'Roadmap step marked as completed.')
     return redirect('roadmap')
 
+@login_required
+@require_POST
+def roadmap_bulk(request):
+    """Complete or delete many roadmap steps: {action, ids}."""
+    try:
+        action, ids, _ = parse_bulk_request(request.body, ROADMAP_ACTIONS)
+    except ValueError as exc:
+        return JsonResponse({'status': 'error', 'message': str(exc)}, status=400)
+    return JsonResponse({'status': 'success', 'action': action, **bulk_roadmap_steps(request.user, action, ids)})
+
 # Daily Activity Tracker View
 @login_required
 def daily_activities(request):
@@ -237,44 +366,158 @@ def daily_activities(request):
             activity = form.save(commit=False)
             activity.user = request.user
             activity.save()
-            profile = UserProfile.objects.get(user=request.user)
-            profile.points += 5  # Award 5 points for activity completion
-            profile.save()
+            award_points(request.user, 5, 'daily_activity')  # Award 5 points for activity completion
+            check_and_award_badges(request)
             messages.success(request, 'Daily activity added successfully.')
             return redirect('daily_activities')
     else:
         form = DailyActivityForm()
     activities = DailyActivity.objects.filter(user=request.user, date=datetime.now().date())
-    return render(request, 'tracker/daily_activities.html', {'form': form, 'activities': activities})
+    return render(request, 'daily_activities.html', {'form': form, 'activities': activities})
 
 @login_required
 def mark_activity_complete(request, activity_id):
     """Mark a daily activity as completed."""
     activity = DailyActivity.objects.get(id=activity_id, user=request.user)
-    activity.is_completed = True
-    activity.save()
+    if DailyActivity.objects.filter(pk=activity.pk, is_completed=False).update(is_completed=True):
+        record_daily_stats(request.user.pk, activity.date, activities_completed=1)
+        invalidate_dashboard(request.user.pk)  # QuerySet.update() sends no post_save signal
     messages.success(request, 'Activity marked as completed.')
     return redirect('daily_activities')
 
 # Motivation & Analytics Views
 @login_required
+@replica_reads
 def motivation(request):
-    """Display motivational quotes and videos."""
-    quotes = Quote.objects.all()
-    videos = Video.objects.all()
-    return render(request, 'tracker/motivation.html', {'quotes': quotes, 'videos': videos})
+    """Display motivational quotes and videos from the in-memory catalogs, paginated (?page=, ?video_page=)."""
+    quote_page = Paginator(get_quote_ids(), CATALOG_PAGE_SIZE).get_page(request.GET.get('page'))
+    quote_page.object_list = get_quotes(quote_page.object_list)  # Only this page's rows are fetched
+    video_page = Paginator(get_catalog('videos'), CATALOG_PAGE_SIZE).get_page(request.GET.get('video_page'))
+    return render(request, 'motivation.html', {'quotes': quote_page, 'videos': video_page})
+
+@login_required
+def analytics(request):
+    """Return daily/weekly/per-skill study time as JSON for charts (?start=&end=, default last 30 days)."""
+    today = timezone.localdate()
+    try:
+        end = date.fromisoformat(request.GET['end']) if 'end' in request.GET else today
+        start = date.fromisoformat(request.GET['start']) if 'start' in request.GET else end - timedelta(days=29)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Dates must be YYYY-MM-DD.'}, status=400)
+    if start > end or (end - start).days > 366:
+        return JsonResponse({'status': 'error', 'message': 'Invalid date range.'}, status=400)
+    return JsonResponse(learning_analytics(request.user, start, end))
+
+@login_required
+def progress_chart(request, kind):
+    """Return a progress chart (skills, xp) as a Plotly JSON spec, or with ?format=png|svg as a cached image."""
+    if kind not in CHART_BUILDERS:
+        raise Http404(kind)
+    spec = chart_spec(request.user, kind)
+    fmt = request.GET.get('format')
+    if fmt not in IMAGE_FORMATS or not renderer_available():
+        fmt = 'json'  # Without plotly/kaleido, image requests get the spec
+    etag = f'"{chart_key(spec, fmt)}"'
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponse(status=304)
+    elif fmt == 'json' or (image := render_images([(spec, fmt, CHART_WIDTH, CHART_HEIGHT)])[0]) is None:
+        response = JsonResponse(spec)  # Also served when the render failed
+        etag = f'"{chart_key(spec)}"'
+    else:
+        response = HttpResponse(image, content_type=IMAGE_FORMATS[fmt])
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+@login_required
+def export_data(request):
+    """Stream all of the user's tracker data as JSON Lines or CSV (?format=csv, ?gzip=1, ?types=tasks,sessions)."""
+    fmt = 'csv' if request.GET.get('format') == 'csv' else 'jsonl'
+    compress = request.GET.get('gzip') == '1'
+    types = [name for name in request.GET.get('types', '').split(',') if name in EXPORT_TYPES] or None
+    filename = f'{request.user.username}-tracker-export.{fmt}' + ('.gz' if compress else '')
+    response = StreamingHttpResponse(
+        export_stream(request.user, fmt, compress, types),
+        content_type='application/gzip' if compress else ('text/csv' if fmt == 'csv' else 'application/x-ndjson'),
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+# Search View
+@login_required
+def search_items(request):
+    """Ranked, prefix-matching search over the user's tasks, session notes, roadmap steps and skills (?q=, ?kinds=)."""
+    kinds = [kind for kind in request.GET.get('kinds', '').split(',') if kind]
+    try:
+        limit = max(1, min(int(request.GET.get('limit', SEARCH_LIMIT)), 50))
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'limit must be a number.'}, status=400)
+    return JsonResponse({'results': search(request.user, request.GET.get('q', ''), kinds, limit)})
+
+# Profiling View
+@staff_member_required
+def profiling_report(request):
+    """Return this process's per-URL request profiles as JSON; POST clears them."""
+    if request.method == 'POST':
+        reset_profiling()
+    return JsonResponse(profiling_snapshot())
+
+# Static Asset View
+def serve_static(request, path):
+    """Serve a collected static file, pre-compressed if the client accepts it; hashed names are cached for a year."""
+    full_path = Path(safe_join(settings.STATIC_ROOT, path))
+    if not full_path.is_file():
+        raise Http404(path)
+    content_type = mimetypes.guess_type(full_path.name)[0] or 'application/octet-stream'
+    accepted = request.headers.get('Accept-Encoding', '')
+    served, encoding = full_path, None
+    for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if candidate in accepted and full_path.with_name(full_path.name + suffix).is_file():
+            served, encoding = full_path.with_name(full_path.name + suffix), candidate
+            break
+    response = FileResponse(open(served, 'rb'), content_type=content_type, filename=full_path.name)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Vary'] = 'Accept-Encoding'
+    response['Cache-Control'] = (
+        'public, max-age=31536000, immutable' if HASHED_NAME.search(full_path.name) else 'no-cache'
+    )
+    return response
 
 # Leaderboard View
+@replica_reads
 def leaderboard(request):
-    """Display top 10 learners based on points."""
-    users = UserProfile.objects.order_by('-points')[:10]
-    return render(request, 'tracker/leaderboard.html', {'users': users})
+    """Display top 10 learners by points plus this week's and month's most active learners."""
+    context = {
+        'users': top_learners(),
+        'weekly': window_leaders(7),
+        'monthly': window_leaders(30),
+    }
+    if request.user.is_authenticated:
+        context['my_rank'] = rank_of(request.user)
+    return render(request, 'leaderboard.html', context)
+
+# Helper Functions for Paginated Lists
+def _page_params(request):
+    """Read the shared keyset pagination parameters; raises ValueError on bad input."""
+    status = request.GET.get('status')
+    return {
+        'cursor': request.GET.get('cursor'),
+        'size': max(1, min(int(request.GET.get('size', PAGE_SIZE)), MAX_PAGE_SIZE)),
+        'completed': {'open': False, 'done': True}.get(status),
+        'descending': request.GET.get('order') == 'desc',
+    }
+
+def _page_error(request, exc):
+    if request.GET.get('format') == 'json':
+        return JsonResponse({'status': 'error', 'message': str(exc)}, status=400)
+    messages.error(request, 'That page link is no longer valid; showing the first page.')
+    return redirect(request.path)
 
 # Helper Function for Badge Awards
-def check_and_award_badges(user, total_points):
-    """Check and award badges based on points."""
-    badges = Badge.objects.all()
-    for badge in badges:
-        if total_points >= badge.points_required and not UserBadge.objects.filter(user=user, badge=badge).exists():
-            UserBadge.objects.create(user=user, badge=badge)
-            messages.success(user.request, f'Congratulations! You earned the {badge.name} badge.')
\ No newline at end of file
+def check_and_award_badges(request, points=None):
+    """Award the badges the user's points (live balance by default) qualify for and flash a message for each."""
+    if points is None:
+        points = get_points(request.user)
+    for badge in award_badges(request.user, points):
+        messages.success(request, f'Congratulations! You earned the {badge.name} badge.')
\ No newline at end of file